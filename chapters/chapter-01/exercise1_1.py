@@ -31,6 +31,9 @@ class User:
             raise ValueError("First name cannot be empty")
         if not self.last_name.strip():
             raise ValueError("Last name cannot be empty")
+        # Validate the email once; is_email_valid re-checks only if it changes
+        self._checked_email = self.email
+        self._email_valid = validate_email(self.email or "")
 
     @property
     def full_name(self) -> str:
@@ -55,7 +58,10 @@ class User:
     @property
     def is_email_valid(self) -> bool:
         """Check if the user's email is valid."""
-        return validate_email(self.email or "")
+        if self.email is not self._checked_email:
+            self._checked_email = self.email
+            self._email_valid = validate_email(self.email or "")
+        return self._email_valid
 
     def to_dict(self) -> dict[str, str | int | None]:
         """Convert User object to dictionary for backward compatibility."""
@@ -136,14 +142,19 @@ def format_user_report(users: List[User]) -> str:
 
     report_lines: List[str] = []
     for user in users:
-        line = f"Name: {user.display_name}, Age: {user.age} ({user.age_category.value})"
-        if user.email and user.is_email_valid:
-            line += f", Email: {user.email}"
-        report_lines.append(line)
+        report_lines.append(format_user_line(user))
 
     return "\n".join(report_lines)
 
 
+def format_user_line(user: User) -> str:
+    """Format a single user's line of the report."""
+    line = f"Name: {user.display_name}, Age: {user.age} ({user.age_category.value})"
+    if user.email and user.is_email_valid:
+        line += f", Email: {user.email}"
+    return line
+
+
 # Test your functions
 if __name__ == "__main__":
     # Test data
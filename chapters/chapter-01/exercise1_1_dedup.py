@@ -0,0 +1,222 @@
+# Exercise 1.1 Extension: User Deduplication
+# Drop repeated people from User streams with exact or fixed-memory filters
+
+"""
+C# Equivalent Idea:
+var seen = new HashSet<string>();
+var unique = users.Where(u => seen.Add(IdentityKey(u)));   // exact, memory grows with input
+"""
+
+import hashlib
+import math
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterable, Iterator, Optional, Set
+
+from exercise1_1 import User
+
+_MASK64 = (1 << 64) - 1
+
+
+def _normalize_text(value: str) -> str:
+    """Casefold and collapse whitespace ("  Mary  Ann " -> "mary ann")."""
+    return " ".join(value.casefold().split())
+
+
+def normalize_identity(user: User) -> str:
+    """Identity key built from the normalized email, first name and last name."""
+    email = (user.email or "").strip().lower()
+    return f"{email}|{_normalize_text(user.first_name)}|{_normalize_text(user.last_name)}"
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set.
+
+    ``add`` never misses a key it has seen, but may report an unseen key as
+    present with probability close to ``error_rate`` once ``capacity`` keys
+    have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("Error rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bit_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.bits = bytearray((self.bit_count + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest: bytes) -> Iterator[int]:
+        # Double hashing: k positions from two independent 64-bit halves,
+        # wrapping at 64 bits so vectorized (uint64) code gets the same bits
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second & _MASK64) % self.bit_count
+
+    def add_digest(self, digest: bytes) -> bool:
+        """Add a 16-byte digest; return True if it was (probably) present already."""
+        present = True
+        bits = self.bits
+        for position in self._positions(digest):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        if not present:
+            self.count += 1
+        return present
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(digest)
+        )
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.bits)
+
+
+class DedupMode(Enum):
+    """How seen identities are remembered."""
+
+    EXACT = "exact"  # Set of 16-byte digests: no false positives, grows with input
+    BLOOM = "bloom"  # Two rotating Bloom filters: fixed memory, small error rate
+
+
+@dataclass
+class DedupStats:
+    """Counts reported by a deduplicator."""
+
+    processed: int = 0
+    unique: int = 0
+    duplicates: int = 0
+
+
+class DigestDeduplicator:
+    """
+    Remembers 16-byte key digests, exactly or in fixed memory.
+
+    In BLOOM mode two filters of ``capacity`` keys each are kept. When the
+    active one is full, the older one is discarded and a fresh one takes its
+    place, so memory never grows and at least the last ``capacity`` distinct
+    keys are always remembered. Duplicates further apart than that may pass
+    through again; with unrelated keys, a new key is wrongly reported as seen
+    with probability of at most about ``2 * error_rate``.
+    """
+
+    def __init__(
+        self,
+        mode: DedupMode = DedupMode.EXACT,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+    ) -> None:
+        self.mode = mode
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.stats = DedupStats()
+        self._exact: Set[bytes] = set()
+        # Filters are only allocated in BLOOM mode; EXACT mode never reads them
+        self._active = BloomFilter(capacity if mode is DedupMode.BLOOM else 1, error_rate)
+        self._previous: Optional[BloomFilter] = None
+
+    def _seen_before(self, digest: bytes) -> bool:
+        if self.mode is DedupMode.EXACT:
+            if digest in self._exact:
+                return True
+            self._exact.add(digest)
+            return False
+
+        if self._previous is not None and digest in self._previous:
+            return True
+        if self._active.add_digest(digest):
+            return True
+        self._rotate()
+        return False
+
+    def _rotate(self) -> None:
+        """Start a fresh Bloom filter once the active one is full."""
+        if self._active.count >= self.capacity:
+            self._previous, self._active = self._active, BloomFilter(
+                self.capacity, self.error_rate
+            )
+
+    def _record(self, duplicate: bool) -> bool:
+        self.stats.processed += 1
+        if duplicate:
+            self.stats.duplicates += 1
+        else:
+            self.stats.unique += 1
+        return duplicate
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate bytes used by the identity store."""
+        if self.mode is DedupMode.EXACT:
+            return len(self._exact) * (16 + 33 + 8)  # digest, bytes header, set slot
+        previous = self._previous.size_bytes if self._previous is not None else 0
+        return self._active.size_bytes + previous
+
+
+class UserDeduplicator(DigestDeduplicator):
+    """Stream filter that passes each person through once."""
+
+    def is_duplicate(self, user: User) -> bool:
+        """Record a user and report whether the same person was seen before."""
+        return self._record(self._seen_before(_digest(normalize_identity(user))))
+
+    def filter(self, users: Iterable[User]) -> Iterator[User]:
+        """Yield only the first occurrence of each person."""
+        for user in users:
+            if not self.is_duplicate(user):
+                yield user
+
+
+def feed_users(count: int, distinct: int) -> Iterator[User]:
+    """Generate a stream where the same people appear repeatedly with noisy formatting."""
+    for i in range(count):
+        person = (i * 7_919) % distinct
+        first = "Alex" if i % 3 else "  ALEX "
+        email = f"alex.{person}@example.com" if i % 2 else f"Alex.{person}@Example.com "
+        yield User(first, f"Person{person}", 20 + person % 50, email)
+
+
+if __name__ == "__main__":
+    print("=== User Deduplication Demo ===\n")
+    feed = [
+        User("John", "Doe", 25, "john.doe@email.com"),
+        User("john", "DOE", 25, " John.Doe@Email.com"),
+        User("Jane", "Smith", 17, "jane@example.com"),
+        User("Jane", "Smith", 17),
+        User("Mary  Ann", "Lee", 40, "mal@example.com"),
+        User("Mary Ann", "Lee", 41, "MAL@example.com"),
+    ]
+    deduplicator = UserDeduplicator()
+    for user in deduplicator.filter(feed):
+        print(f"  kept: {user.full_name} <{user.email}>")
+    print(f"Stats: {deduplicator.stats}")
+
+    count, distinct = 500_000, 100_000
+    print(f"\nStream of {count:,} users ({distinct:,} distinct people):")
+    for mode in DedupMode:
+        deduplicator = UserDeduplicator(mode, capacity=distinct, error_rate=0.001)
+        start = time.perf_counter()
+        for _ in deduplicator.filter(feed_users(count, distinct)):
+            pass
+        elapsed = time.perf_counter() - start
+        stats = deduplicator.stats
+        print(
+            f"  {mode.value:5}: {stats.unique:,} unique, {stats.duplicates:,} duplicates, "
+            f"{deduplicator.memory_bytes / 1e6:.1f} MB, {elapsed:.2f}s"
+        )
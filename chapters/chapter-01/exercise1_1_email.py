@@ -0,0 +1,212 @@
+# Exercise 1.1 Extension: Batch Email Validation
+# Compiled patterns, configurable strictness and a bounded result cache
+
+"""
+C# Equivalent Idea:
+static readonly Regex EmailPattern = new Regex(@"^[^@\s]+@[^@\s]+\.[^@\s]+$", RegexOptions.Compiled);
+bool[] results = emails.Select(e => cache.GetOrAdd(e, EmailPattern.IsMatch)).ToArray();
+"""
+
+import random
+import re
+import time
+from enum import Enum
+from itertools import compress, islice, repeat
+from operator import is_
+from typing import Callable, Dict, Iterable, List, Pattern
+
+from exercise1_1 import validate_email
+
+
+class EmailStrictness(Enum):
+    """How strictly email addresses are checked."""
+
+    BASIC = "basic"  # Same rule as validate_email: contains "@" and "."
+    STANDARD = "standard"  # One "@", no whitespace, dotted domain
+    STRICT = "strict"  # Dot-atom local part, hostname labels, alphabetic TLD
+
+
+# BASIC reuses validate_email itself; plain substring checks beat any pattern
+_PATTERNS: Dict[EmailStrictness, Pattern[str]] = {
+    EmailStrictness.STANDARD: re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+"),
+    EmailStrictness.STRICT: re.compile(
+        r"(?=[^@]{1,64}@)(?=.{3,254}$)"
+        r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+        r"@(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+[A-Za-z]{2,63}"
+    ),
+}
+
+
+class EmailValidator:
+    """
+    Validate emails one at a time or in batches, remembering recent results.
+
+    The cache holds at most ``cache_size`` distinct addresses and drops the
+    oldest entries first, so memory stays bounded on endless input. It only
+    pays off when it can hold the working set of repeated addresses; a
+    smaller cache keeps evicting entries before they are asked for again.
+
+    BASIC mode bypasses the cache (and its hit/miss counts): two substring
+    checks are cheaper than a cache lookup.
+    """
+
+    def __init__(
+        self,
+        strictness: EmailStrictness = EmailStrictness.STANDARD,
+        cache_size: int = 100_000,
+    ) -> None:
+        if cache_size < 0:
+            raise ValueError("Cache size cannot be negative")
+        self.strictness = strictness
+        self.cache_size = cache_size
+        self._check: Callable[[str], object] = (
+            validate_email
+            if strictness is EmailStrictness.BASIC
+            else _PATTERNS[strictness].fullmatch
+        )
+        self._cache: Dict[str, bool] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _evict(self, incoming: int) -> None:
+        """Make room for new entries by dropping the oldest ones."""
+        overflow = len(self._cache) + incoming - self.cache_size
+        if overflow > 0:
+            for email in list(islice(self._cache, overflow)):
+                del self._cache[email]
+
+    def validate(self, email: str) -> bool:
+        """Validate a single email."""
+        if self.strictness is EmailStrictness.BASIC:
+            return validate_email(email)
+
+        cached = self._cache.get(email)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        valid = bool(self._check(email))
+        if self.cache_size:
+            self._evict(1)
+            self._cache[email] = valid
+        return valid
+
+    def validate_batch(self, emails: Iterable[str]) -> List[bool]:
+        """
+        Validate many emails at once.
+
+        A first pass reads every address from the cache. Only the distinct
+        addresses that missed go through the compiled pattern, after which a
+        second pass fills in the gaps from the new results. Both passes run
+        inside C-level ``map``/``compress`` calls rather than a Python loop,
+        and cost O(batch size) however full the cache is.
+
+        Args:
+            emails: Email strings (any iterable)
+
+        Returns:
+            One bool per input email, in order
+        """
+        emails = emails if isinstance(emails, list) else list(emails)
+        if self.strictness is EmailStrictness.BASIC:
+            return list(map(validate_email, emails))
+
+        results = list(map(self._cache.get, emails))
+        if None not in results:
+            self.hits += len(emails)
+            return results
+
+        missed = dict.fromkeys(compress(emails, map(is_, results, repeat(None))))
+        new_results = dict(zip(missed, map(bool, map(self._check, missed))))
+        self.misses += len(new_results)
+        self.hits += len(emails) - len(new_results)
+
+        if self.cache_size:
+            newest = max(0, len(new_results) - self.cache_size)
+            keep = dict(islice(new_results.items(), newest, None))
+            self._evict(len(keep))
+            self._cache.update(keep)
+
+        # Misses come from new_results; hits keep the value the first pass read
+        return list(map(new_results.get, emails, results))
+
+    def clear_cache(self) -> None:
+        """Forget cached results and statistics."""
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+
+def generate_emails(count: int, distinct: int = 200_000, seed: int = 7) -> List[str]:
+    """Generate a realistic mix of repeated, valid and invalid addresses."""
+    rng = random.Random(seed)
+    domains = ["example.com", "school.edu", "mail.org", "corp.co.uk", "bad_domain", "x.y"]
+    pool = []
+    for i in range(distinct):
+        local = f"user{i}" if i % 10 else f"user {i}"
+        pool.append(f"{local}@{rng.choice(domains)}" if i % 7 else f"user{i}.example.com")
+    return [pool[rng.randrange(distinct)] for _ in range(count)]
+
+
+def benchmark_email_validation(count: int = 500_000, distinct: int = 20_000) -> None:
+    """Report emails per second for per-email checks and the batch validator."""
+    emails = generate_emails(count, distinct)
+    print(f"Validating {count:,} emails ({len(set(emails)):,} distinct)")
+
+    def rate(seconds: float) -> str:
+        return f"{count / seconds:12,.0f} emails/s"
+
+    start = time.perf_counter()
+    expected = [validate_email(email) for email in emails]
+    print(f"  validate_email loop:      {rate(time.perf_counter() - start)}")
+
+    for strictness in EmailStrictness:
+        check = EmailValidator(strictness, cache_size=0)._check
+        start = time.perf_counter()
+        for email in emails:
+            check(email)
+        per_email = time.perf_counter() - start
+
+        validator = EmailValidator(strictness, cache_size=distinct)  # Room for the working set
+        start = time.perf_counter()
+        results = validator.validate_batch(emails)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        validator.validate_batch(emails)
+        warm = time.perf_counter() - start
+
+        print(f"  {strictness.value}:")
+        print(f"    per-email loop:         {rate(per_email)}")
+        print(f"    validate_batch (cold):  {rate(cold)}")
+        print(f"    validate_batch (warm):  {rate(warm)}")
+        if strictness is EmailStrictness.BASIC:
+            assert results == expected
+
+
+if __name__ == "__main__":
+    samples = [
+        "test@example.com",
+        "invalid-email",
+        "",
+        "user@domain.org",
+        "two@@example.com",
+        "spaces in@example.com",
+        "first.last+tag@sub.example.co.uk",
+        "a@b.c",
+        ".leading-dot@example.com",
+    ]
+
+    print("=== Batch Email Validation Demo ===\n")
+    print(f"{'Email':36} {'basic':>6} {'standard':>9} {'strict':>7}")
+    validators = [EmailValidator(strictness) for strictness in EmailStrictness]
+    columns = [validator.validate_batch(samples) for validator in validators]
+    for email, basic, standard, strict in zip(samples, *columns):
+        print(f"{email!r:36} {basic!s:>6} {standard!s:>9} {strict!s:>7}")
+
+    validator = EmailValidator(cache_size=3)
+    for email in samples * 2:
+        validator.validate(email)
+    print(f"\nCache of 3: {validator.hits} hits, {validator.misses} misses")
+
+    print("\nBenchmark:")
+    benchmark_email_validation()
@@ -0,0 +1,222 @@
+# Exercise 1.1 Extension: Streaming User Import
+# Validate CSV/NDJSON user rows in chunks without loading the whole file
+
+"""
+C# Equivalent Idea:
+IEnumerable<UserRow> ReadRows(string path) { foreach (var line in File.ReadLines(path)) yield return Parse(line); }
+var results = rows.Chunk(10_000).AsParallel().AsOrdered().Select(ValidateChunk);
+"""
+
+import csv
+import json
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from exercise1_1 import User, process_user_info
+
+Row = Dict[str, Any]
+NumberedRow = Tuple[int, Row]
+
+
+@dataclass
+class RejectedRow:
+    """A source row that could not become a User, with the reason why."""
+
+    row_number: int
+    row: Row
+    reason: str
+
+
+@dataclass
+class ImportSummary:
+    """Counts reported at the end of an import."""
+
+    total_rows: int = 0
+    valid_rows: int = 0
+    rejected_rows: int = 0
+
+
+def read_csv_rows(path: str) -> Iterator[NumberedRow]:
+    """Yield (row_number, row) pairs from a CSV file with a header line."""
+    with open(path, newline="", encoding="utf-8") as file:
+        for row_number, row in enumerate(csv.DictReader(file), start=2):
+            yield row_number, row
+
+
+def read_ndjson_rows(path: str) -> Iterator[NumberedRow]:
+    """Yield (row_number, row) pairs from a newline-delimited JSON file."""
+    with open(path, encoding="utf-8") as file:
+        for row_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                row = {"_raw": line.rstrip("\n"), "_error": f"Invalid JSON: {e.msg}"}
+            if not isinstance(row, dict):
+                row = {"_raw": line.rstrip("\n"), "_error": "Expected a JSON object"}
+            yield row_number, row
+
+
+def read_user_rows(path: str) -> Iterator[NumberedRow]:
+    """Pick a reader based on the file extension (.csv, .ndjson or .jsonl)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return read_csv_rows(path)
+    if extension in (".ndjson", ".jsonl"):
+        return read_ndjson_rows(path)
+    raise ValueError(f"Unsupported user file type: {extension}")
+
+
+def chunked(rows: Iterable[NumberedRow], chunk_size: int) -> Iterator[List[NumberedRow]]:
+    """Group an iterable into lists of at most chunk_size items."""
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def row_to_user(row: Row) -> User:
+    """Convert one raw row to a User, raising ValueError with a readable reason."""
+    if "_error" in row:
+        raise ValueError(row["_error"])
+
+    required = ("first_name", "last_name", "age")
+    missing = [name for name in required if row.get(name) in (None, "")]
+    if missing:
+        raise ValueError(f"Missing field(s): {', '.join(missing)}")
+
+    try:
+        age = int(row["age"])
+    except (TypeError, ValueError):
+        raise ValueError(f"Age is not a whole number: {row['age']!r}") from None
+
+    return process_user_info(
+        str(row["first_name"]), str(row["last_name"]), age, str(row.get("email") or "")
+    )
+
+
+def validate_chunk(chunk: List[NumberedRow]) -> Tuple[List[User], List[RejectedRow]]:
+    """Validate a chunk of rows, collecting every failure instead of stopping."""
+    users: List[User] = []
+    rejected: List[RejectedRow] = []
+    for row_number, row in chunk:
+        try:
+            users.append(row_to_user(row))
+        except ValueError as e:
+            rejected.append(RejectedRow(row_number, row, str(e)))
+    return users, rejected
+
+
+def process_user_stream(
+    rows: Iterable[NumberedRow], chunk_size: int = 10_000, workers: int = 0
+) -> Iterator[Tuple[List[User], List[RejectedRow]]]:
+    """
+    Validate rows chunk by chunk, yielding results in source order.
+
+    Args:
+        rows: (row_number, row) pairs, e.g. from read_user_rows
+        chunk_size: Rows validated per task
+        workers: Process pool size (0 validates in this process)
+
+    Yields:
+        (valid users, rejected rows) for each chunk
+    """
+    chunks = chunked(rows, chunk_size)
+    if workers <= 0:
+        yield from map(validate_chunk, chunks)
+        return
+
+    # Keep a bounded number of chunks in flight so memory stays constant
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(validate_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_ndjson(file: TextIO, record: Dict[str, Any]) -> None:
+    """Write one record as a JSON line."""
+    file.write(json.dumps(record))
+    file.write("\n")
+
+
+def import_users(
+    source_path: str,
+    valid_path: str,
+    rejected_path: str,
+    chunk_size: int = 10_000,
+    workers: int = 0,
+) -> ImportSummary:
+    """Stream a user file into NDJSON files of valid users and rejected rows."""
+    summary = ImportSummary()
+    with open(valid_path, "w", encoding="utf-8") as valid_file, open(
+        rejected_path, "w", encoding="utf-8"
+    ) as rejected_file:
+        for users, rejected in process_user_stream(
+            read_user_rows(source_path), chunk_size, workers
+        ):
+            for user in users:
+                write_ndjson(valid_file, asdict(user))
+            for rejection in rejected:
+                write_ndjson(rejected_file, asdict(rejection))
+
+            summary.valid_rows += len(users)
+            summary.rejected_rows += len(rejected)
+            summary.total_rows += len(users) + len(rejected)
+    return summary
+
+
+def create_sample_csv(path: str, copies: int = 1) -> None:
+    """Write a small CSV containing valid and invalid rows."""
+    rows = [
+        ("John", "Doe", "25", "john.doe@email.com"),
+        ("Jane", "Smith", "17", "jane@example.com"),
+        ("", "Nobody", "40", ""),
+        ("Bob", "Johnson", "70", ""),
+        ("Old", "Timer", "-5", ""),
+        ("Alice", "Brown", "thirty", "alice@example.com"),
+    ]
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["first_name", "last_name", "age", "email"])
+        for _ in range(copies):
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "users.csv")
+        valid = os.path.join(directory, "valid.ndjson")
+        rejected = os.path.join(directory, "rejected.ndjson")
+        create_sample_csv(source)
+
+        print("=== Streaming User Import Demo ===\n")
+        summary = import_users(source, valid, rejected, chunk_size=2)
+        print(f"Summary: {summary}")
+
+        with open(valid, encoding="utf-8") as file:
+            print("Valid users:")
+            for line in file:
+                print(f"  {line.rstrip()}")
+        with open(rejected, encoding="utf-8") as file:
+            print("Rejected rows:")
+            for line in file:
+                record = json.loads(line)
+                print(f"  Row {record['row_number']}: {record['reason']}")
+
+        # Same results when chunks are validated in a process pool
+        create_sample_csv(source, copies=10_000)
+        serial = import_users(source, valid, rejected, chunk_size=5_000)
+        parallel = import_users(source, valid, rejected, chunk_size=5_000, workers=2)
+        print(f"\nSerial:   {serial}")
+        print(f"Parallel: {parallel}")
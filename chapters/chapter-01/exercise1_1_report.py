@@ -0,0 +1,137 @@
+# Exercise 1.1 Extension: Streaming User Report
+# Write format_user_report output incrementally instead of building one big string
+
+"""
+C# Equivalent Idea:
+using var writer = new StreamWriter(path, append: false, Encoding.UTF8, bufferSize: 1 << 16);
+foreach (var user in users) writer.Write(FormatLine(user));
+"""
+
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List, TextIO, Union
+
+from exercise1_1 import User, format_user_line, format_user_report
+
+
+def format_user_chunk(users: List[User]) -> str:
+    """Format a chunk of users exactly as format_user_report would."""
+    return "\n".join(map(format_user_line, users))
+
+
+def _chunks(users: Iterable[User], chunk_size: int) -> Iterator[List[User]]:
+    iterator = iter(users)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _formatted_chunks(
+    users: Iterable[User], chunk_size: int, workers: int
+) -> Iterator[str]:
+    """Yield formatted chunks in input order, optionally from a process pool."""
+    chunks = _chunks(users, chunk_size)
+    if workers <= 0:
+        yield from map(format_user_chunk, chunks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(format_user_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_user_report(
+    users: Iterable[User],
+    sink: Union[str, TextIO],
+    buffer_size: int = 1 << 16,
+    chunk_size: int = 1_000,
+    workers: int = 0,
+) -> int:
+    """
+    Stream the user report to a file or text sink.
+
+    The output is identical to format_user_report(users): lines separated by
+    "\\n" with no trailing newline. Only one chunk of lines (plus the write
+    buffer) is held in memory at a time.
+
+    Args:
+        users: Any iterable of User objects (lists, generators, ...)
+        sink: Output path or an open text stream
+        buffer_size: Bytes buffered before writing to the file (paths only)
+        chunk_size: Users formatted per chunk
+        workers: Process pool size for formatting (0 formats in this process)
+
+    Returns:
+        Number of characters written
+    """
+    if isinstance(sink, str):
+        # newline="" keeps "\n" untranslated so the bytes match on every platform
+        with open(sink, "w", encoding="utf-8", newline="", buffering=buffer_size) as file:
+            return write_user_report(users, file, buffer_size, chunk_size, workers)
+
+    written = 0
+    for text in _formatted_chunks(users, chunk_size, workers):
+        if written:
+            written += sink.write("\n")
+        written += sink.write(text)
+    return written
+
+
+def compare_peak_memory(users: List[User]) -> None:
+    """Show peak allocations of the in-memory and streaming reports."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "report.txt")
+
+        tracemalloc.start()
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.write(format_user_report(users))
+        in_memory_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+
+        write_user_report(users, path)
+        streaming_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    print(f"Peak memory for {len(users):,} users:")
+    print(f"  format_user_report: {in_memory_peak / 1e6:7.1f} MB")
+    print(f"  write_user_report:  {streaming_peak / 1e6:7.1f} MB")
+
+
+if __name__ == "__main__":
+    users = [
+        User("John", "Doe", 25, "john.doe@email.com"),
+        User("Jane", "Smith", 17, "jane@example.com"),
+        User("Bob", "Johnson", 70),
+        User("Alice", "Brown", 30, "invalid-email"),
+    ]
+
+    print("=== Streaming User Report Demo ===\n")
+    buffer = io.StringIO()
+    write_user_report(users, buffer, chunk_size=3)
+    print(buffer.getvalue())
+    assert buffer.getvalue() == format_user_report(users)
+
+    many_users = users * 50_000
+    expected = format_user_report(many_users).encode("utf-8")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "report.txt")
+        for workers in (0, 2):
+            start = time.perf_counter()
+            write_user_report(many_users, path, workers=workers)
+            elapsed = time.perf_counter() - start
+            with open(path, "rb") as file:
+                identical = file.read() == expected
+            print(f"\nworkers={workers}: {elapsed:.2f}s, byte-identical: {identical}")
+
+    print()
+    compare_peak_memory(many_users)
@@ -0,0 +1,269 @@
+# Exercise 1.1 Extension: Columnar User Table
+# Store users column by column and compute age categories in bulk
+
+"""
+C# Equivalent Idea:
+int[] ages; int[] firstNameCodes; List<string> firstNameValues;   // struct-of-arrays
+var counts = ages.GroupBy(CategoryOf).ToDictionary(g => g.Key, g => g.Count());
+"""
+
+import random
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from exercise1_1 import AgeCategory, User, validate_email
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python fallbacks are used instead
+    np = None
+
+# Ages below 18 are MINOR, 18-64 ADULT and 65+ SENIOR (same as User.age_category)
+AGE_BOUNDARIES = (18, 65)
+CATEGORIES = (AgeCategory.MINOR, AgeCategory.ADULT, AgeCategory.SENIOR)
+
+
+class StringColumn:
+    """Dictionary-encoded strings: each distinct value is stored once."""
+
+    def __init__(self) -> None:
+        self.values: List[Optional[str]] = []
+        self.codes = array("I")
+        self._code_by_value: Dict[Optional[str], int] = {}
+
+    def append(self, value: Optional[str]) -> None:
+        """Append a value, reusing the code of an identical earlier value."""
+        code = self._code_by_value.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._code_by_value[value] = code
+        self.codes.append(code)
+
+    def extend(self, values: Iterable[Optional[str]]) -> None:
+        """Append many values."""
+        for value in values:
+            self.append(value)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        return self.values[self.codes[index]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class UserRow:
+    """Lightweight view of one table row that reads like a User."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "UserTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    @property
+    def first_name(self) -> str:
+        return self._table.first_names[self._index]
+
+    @property
+    def last_name(self) -> str:
+        return self._table.last_names[self._index]
+
+    @property
+    def age(self) -> int:
+        return self._table.ages[self._index]
+
+    @property
+    def email(self) -> Optional[str]:
+        return self._table.emails[self._index]
+
+    @property
+    def full_name(self) -> str:
+        """Get the full name combining first and last name."""
+        return f"{self.first_name} {self.last_name}"
+
+    @property
+    def display_name(self) -> str:
+        """Get the display name in 'Last, First' format."""
+        return f"{self.last_name}, {self.first_name}"
+
+    @property
+    def age_category(self) -> AgeCategory:
+        """Determine age category based on age."""
+        return CATEGORIES[bisect_right(AGE_BOUNDARIES, self.age)]
+
+    @property
+    def is_email_valid(self) -> bool:
+        """Email validity recorded when the row was added."""
+        return bool(self._table.email_valid[self._index])
+
+    def to_dict(self) -> dict[str, str | int | None]:
+        """Same dictionary shape as User.to_dict."""
+        return {
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "age": self.age,
+            "email": self.email,
+            "full_name": self.full_name,
+            "display_name": self.display_name,
+            "age_category": self.age_category.value,
+            "is_email_valid": self.is_email_valid,
+        }
+
+    def to_user(self) -> User:
+        """Materialize a full User object."""
+        return User(self.first_name, self.last_name, self.age, self.email)
+
+    def __repr__(self) -> str:
+        return f"UserRow({self._index}, {self.display_name!r}, age={self.age})"
+
+
+class UserTable:
+    """Column-oriented collection of users."""
+
+    def __init__(self) -> None:
+        self.first_names = StringColumn()
+        self.last_names = StringColumn()
+        self.emails = StringColumn()
+        self.ages = array("I")
+        self.email_valid = bytearray()
+
+    def append(
+        self, first_name: str, last_name: str, age: int, email: Optional[str] = None
+    ) -> None:
+        """Add one user, applying the same validation as User."""
+        if age < 0:
+            raise ValueError("Age cannot be negative")
+        if not first_name.strip():
+            raise ValueError("First name cannot be empty")
+        if not last_name.strip():
+            raise ValueError("Last name cannot be empty")
+
+        self.first_names.append(first_name)
+        self.last_names.append(last_name)
+        self.emails.append(email or None)
+        self.ages.append(age)
+        self.email_valid.append(validate_email(email or ""))
+
+    @classmethod
+    def from_users(cls, users: Iterable[User]) -> "UserTable":
+        """Build a table from User objects."""
+        table = cls()
+        for user in users:
+            table.append(user.first_name, user.last_name, user.age, user.email)
+        return table
+
+    @classmethod
+    def from_columns(
+        cls,
+        first_names: Sequence[str],
+        last_names: Sequence[str],
+        ages: Sequence[int],
+        emails: Optional[Sequence[Optional[str]]] = None,
+    ) -> "UserTable":
+        """Build a table from parallel column sequences, validating each column once."""
+        emails = emails if emails is not None else [None] * len(ages)
+        if not len(first_names) == len(last_names) == len(ages) == len(emails):
+            raise ValueError("All columns must have the same length")
+
+        ages_column = array("i", ages)
+        if ages_column and min(ages_column) < 0:
+            raise ValueError("Age cannot be negative")
+        if not all(map(str.strip, first_names)):
+            raise ValueError("First name cannot be empty")
+        if not all(map(str.strip, last_names)):
+            raise ValueError("Last name cannot be empty")
+
+        table = cls()
+        table.first_names.extend(first_names)
+        table.last_names.extend(last_names)
+        table.emails.extend(email or None for email in emails)
+        table.ages = array("I", ages_column)
+        table.email_valid = bytearray(validate_email(email or "") for email in emails)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.ages)
+
+    def __getitem__(self, index: int) -> UserRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("UserTable index out of range")
+        return UserRow(self, index)
+
+    def __iter__(self) -> Iterator[UserRow]:
+        return (UserRow(self, index) for index in range(len(self)))
+
+    def age_category_codes(self) -> Sequence[int]:
+        """Category index (0=MINOR, 1=ADULT, 2=SENIOR) for every row, computed in bulk."""
+        if np is not None:
+            ages = np.frombuffer(self.ages, dtype=np.uint32)
+            return np.digitize(ages, AGE_BOUNDARIES).astype(np.uint8)
+        return bytes(bisect_right(AGE_BOUNDARIES, age) for age in self.ages)
+
+    def age_categories(self) -> List[AgeCategory]:
+        """AgeCategory for every row."""
+        return [CATEGORIES[code] for code in self.age_category_codes()]
+
+    def count_by_category(self) -> Dict[AgeCategory, int]:
+        """Count users per AgeCategory in one pass over the age column."""
+        codes = self.age_category_codes()
+        if np is not None:
+            counts = np.bincount(codes, minlength=len(CATEGORIES)).tolist()
+        else:
+            tally = Counter(codes)
+            counts = [tally[i] for i in range(len(CATEGORIES))]
+        return dict(zip(CATEGORIES, counts))
+
+
+def benchmark_rollup(count: int = 2_000_000) -> None:
+    """Compare a per-object rollup over User instances with the columnar one."""
+    rng = random.Random(3)
+    firsts = ["John", "Jane", "Bob", "Alice", "Eve", "Mallory", "Trent", "Peggy"]
+    lasts = ["Doe", "Smith", "Johnson", "Brown", "Davis", "Wilson"]
+    first_names = [rng.choice(firsts) for _ in range(count)]
+    last_names = [rng.choice(lasts) for _ in range(count)]
+    ages = [rng.randrange(0, 100) for _ in range(count)]
+
+    users = [User(f, l, a) for f, l, a in zip(first_names, last_names, ages)]
+    start = time.perf_counter()
+    expected = Counter(user.age_category for user in users)
+    per_object = time.perf_counter() - start
+    del users
+
+    table = UserTable.from_columns(first_names, last_names, ages)
+    start = time.perf_counter()
+    counts = table.count_by_category()
+    columnar = time.perf_counter() - start
+    assert counts == dict(expected)
+
+    backend = "NumPy" if np is not None else "pure Python"
+    print(f"Rollup of {count:,} users by AgeCategory:")
+    print(f"  User objects: {per_object:.3f}s")
+    print(f"  UserTable:    {columnar:.3f}s ({backend})")
+
+
+if __name__ == "__main__":
+    table = UserTable()
+    table.append("John", "Doe", 25, "john.doe@email.com")
+    table.append("Jane", "Smith", 17, "jane@example.com")
+    table.append("Bob", "Johnson", 70)
+    table.append("Alice", "Brown", 30, "invalid-email")
+    table.append("John", "Smith", 64, "john.smith@email.com")
+
+    print("=== Columnar User Table Demo ===\n")
+    for row in table:
+        category = row.age_category.value
+        print(f"{row.display_name}: {row.age} ({category}), valid email: {row.is_email_valid}")
+
+    print(f"\nDistinct first names stored: {len(table.first_names.values)} for {len(table)} rows")
+    print(f"Counts: { {c.value: n for c, n in table.count_by_category().items()} }")
+    print(f"Row view as dict: {table[0].to_dict()}")
+    assert table[0].to_dict() == table[0].to_user().to_dict()
+
+    print()
+    benchmark_rollup()
@@ -0,0 +1,424 @@
+# Chapter 2.3 Extension: Lookup Cache
+# LRU/TTL caching for backend lookups like get_user_info, with one load per key under concurrency
+
+"""
+C# Equivalent Idea:
+var cache = new MemoryCache(new MemoryCacheOptions { SizeLimit = 10_000 });
+var user = await cache.GetOrCreateAsync(id, entry => {            // concurrent misses share one load
+    entry.AbsoluteExpirationRelativeToNow = TimeSpan.FromMinutes(5);
+    return db.GetUserAsync(id);
+});
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+Clock = Callable[[], float]
+
+_MISSING = object()
+_FAST_KEY_TYPES = {int, str}
+_KWD_MARK = (object(),)  # Like functools' kwd_mark
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of one cache at one moment."""
+
+    hits: int
+    misses: int
+    loads: int
+    coalesced: int
+    load_errors: int
+    evictions: int
+    expirations: int
+    size: int
+    cost: float
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _Load:
+    """A load in progress that other threads can wait for."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class Cache:
+    """
+    Key-value cache with LRU eviction, optional TTL and size/cost limits.
+
+    Entries live in an OrderedDict in least- to most-recently-used order, so
+    a hit is a dict lookup plus ``move_to_end``. Expired entries are dropped
+    when they are next read (or by ``purge_expired``). ``get_or_load`` and
+    ``aget_or_load`` make concurrent misses for the same key share one
+    backend call.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = 1024,
+        ttl: Optional[float] = None,
+        max_cost: Optional[float] = None,
+        cost: Optional[Callable[[Any], float]] = None,
+        thread_safe: bool = True,
+        clock: Clock = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_size: Most entries kept (None: no entry limit)
+            ttl: Seconds an entry stays fresh (None: no expiry)
+            max_cost: Most total cost kept, measured by ``cost`` (None: no limit)
+            cost: Cost of a value, e.g. len or sys.getsizeof (default: 1)
+            thread_safe: Guard the cache with a lock (not needed in a single
+                thread or a single asyncio event loop)
+            clock: Seconds as a float; time.monotonic by default
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_cost = max_cost
+        self.cost = cost
+        self.clock = clock
+        self._lock = threading.Lock() if thread_safe else None
+        self._guard: Any = self._lock or nullcontext()  # For paths where a branch isn't worth it
+        # key -> (value, expires_at or None, cost)
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float], float]]" = OrderedDict()
+        self._total_cost = 0.0
+        self._loading: Dict[Hashable, _Load] = {}
+        self._async_loading: Dict[Hashable, asyncio.Future] = {}
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self._hits = self._misses = self._loads = self._coalesced = 0
+        self._load_errors = self._evictions = self._expirations = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            self._hits, self._misses, self._loads, self._coalesced, self._load_errors,
+            self._evictions, self._expirations, len(self._data), self._total_cost,
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > self.clock())
+
+    def _lookup(self, key: Hashable) -> Any:
+        """Value for a fresh entry (marked most recently used), else _MISSING. Call under the lock."""
+        entry = self._data.get(key)
+        if entry is not None:
+            if entry[1] is None or entry[1] > self.clock():
+                self._data.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._remove(key)
+            self._expirations += 1
+        self._misses += 1
+        return _MISSING
+
+    def _remove(self, key: Hashable) -> None:
+        self._total_cost -= self._data.pop(key)[2]
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        """Insert or replace an entry, then evict least recently used ones. Call under the lock."""
+        if key in self._data:
+            self._remove(key)
+        ttl = self.ttl if ttl is None else ttl
+        cost = self.cost(value) if self.cost is not None else 1
+        self._data[key] = (value, None if ttl is None else self.clock() + ttl, cost)
+        self._total_cost += cost
+        data = self._data
+        while data and (
+            (self.max_size is not None and len(data) > self.max_size)
+            or (self.max_cost is not None and self._total_cost > self.max_cost)
+        ):
+            self._total_cost -= data.popitem(last=False)[1][2]
+            self._evictions += 1
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if self._lock is None:
+            value = self._lookup(key)
+        else:
+            with self._lock:
+                value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def _fresh(self, key: Hashable) -> Any:
+        """Value stored by another caller since our miss, without touching stats or order."""
+        entry = self._data.get(key)
+        if entry is not None and (entry[1] is None or entry[1] > self.clock()):
+            return entry[0]
+        return _MISSING
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value; ``ttl`` overrides the cache's default for this entry."""
+        with self._guard:
+            self._store(key, value, ttl)
+
+    def delete(self, key: Hashable) -> bool:
+        with self._guard:
+            if key not in self._data:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self) -> None:
+        with self._guard:
+            self._data.clear()
+            self._total_cost = 0.0
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry now; returns how many."""
+        with self._guard:
+            now = self.clock()
+            expired = [key for key, entry in self._data.items() if entry[1] is not None and entry[1] <= now]
+            for key in expired:
+                self._remove(key)
+            self._expirations += len(expired)
+            return len(expired)
+
+    def get_or_load(self, key: Hashable, loader: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Cached value, or ``loader(*args, **kwargs)`` stored and returned.
+
+        If several threads miss the same key at once, only the first calls
+        ``loader``; the rest wait for its result (or its exception).
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        return self._load(key, loader, args, kwargs)
+
+    def _load(self, key: Hashable, loader: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Any:
+        """Miss path of get_or_load (the miss is already counted)."""
+        with self._guard:
+            value = self._fresh(key)
+            if value is not _MISSING:
+                return value
+            load = self._loading.get(key)
+            owner = load is None
+            if owner:
+                load = self._loading[key] = _Load()
+                self._loads += 1
+            else:
+                self._coalesced += 1
+
+        if not owner:
+            load.done.wait()
+            if load.error is not None:
+                raise load.error
+            return load.value
+
+        try:
+            value = loader(*args, **kwargs)
+        except BaseException as error:
+            load.error = error
+            with self._guard:
+                self._load_errors += 1
+                del self._loading[key]
+            load.done.set()
+            raise
+        with self._guard:
+            self._store(key, value, None)
+            del self._loading[key]
+        load.value = value
+        load.done.set()
+        return value
+
+    async def aget_or_load(
+        self, key: Hashable, loader: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        asyncio version of get_or_load: ``await loader(*args, **kwargs)`` runs once per missed key.
+
+        Coroutines that miss while a load is running await the same future.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._guard:
+            value = self._fresh(key)
+            if value is not _MISSING:
+                return value
+            future = self._async_loading.get(key)
+            owner = future is None
+            if owner:
+                future = self._async_loading[key] = asyncio.get_running_loop().create_future()
+                self._loads += 1
+            else:
+                self._coalesced += 1
+        if not owner:
+            return await asyncio.shield(future)
+
+        try:
+            value = await loader(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            future.exception()  # Mark retrieved: the caller re-raises it below
+            with self._guard:
+                self._load_errors += 1
+            raise
+        else:
+            with self._guard:
+                self._store(key, value, None)
+            future.set_result(value)
+            return value
+        finally:
+            del self._async_loading[key]
+
+
+def _make_key(args: tuple, kwargs: Dict[str, Any]) -> Hashable:
+    """Cache key for a call; a lone int/str argument is its own key (like functools)."""
+    if not kwargs:
+        return args[0] if len(args) == 1 and type(args[0]) in _FAST_KEY_TYPES else args
+    key = args + _KWD_MARK  # No positional call can produce a key holding the marker
+    for item in sorted(kwargs.items()):
+        key += item
+    return key
+
+
+def cached(cache: Optional[Cache] = None, **options: Any) -> Callable[[Callable], Callable]:
+    """
+    Decorator caching a function's results by its arguments.
+
+    Works for plain and ``async def`` functions; concurrent misses for the
+    same arguments share one call. ``options`` create a Cache (max_size,
+    ttl, max_cost, cost, thread_safe, clock) unless ``cache`` is given.
+    The cache is available as ``function.cache``.
+    """
+    cache = cache if cache is not None else Cache(**options)
+
+    def decorate(function: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await cache.aget_or_load(_make_key(args, kwargs), function, *args, **kwargs)
+
+            async_wrapper.cache = cache  # type: ignore[attr-defined]
+            return async_wrapper
+
+        get, load = cache.get, cache._load
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not kwargs and len(args) == 1 and type(args[0]) in _FAST_KEY_TYPES:
+                key = args[0]  # _make_key's fast path, inlined for the hit path
+            else:
+                key = _make_key(args, kwargs)
+            value = get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            return load(key, function, args, kwargs)
+
+        wrapper.cache = cache  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorate
+
+
+def benchmark_cache(calls: int = 1_000_000, backend_delay: float = 0.05) -> None:
+    """Per-hit overhead against functools.lru_cache, and backend calls saved by coalescing."""
+
+    @functools.lru_cache(maxsize=1024)
+    def lru_lookup(user_id: int) -> Tuple[str, int, str]:
+        return ("John Doe", 30, "john@example.com")
+
+    @cached(max_size=1024)
+    def locked_lookup(user_id: int) -> Tuple[str, int, str]:
+        return ("John Doe", 30, "john@example.com")
+
+    @cached(max_size=1024, ttl=300, thread_safe=False)
+    def ttl_lookup(user_id: int) -> Tuple[str, int, str]:
+        return ("John Doe", 30, "john@example.com")
+
+    plain = Cache(max_size=1024, thread_safe=False)
+    plain.set(123, ("John Doe", 30, "john@example.com"))
+
+    def per_call(function: Callable[[int], Any]) -> float:
+        function(123)
+        start = time.perf_counter()
+        for _ in range(calls):
+            function(123)
+        return (time.perf_counter() - start) / calls
+
+    print(f"Cache hit overhead ({calls:,} hits):")
+    print(f"  functools.lru_cache:           {per_call(lru_lookup) * 1e9:6.0f} ns")
+    print(f"  Cache.get, no lock:            {per_call(plain.get) * 1e9:6.0f} ns")
+    print(f"  @cached, thread-safe:          {per_call(locked_lookup) * 1e9:6.0f} ns")
+    print(f"  @cached, TTL, no lock:         {per_call(ttl_lookup) * 1e9:6.0f} ns")
+
+    backend_calls = []
+
+    @cached(ttl=60)
+    def slow_lookup(user_id: int) -> Tuple[str, int, str]:
+        backend_calls.append(user_id)
+        time.sleep(backend_delay)
+        return ("John Doe", 30, "john@example.com")
+
+    threads = [threading.Thread(target=slow_lookup, args=(123,)) for _ in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"  50 threads missing one key:    {len(backend_calls)} backend call, {slow_lookup.cache.stats()}")
+
+    async_calls = []
+
+    @cached(ttl=60, thread_safe=False)
+    async def async_lookup(user_id: int) -> Tuple[str, int, str]:
+        async_calls.append(user_id)
+        await asyncio.sleep(backend_delay)
+        return ("John Doe", 30, "john@example.com")
+
+    async def burst() -> None:
+        await asyncio.gather(*(async_lookup(user_id % 5) for user_id in range(500)))
+
+    asyncio.run(burst())
+    print(f"  500 coroutines over 5 keys:    {len(async_calls)} backend calls, "
+          f"{async_lookup.cache.stats().coalesced} coalesced misses")
+
+
+if __name__ == "__main__":
+    print("\n=== Lookup Cache Demo ===\n")
+    now = [0.0]  # A fake clock makes expiry visible without sleeping
+    backend_calls = []
+
+    @cached(max_size=2, ttl=60, clock=lambda: now[0])
+    def get_user_info(user_id: int) -> Tuple[str, int, str]:
+        """Same lookup as chapter2_tuples_sets.py, now behind a cache."""
+        backend_calls.append(user_id)
+        return ("John Doe", 30, "john@example.com")
+
+    for user_id in [123, 123, 456, 789, 123]:
+        get_user_info(user_id)
+    print(f"Backend calls: {backend_calls} (123 was evicted as least recently used)")
+    now[0] = 61
+    get_user_info(123)
+    print(f"After 61 s:    {backend_calls} (entry expired)")
+    print(f"Stats: {get_user_info.cache.stats()}")
+
+    sizes = Cache(max_size=None, max_cost=10, cost=len)
+    for word in ["alpha", "beta", "gamma"]:
+        sizes.set(word, word)
+    print(f"Cost-limited cache keeps {[key for key in ['alpha', 'beta', 'gamma'] if key in sizes]}")
+
+    print()
+    benchmark_cache()
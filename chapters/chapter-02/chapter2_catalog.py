@@ -0,0 +1,561 @@
+# Chapter 2.4 Extension: Product Catalog Indexes
+# Tag, category and price queries answered from indexes instead of list scans
+
+"""
+C# Equivalent Idea:
+Dictionary<string, List<int>> skusByTag;        // inverted index: tag -> sorted SKU ids
+int[] skusByPrice;                              // SKU ids ordered by price, binary searched
+var hits = skusByTag["portable"].Intersect(skusByCategory["Electronics"]).Where(InPriceRange);
+"""
+
+import heapq
+import math
+import random
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from itertools import accumulate, chain, compress, repeat
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from chapter2_classes import Product
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python fallbacks are used instead
+    np = None
+
+_EMPTY = array("I")
+
+
+@dataclass(frozen=True)
+class ProductViolation:
+    """One invalid value found during a bulk load."""
+
+    row: int
+    field: str
+    value: Any
+    message: str
+
+
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def validate_product_columns(
+    prices: Sequence[Any],
+    categories: Sequence[Any],
+    allowed_categories: Optional[Iterable[str]] = None,
+) -> Tuple[Any, List[ProductViolation]]:
+    """
+    Check whole price and category columns and report every bad row.
+
+    Prices must convert to a number (NaN is rejected too, since it cannot be
+    ordered) and not be negative, the rule Product.__post_init__ applies.
+    Categories must be non-empty strings, from ``allowed_categories`` if
+    given. Each distinct category is checked once.
+
+    Returns:
+        (prices as floats - NumPy array or array('d') - , violations sorted by row)
+    """
+    if len(prices) != len(categories):
+        raise ValueError("All columns must have the same length")
+    violations: List[ProductViolation] = []
+
+    floats = None
+    if np is not None:
+        try:
+            floats = np.asarray(prices, dtype=np.float64)
+        except (TypeError, ValueError):
+            pass  # Some value is not a number: find which ones below
+    if floats is None:
+        converted = list(map(_as_float, prices))
+        for row in [i for i, value in enumerate(converted) if value is None]:
+            violations.append(ProductViolation(row, "price", prices[row], "Price must be a number"))
+        floats = array("d", (value if value is not None else math.nan for value in converted))
+        if np is not None:
+            floats = np.frombuffer(floats, dtype=np.float64)
+        not_number = {violation.row for violation in violations}
+    else:
+        not_number = set()
+
+    if np is not None:
+        bad_rows = np.flatnonzero(~(floats >= 0)).tolist()
+    else:
+        bad_rows = [i for i, value in enumerate(floats) if not value >= 0]
+    for row in bad_rows:
+        if row not in not_number:
+            value = prices[row]
+            message = "Price cannot be negative" if floats[row] < 0 else "Price must be a number"
+            violations.append(ProductViolation(row, "price", value, message))
+
+    allowed = set(allowed_categories) if allowed_categories is not None else None
+    bad_categories = {
+        category for category in dict.fromkeys(categories)
+        if not (isinstance(category, str) and category.strip())
+        or (allowed is not None and category not in allowed)
+    }
+    if bad_categories:
+        for row, category in enumerate(categories):
+            if category in bad_categories:
+                message = "Unknown category" if isinstance(category, str) and category.strip() else "Category cannot be empty"
+                violations.append(ProductViolation(row, "category", category, message))
+
+    violations.sort(key=lambda violation: violation.row)
+    return floats, violations
+
+
+def _repeat_skus(lengths: List[int]) -> Sequence[int]:
+    """SKU id i repeated lengths[i] times (the owner of every flattened tag)."""
+    if np is not None:
+        return np.repeat(np.arange(len(lengths), dtype=np.uint32), lengths)
+    return list(chain.from_iterable(map(repeat, range(len(lengths)), lengths)))
+
+
+def _group_by_code(codes: array, skus: Optional[Sequence[int]], count: int) -> List[array]:
+    """Posting lists: ascending SKU ids for each code 0..count-1 (``skus=None``: row numbers)."""
+    if np is not None:
+        codes_np = np.frombuffer(codes, dtype=np.uint32)
+        # Stable keeps SKU ids ascending; 16-bit keys let NumPy use a radix sort
+        keys = codes_np.astype(np.uint16) if count <= 1 << 16 else codes_np
+        order = np.argsort(keys, kind="stable")
+        grouped = order.astype(np.uint32) if skus is None else np.asarray(skus, dtype=np.uint32)[order]
+        ends = np.cumsum(np.bincount(codes_np, minlength=count)).tolist()
+        starts = [0] + ends[:-1]
+        return [array("I", grouped[a:b].tobytes()) for a, b in zip(starts, ends)]
+    postings = [array("I") for _ in range(count)]
+    for code, sku in zip(codes, range(len(codes)) if skus is None else skus):
+        postings[code].append(sku)
+    return postings
+
+
+def _has_repeated_tags(
+    tags: Sequence[Sequence[str]], codes: array, owners: Sequence[int], longest: int
+) -> bool:
+    """True if some row lists the same tag twice."""
+    if np is None:
+        return any(len(set(row)) != len(row) for row in tags)
+    codes_np = np.frombuffer(codes, dtype=np.uint32)
+    # A repeat sits fewer than ``longest`` places after the first occurrence
+    return any(
+        np.any((codes_np[gap:] == codes_np[:-gap]) & (owners[gap:] == owners[:-gap]))
+        for gap in range(1, longest)
+    )
+
+
+def _valid_rows_mask(count: int, violations: List[ProductViolation]) -> bytearray:
+    """1 for rows without violations, 0 for the others (for itertools.compress)."""
+    keep = bytearray(b"\x01") * count
+    for violation in violations:
+        keep[violation.row] = 0
+    return keep
+
+
+class ProductCatalog:
+    """
+    Column-oriented product store with three kinds of index.
+
+    * inverted indexes: tag -> SKU ids, category -> SKU ids (ascending)
+    * category facet counts, kept up to date on every add
+    * a price index: SKU ids sorted by price, rebuilt lazily after adds
+
+    SKU ids are positions in insertion order. A query starts from its most
+    selective index and checks the remaining conditions only on those ids.
+    """
+
+    def __init__(self, products: Iterable[Product] = ()) -> None:
+        self.names: List[str] = []
+        self.prices = array("d")
+        self.categories: List[str] = []  # Category name per code
+        self.category_codes = array("I")
+        self.tags: List[str] = []  # Tag name per code
+        self._tag_codes = array("I")  # Tags of every SKU, back to back
+        self._tag_offsets = array("I", [0])  # SKU i's tags: _tag_codes[offsets[i]:offsets[i + 1]]
+        self._category_by_name: Dict[str, int] = {}
+        self._tag_by_name: Dict[str, int] = {}
+        self._category_postings: Dict[str, array] = {}
+        self._tag_postings: Dict[str, array] = {}
+        self._price_order: Optional[array] = None  # SKU ids sorted by price
+        self._sorted_prices: Optional[array] = None
+        self.extend(products)
+
+    def add(self, product: Product) -> int:
+        """Add a product; returns its SKU id."""
+        return self._append(product.name, product.price, product.category, product.tags)
+
+    def extend(self, products: Iterable[Product]) -> None:
+        """Add many products."""
+        for product in products:
+            self._append(product.name, product.price, product.category, product.tags)
+
+    @classmethod
+    def from_columns(
+        cls,
+        names: Sequence[str],
+        prices: Sequence[Any],
+        categories: Sequence[Any],
+        tags: Optional[Sequence[Sequence[str]]] = None,
+        allowed_categories: Optional[Iterable[str]] = None,
+    ) -> Tuple["ProductCatalog", List[ProductViolation]]:
+        """
+        Build a catalog straight from columns, without Product objects.
+
+        Every row is validated first (see validate_product_columns); rows
+        with violations are left out and reported, the rest are loaded with
+        whole-column operations.
+        """
+        tags = tags if tags is not None else [()] * len(names)
+        if not len(names) == len(prices) == len(categories) == len(tags):
+            raise ValueError("All columns must have the same length")
+        floats, violations = validate_product_columns(prices, categories, allowed_categories)
+        if violations:
+            keep = _valid_rows_mask(len(names), violations)
+            names, categories, tags = (list(compress(column, keep)) for column in (names, categories, tags))
+            floats = floats[np.frombuffer(keep, dtype=bool)] if np is not None else array("d", compress(floats, keep))
+
+        catalog = cls()
+        catalog.names = list(names)
+        catalog.prices = array("d", floats.tobytes()) if np is not None else array("d", floats)
+
+        # Dictionary-encode categories: each distinct name is looked up once
+        catalog.categories = list(dict.fromkeys(categories))
+        catalog._category_by_name = {name: code for code, name in enumerate(catalog.categories)}
+        catalog.category_codes = array("I", map(catalog._category_by_name.__getitem__, categories))
+
+        # Tags side by side (CSR)
+        catalog.tags = list(dict.fromkeys(chain.from_iterable(tags)))
+        catalog._tag_by_name = {name: code for code, name in enumerate(catalog.tags)}
+        while True:
+            lengths = list(map(len, tags))
+            tag_codes = array("I", map(catalog._tag_by_name.__getitem__, chain.from_iterable(tags)))
+            owners = _repeat_skus(lengths)
+            if not _has_repeated_tags(tags, tag_codes, owners, max(lengths, default=0)):
+                break
+            tags = [list(dict.fromkeys(row)) for row in tags]  # Rare: drop repeats and redo
+        catalog._tag_codes = tag_codes
+        catalog._tag_offsets = array("I", [0])
+        catalog._tag_offsets.extend(accumulate(lengths))
+
+        category_postings = _group_by_code(catalog.category_codes, None, len(catalog.categories))
+        tag_postings = _group_by_code(tag_codes, owners, len(catalog.tags))
+        catalog._category_postings = dict(zip(catalog.categories, category_postings))
+        catalog._tag_postings = dict(zip(catalog.tags, tag_postings))
+        return catalog, violations
+
+    def _append(self, name: str, price: float, category: str, tags: Iterable[str]) -> int:
+        sku = len(self.names)
+        self.names.append(name)
+        self.prices.append(price)
+
+        code = self._category_by_name.get(category)
+        if code is None:
+            code = self._category_by_name[category] = len(self.categories)
+            self.categories.append(category)
+            self._category_postings[category] = array("I")
+        self.category_codes.append(code)
+        self._category_postings[category].append(sku)
+
+        for tag in dict.fromkeys(tags):  # Drop repeated tags, keep order
+            code = self._tag_by_name.get(tag)
+            if code is None:
+                code = self._tag_by_name[tag] = len(self.tags)
+                self.tags.append(tag)
+                self._tag_postings[tag] = array("I")
+            self._tag_codes.append(code)
+            self._tag_postings[tag].append(sku)
+        self._tag_offsets.append(len(self._tag_codes))
+
+        self._price_order = self._sorted_prices = None
+        return sku
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, sku: int) -> Product:
+        """Materialize a Product for one SKU id."""
+        tag_codes = self._tag_codes[self._tag_offsets[sku]:self._tag_offsets[sku + 1]]
+        return Product(
+            self.names[sku],
+            self.prices[sku],
+            self.categories[self.category_codes[sku]],
+            [self.tags[code] for code in tag_codes],
+        )
+
+    def _build_price_index(self) -> None:
+        if np is not None:
+            prices = np.frombuffer(self.prices, dtype=np.float64)
+            order = np.argsort(prices, kind="stable").astype(np.uint32)
+            self._price_order = array("I", order.tobytes())
+            self._sorted_prices = array("d", prices[order].tobytes())
+        else:
+            self._price_order = array("I", sorted(range(len(self.prices)), key=self.prices.__getitem__))
+            self._sorted_prices = array("d", map(self.prices.__getitem__, self._price_order))
+
+    def _price_span(self, min_price: Optional[float], max_price: Optional[float]) -> range:
+        """Positions in the price index with min_price <= price <= max_price."""
+        if self._price_order is None:
+            self._build_price_index()
+        low = 0 if min_price is None else bisect_left(self._sorted_prices, min_price)
+        high = len(self.prices) if max_price is None else bisect_right(self._sorted_prices, max_price)
+        return range(low, max(low, high))
+
+    def _postings(self, tags: Sequence[str], category: Optional[str]) -> List[array]:
+        postings = [self._tag_postings.get(tag, _EMPTY) for tag in tags]
+        if category is not None:
+            postings.append(self._category_postings.get(category, _EMPTY))
+        return sorted(postings, key=len)
+
+    def _matches(self, sku: int, tag_codes: Sequence[int], category_code: Optional[int]) -> bool:
+        if category_code is not None and self.category_codes[sku] != category_code:
+            return False
+        if tag_codes:
+            own = self._tag_codes[self._tag_offsets[sku]:self._tag_offsets[sku + 1]]
+            return all(code in own for code in tag_codes)
+        return True
+
+    def _intersect(self, postings: List[array]) -> Sequence[int]:
+        """SKU ids present in every posting list (ascending)."""
+        if np is not None:
+            result = np.frombuffer(postings[0], dtype=np.uint32)
+            for posting in postings[1:]:
+                result = np.intersect1d(result, np.frombuffer(posting, dtype=np.uint32), assume_unique=True)
+            return result
+        result = postings[0]
+        for posting in postings[1:]:
+            members = set(posting)
+            result = [sku for sku in result if sku in members]
+        return result
+
+    def query(
+        self,
+        tags: Sequence[str] = (),
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[int]:
+        """
+        SKU ids having every tag, in the category and price range, cheapest first.
+
+        With ``limit``, only the cheapest ``limit`` matches are returned.
+        """
+        postings = self._postings(tags, category)
+        span = self._price_span(min_price, max_price)
+        if any(not posting for posting in postings) or not span or limit == 0:
+            return []
+
+        # Walking the price index in order stops early with a limit: about
+        # limit * len(span) / len(smallest posting) SKUs are checked
+        walk = len(span)
+        if limit is not None and postings:
+            walk = min(walk, limit * len(span) // len(postings[0]))
+        if not postings or walk <= len(postings[0]):
+            # Price order is the cheapest way in: walk it and check the rest
+            tag_codes = [self._tag_by_name[tag] for tag in tags]
+            category_code = self._category_by_name[category] if category is not None else None
+            matches: List[int] = []
+            for position in span:
+                sku = self._price_order[position]
+                if self._matches(sku, tag_codes, category_code):
+                    matches.append(sku)
+                    if limit is not None and len(matches) == limit:
+                        break
+            return matches
+
+        skus = self._intersect(postings)
+        low = -float("inf") if min_price is None else min_price
+        high = float("inf") if max_price is None else max_price
+        if np is not None:
+            prices = np.frombuffer(self.prices, dtype=np.float64)[skus]
+            keep = (prices >= low) & (prices <= high)
+            skus, prices = skus[keep], prices[keep]
+            if limit is not None and limit < len(skus):
+                nearest = np.argpartition(prices, limit)[:limit]
+                skus, prices = skus[nearest], prices[nearest]
+            return skus[np.argsort(prices, kind="stable")].tolist()
+
+        prices = self.prices
+        skus = [sku for sku in skus if low <= prices[sku] <= high]
+        if limit is not None:
+            return heapq.nsmallest(limit, skus, key=prices.__getitem__)
+        return sorted(skus, key=prices.__getitem__)
+
+    def cheapest(self, count: int, **filters) -> List[Product]:
+        """The ``count`` cheapest matching products (same filters as ``query``)."""
+        return [self.get(sku) for sku in self.query(limit=count, **filters)]
+
+    def category_counts(self, tags: Sequence[str] = (), **price_range) -> Dict[str, int]:
+        """
+        Facet counts: matching products per category.
+
+        Without filters this reads the index sizes; otherwise it counts the
+        categories of the query result.
+        """
+        if not tags and not price_range:
+            return {name: len(self._category_postings[name]) for name in self.categories}
+        skus = self.query(tags, **price_range)
+        if np is not None:
+            codes = np.frombuffer(self.category_codes, dtype=np.uint32)[skus]
+            counts = np.bincount(codes, minlength=len(self.categories)).tolist()
+            return {name: n for name, n in zip(self.categories, counts) if n}
+        tally = Counter(self.category_codes[sku] for sku in skus)
+        return {self.categories[code]: n for code, n in tally.items()}
+
+
+CATEGORIES = ["Electronics", "Books", "Home", "Toys", "Garden", "Sports", "Clothing", "Grocery"]
+TAGS = ["portable", "wireless", "sale", "new", "eco", "premium", "kids", "gift", "outdoor", "bundle"]
+
+
+def generate_product_columns(
+    count: int, seed: int = 13, bad_every: int = 0
+) -> Tuple[List[str], List[Any], List[str], List[List[str]]]:
+    """Random (names, prices, categories, tags) columns with 0-3 tags per product.
+
+    With ``bad_every``, every n-th row gets a negative price or an empty category.
+    """
+    rng = random.Random(seed)
+    names = [f"SKU-{i:07d}" for i in range(count)]
+    prices: List[Any] = [round(rng.uniform(1, 2_000), 2) for _ in range(count)]
+    categories = [rng.choice(CATEGORIES) for _ in range(count)]
+    tags = [rng.sample(TAGS, rng.randrange(4)) for _ in range(count)]
+    if bad_every:
+        for row in range(bad_every - 1, count, bad_every):
+            if row // bad_every % 2:
+                prices[row] = -prices[row]
+            else:
+                categories[row] = ""
+    return names, prices, categories, tags
+
+
+def generate_products(count: int, seed: int = 13) -> Iterable[Product]:
+    """Random products with 0-3 tags each."""
+    return map(Product, *generate_product_columns(count, seed))
+
+
+def build_products(
+    names: Sequence[str],
+    prices: Sequence[Any],
+    categories: Sequence[Any],
+    tags: Optional[Sequence[Sequence[str]]] = None,
+    allowed_categories: Optional[Iterable[str]] = None,
+) -> Tuple[List[Product], List[ProductViolation]]:
+    """
+    Validate whole columns, then create Product objects for the valid rows.
+
+    Unlike a constructor loop, one bad row does not stop the load: every
+    violation is returned with its row number.
+    """
+    tags = tags if tags is not None else [[] for _ in range(len(names))]
+    if not len(names) == len(prices) == len(categories) == len(tags):
+        raise ValueError("All columns must have the same length")
+    floats, violations = validate_product_columns(prices, categories, allowed_categories)
+    floats = floats.tolist()
+    if violations:
+        keep = _valid_rows_mask(len(names), violations)
+        names, floats, categories, tags = (
+            list(compress(column, keep)) for column in (names, floats, categories, tags)
+        )
+    return list(map(Product, names, floats, categories, tags)), violations
+
+
+def benchmark_bulk_load(count: int = 2_000_000) -> None:
+    """Compare a per-object constructor loop with the bulk loaders."""
+    columns = generate_product_columns(count, bad_every=10_000)
+
+    start = time.perf_counter()
+    products, errors = [], []
+    for row, values in enumerate(zip(*columns)):
+        try:
+            products.append(Product(*values))
+        except ValueError as error:
+            errors.append((row, str(error)))  # Empty categories slip through here
+    loop = time.perf_counter() - start
+    start = time.perf_counter()
+    catalog = ProductCatalog(products)
+    indexing = time.perf_counter() - start
+    del products, catalog
+
+    start = time.perf_counter()
+    products, violations = build_products(*columns)
+    objects = time.perf_counter() - start
+    del products
+
+    start = time.perf_counter()
+    catalog, _ = ProductCatalog.from_columns(*columns)
+    columnar = time.perf_counter() - start
+
+    backend = "NumPy" if np is not None else "pure Python"
+    print(f"Loading {count:,} products ({len(violations):,} violations found, {backend}):")
+    print(f"  constructor loop:                  {loop:6.2f}s ({len(errors):,} errors caught)")
+    print(f"  constructor loop + ProductCatalog: {loop + indexing:6.2f}s")
+    print(f"  build_products (objects):          {objects:6.2f}s")
+    print(f"  ProductCatalog.from_columns:       {columnar:6.2f}s ({count / columnar:,.0f} rows/s)")
+
+
+def benchmark_catalog(count: int = 1_000_000, queries: int = 20) -> None:
+    """Compare indexed queries with list scans over Product objects."""
+    products = list(generate_products(count))
+    start = time.perf_counter()
+    catalog = ProductCatalog(products)
+    catalog.query(max_price=0)  # Build the price index now, not during the first query
+    build = time.perf_counter() - start
+
+    cases = [
+        ("Electronics under $500 tagged portable", dict(tags=["portable"], category="Electronics", max_price=500)),
+        ("10 cheapest wireless+premium", dict(tags=["wireless", "premium"], limit=10)),
+        ("Books $10-$12", dict(category="Books", min_price=10, max_price=12)),
+    ]
+    print(f"Catalog of {count:,} products (index build {build:.2f}s):")
+    for label, filters in cases:
+        tags = set(filters.get("tags", ()))
+        low, high = filters.get("min_price", 0), filters.get("max_price", float("inf"))
+
+        start = time.perf_counter()
+        scanned = [
+            i for i, p in enumerate(products)
+            if tags.issubset(p.tags) and filters.get("category", p.category) == p.category
+            and low <= p.price <= high
+        ]
+        scanned.sort(key=lambda i: products[i].price)
+        scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(queries):
+            found = catalog.query(**filters)
+        indexed = (time.perf_counter() - start) / queries
+        expected = scanned[: filters["limit"]] if "limit" in filters else scanned
+        assert [products[i].price for i in found] == [products[i].price for i in expected]
+        print(f"  {label:40} scan {scan * 1e3:8.1f} ms, index {indexed * 1e3:7.2f} ms, {len(found):,} hits")
+
+
+if __name__ == "__main__":
+    print("\n=== Product Catalog Demo ===\n")
+    catalog = ProductCatalog([
+        Product("Laptop", 999.99, "Electronics", ["computer", "portable"]),
+        Product("Tablet", 449.00, "Electronics", ["portable", "touch"]),
+        Product("Headphones", 129.50, "Electronics", ["portable", "wireless"]),
+        Product("Desk", 249.00, "Home", ["office"]),
+        Product("Novel", 14.99, "Books", ["portable", "fiction"]),
+    ])
+
+    hits = catalog.query(tags=["portable"], category="Electronics", max_price=500)
+    print(f"Electronics under $500 tagged portable: {[catalog.names[i] for i in hits]}")
+    print(f"Cheapest 2 portable: {catalog.cheapest(2, tags=['portable'])}")
+    print(f"Category facets: {catalog.category_counts()}")
+    print(f"Facets for portable: {catalog.category_counts(['portable'])}")
+
+    names, prices, categories, tags = generate_product_columns(6, seed=1)
+    prices[2], categories[4] = -5.0, ""
+    loaded, violations = ProductCatalog.from_columns(names, prices, categories, tags)
+    print(f"\nBulk load: {len(loaded)} of {len(names)} rows loaded")
+    for violation in violations:
+        print(f"  row {violation.row}: {violation.field}={violation.value!r} - {violation.message}")
+
+    print()
+    benchmark_catalog()
+    print()
+    benchmark_bulk_load()
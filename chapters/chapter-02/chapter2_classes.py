@@ -22,6 +22,10 @@ public class Person
 }
 """
 
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
 
 # Python Class Definition - Much simpler syntax!
 class Person:
@@ -173,21 +177,163 @@ print(f"New salary: {employee.annual_salary}")
 
 # ===== MULTIPLE INHERITANCE =====
 class Serializable:
-    """Mixin class for serialization functionality."""
+    """
+    Mixin class for serialization functionality.
+
+    Nested Serializable and Person objects (and lists/dicts of them) are
+    encoded recursively. An object, list or dict met again while it is still
+    being encoded (a cycle) is written as {"$ref": "#<JSON pointer>"} to
+    where it first appeared; with ``references=True`` the same goes for any
+    object already written, so shared reports are only encoded once. Shared
+    lists and dicts that are not part of a cycle are written out each time.
+    """
+
+    # Fast JSON text for common leaf types; anything else goes to json.dumps
+    _leaf_encoders: Dict[type, Callable[[Any], str]] = {
+        str: encode_basestring_ascii,
+        int: int.__repr__,
+        bool: lambda value: "true" if value else "false",
+        type(None): lambda value: "null",
+        float: lambda value: float.__repr__(value) if value - value == 0 else json.dumps(value),
+    }
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert object to dictionary."""
-        return {
-            key: value
-            for key, value in self.__dict__.items()
-            if not key.startswith("_")
-        }
+    @staticmethod
+    def _fields_of(obj: Any) -> List[Tuple[str, Any]]:
+        """Public (name, value) pairs of one object, read from its own __dict__."""
+        return [(key, value) for key, value in obj.__dict__.items() if not key.startswith("_")]
 
-    def to_json(self) -> str:
-        """Convert object to JSON string."""
-        import json
+    @staticmethod
+    def _json_key(key: Any) -> str:
+        """Dict key as text, converted the way json.dumps converts keys."""
+        if isinstance(key, str):
+            return key
+        if key is True or key is False or key is None:
+            return json.dumps(key)
+        if isinstance(key, float):
+            return json.dumps(key)  # repr, or Infinity/NaN
+        if isinstance(key, int):
+            return int.__repr__(key)
+        raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
 
-        return json.dumps(self.to_dict(), indent=2)
+    @staticmethod
+    def _pointer(parent: str, key: Any) -> str:
+        """JSON pointer (RFC 6901) of ``key`` inside ``parent``."""
+        key = Serializable._json_key(key)
+        return f"{parent}/{key.replace('~', '~0').replace('/', '~1')}"
+
+    @staticmethod
+    def _to_plain(
+        value: Any, pointer: str, active: Dict[int, str], seen: Optional[Dict[int, str]]
+    ) -> Any:
+        if isinstance(value, (Serializable, Person)):
+            known = active if seen is None else seen
+            if id(value) in known:
+                return {"$ref": "#" + known[id(value)]}
+            active[id(value)] = pointer
+            if seen is not None:
+                seen[id(value)] = pointer
+            result = {
+                name: Serializable._to_plain(
+                    item, Serializable._pointer(pointer, name), active, seen
+                )
+                for name, item in Serializable._fields_of(value)
+            }
+            del active[id(value)]
+            return result
+        if isinstance(value, (list, tuple, dict)):
+            if id(value) in active:
+                return {"$ref": "#" + active[id(value)]}
+            active[id(value)] = pointer
+            if isinstance(value, dict):
+                result = {
+                    key: Serializable._to_plain(item, Serializable._pointer(pointer, key), active, seen)
+                    for key, item in value.items()
+                }
+            else:
+                result = [
+                    Serializable._to_plain(item, Serializable._pointer(pointer, i), active, seen)
+                    for i, item in enumerate(value)
+                ]
+            del active[id(value)]
+            return result
+        return value
+
+    def to_dict(self, references: bool = True) -> Dict[str, Any]:
+        """Convert object (and nested objects) to a dictionary."""
+        return self._to_plain(self, "", {}, {} if references else None)
+
+    def to_json(self, references: bool = True) -> str:
+        """Convert object to JSON string."""
+        return json.dumps(self.to_dict(references), indent=2)
+
+    def iter_json(self, references: bool = True, chunk_size: int = 4_096) -> Iterator[str]:
+        """
+        Yield compact JSON for the object graph in chunks of text.
+
+        Works with an explicit stack instead of recursion, so memory depends
+        on the depth of the graph, not its size. With ``references=True`` the
+        ids of written objects are also remembered (one entry per object);
+        pass False for huge trees where only cycles need detecting.
+        """
+        leaf_encoders = self._leaf_encoders
+        active: Dict[int, str] = {}  # Objects and containers on the current path -> pointer
+        seen: Optional[Dict[int, str]] = {} if references else None
+        # Frame: [remaining (key, value) pairs, closing bracket, pointer, object id, items written]
+        stack: List[List[Any]] = []
+        out: List[str] = []
+
+        def enter(value: Any, parent: str, key: Any) -> str:
+            if isinstance(value, (Serializable, Person)):
+                known = active if seen is None else seen
+                if id(value) in known:
+                    return '{"$ref": ' + encode_basestring_ascii("#" + known[id(value)]) + "}"
+                pointer = self._pointer(parent, key) if stack else ""
+                active[id(value)] = pointer
+                if seen is not None:
+                    seen[id(value)] = pointer
+                stack.append([iter(self._fields_of(value)), "}", pointer, id(value), 0])
+                return "{"
+            if isinstance(value, (list, tuple, dict)):
+                if id(value) in active:
+                    return '{"$ref": ' + encode_basestring_ascii("#" + active[id(value)]) + "}"
+                pointer = self._pointer(parent, key)
+                active[id(value)] = pointer
+                if isinstance(value, dict):
+                    stack.append([iter(value.items()), "}", pointer, id(value), 0])
+                    return "{"
+                stack.append([enumerate(value), "]", pointer, id(value), 0])
+                return "["
+            return json.dumps(value)
+
+        out.append(enter(self, "", None))
+        while stack:
+            frame = stack[-1]
+            is_object = frame[1] == "}"
+            for key, value in frame[0]:
+                prefix = ", " if frame[4] else ""
+                frame[4] += 1
+                if is_object:
+                    prefix += encode_basestring_ascii(self._json_key(key)) + ": "
+                encoder = leaf_encoders.get(type(value))
+                if encoder is not None:
+                    out.append(prefix + encoder(value))
+                    continue
+                out.append(prefix + enter(value, frame[2], key))
+                if stack[-1] is not frame:
+                    break  # Descend into the new container first
+            else:
+                stack.pop()
+                del active[frame[3]]
+                out.append(frame[1])
+            if len(out) >= chunk_size:
+                yield "".join(out)
+                out.clear()
+        yield "".join(out)
+
+    def write_json(self, buffer: TextIO, references: bool = True) -> None:
+        """Stream compact JSON into a text buffer."""
+        for chunk in self.iter_json(references):
+            buffer.write(chunk)
 
 
 class Manager(Employee, Serializable):
@@ -276,7 +422,6 @@ print(f"Length of p1: {len(p1)}")  # Uses __len__
 
 # ===== DATACLASSES (Modern Python) =====
 from dataclasses import dataclass, field
-from typing import Any, Dict, List
 
 @dataclass
 class Product:
@@ -320,3 +465,47 @@ Key differences from C#:
 9. Mixin classes for shared functionality
 10. No need for explicit interface implementations
 """
+
+
+def export_org_chart(
+    size: int = 100_000, team_size: int = 1_000, references: bool = False
+) -> None:
+    """Stream a large org chart to disk and report peak memory while writing."""
+    import os
+    import tempfile
+    import time
+    import tracemalloc
+
+    ceo = Manager("CEO", 60, "M0", 250000.0, size // team_size)
+    employee_number = 1
+    while employee_number < size:
+        lead = Manager(f"Lead {len(ceo.reports)}", 45, f"M{len(ceo.reports) + 1}", 120000.0, team_size)
+        ceo.reports.append(lead)
+        employee_number += 1
+        for _ in range(min(team_size - 1, size - employee_number)):
+            employee_number += 1
+            lead.reports.append(Employee(f"Employee {employee_number}", 30, f"E{employee_number}", 60000.0))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "org.json")
+        tracemalloc.start()  # Slows the export down several times, but shows the peak
+        start = time.perf_counter()
+        with open(path, "w", encoding="utf-8") as file:
+            ceo.write_json(file, references=references)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {employee_number:,} people, {os.path.getsize(path) / 1e6:.0f} MB written in {elapsed:.1f}s")
+        print(f"  peak memory while writing: {peak / 1e6:.1f} MB (references={references})")
+
+
+if __name__ == "__main__":
+    # Shared reports and cycles become {"$ref": ...} instead of endless nesting
+    peer = Manager("Frank", 41, "MGR002", 98000.0, 3)
+    peer.reports.extend([employee, manager])  # David reports to both managers
+    manager.reports.append(peer)  # Eva and Frank report to each other
+    print(f"\nWith a cycle: {''.join(manager.iter_json())}")
+    manager.reports.remove(peer)
+
+    print(f"\nExporting a {100_000:,}-person org chart:")
+    export_org_chart()
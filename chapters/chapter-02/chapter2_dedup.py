@@ -0,0 +1,356 @@
+# Chapter 2.3 Extension: Streaming Dedup
+# remove_duplicates_preserve_order for endless streams: any iterable, key functions, bounded memory
+
+"""
+C# Equivalent Idea:
+var seen = new HashSet<TKey>();
+foreach (var item in source)
+    if (seen.Add(keySelector(item))) yield return item;   // what DistinctBy does lazily
+// ...or a fixed-size Bloom filter when the HashSet would outgrow memory
+"""
+
+import hashlib
+import math
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from enum import Enum
+from itertools import islice
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Optional, Set, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python fallbacks are used instead
+    np = None
+
+_MASK64 = (1 << 64) - 1
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set of 16-byte digests.
+
+    The same filter as chapter 1's exercise1_1_dedup.BloomFilter (sizing and
+    bit positions match), kept here so this chapter runs on its own.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("Error rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bit_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.bits = bytearray((self.bit_count + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest: bytes) -> Iterator[int]:
+        # Double hashing, wrapping at 64 bits like the uint64 batch code below
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second & _MASK64) % self.bit_count
+
+    def add_digest(self, digest: bytes) -> bool:
+        """Add a 16-byte digest; return True if it was (probably) present already."""
+        present = True
+        bits = self.bits
+        for position in self._positions(digest):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        if not present:
+            self.count += 1
+        return present
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(digest)
+        )
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.bits)
+
+
+class DedupMode(Enum):
+    """How seen keys are remembered."""
+
+    EXACT = "exact"  # Set of the keys themselves: no false positives, grows with input
+    BLOOM = "bloom"  # Two rotating Bloom filters of key digests: fixed memory
+
+
+@dataclass
+class DedupStats:
+    """Items processed by a deduplicator, split into first sightings and repeats."""
+
+    processed: int = 0
+    unique: int = 0
+    duplicates: int = 0
+
+
+def key_digest(key: Hashable) -> bytes:
+    """
+    16-byte blake2b digest of a key's type and value.
+
+    Unlike ``hash`` (where hash(-1) == hash(-2)), distinct keys practically
+    never share a digest. Keys of different types differ even when they
+    compare equal, so 1 and 1.0 are two keys in Bloom mode.
+    """
+    if isinstance(key, str):
+        data = b"s" + key.encode("utf-8", "surrogatepass")
+    elif isinstance(key, int) and not isinstance(key, bool):
+        data = b"i" + key.to_bytes(key.bit_length() // 8 + 1, "little", signed=True)
+    elif isinstance(key, bytes):
+        data = b"b" + key
+    else:
+        data = b"r" + type(key).__qualname__.encode() + b":" + repr(key).encode()
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _bloom_positions(bloom: BloomFilter, digests: "np.ndarray") -> "np.ndarray":
+    """BloomFilter._positions for an (n, 2) uint64 array of digest halves: shape (hash_count, n)."""
+    first = digests[:, 0]
+    second = digests[:, 1] | np.uint64(1)
+    steps = np.arange(bloom.hash_count, dtype=np.uint64)[:, None]
+    return (first + steps * second) % np.uint64(bloom.bit_count)  # uint64 wraps at 64 bits too
+
+
+def _bloom_test(bloom: BloomFilter, positions: "np.ndarray") -> "np.ndarray":
+    """Which columns of ``positions`` have all their bits set."""
+    bits = np.frombuffer(bloom.bits, dtype=np.uint8)
+    masks = np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)
+    return (bits[positions >> np.uint64(3)] & masks).all(axis=0)
+
+
+def _bloom_add(bloom: BloomFilter, digests: "np.ndarray") -> "np.ndarray":
+    """
+    BloomFilter.add_digest for a batch of distinct digests; True where present already.
+
+    Membership is tested for the whole batch before any bit is set, so
+    digests in the same batch do not hide each other.
+    """
+    positions = _bloom_positions(bloom, digests)
+    present = _bloom_test(bloom, positions)
+    bits = np.frombuffer(bloom.bits, dtype=np.uint8)
+    masks = np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)
+    np.bitwise_or.at(bits, (positions >> np.uint64(3)).ravel(), masks.ravel())  # A byte may repeat
+    bloom.count += int(len(digests) - present.sum())
+    return present
+
+
+class StreamDeduplicator:
+    """
+    Order-preserving dedup of any iterable that keeps its memory across calls.
+
+    EXACT mode remembers the keys themselves in a set: no mistakes, but
+    memory grows with the number of distinct keys. BLOOM mode remembers
+    key digests in two Bloom filters of ``capacity`` keys each: when the
+    active one is full, the older one is dropped and a fresh one starts, so
+    memory stays fixed and at least the last ``capacity`` distinct keys are
+    recognized. Its mistakes are one-sided: up to about ``2 * error_rate``
+    of new keys are taken for duplicates and dropped.
+    """
+
+    def __init__(
+        self,
+        key: Optional[Callable[[Any], Hashable]] = None,
+        mode: Union[DedupMode, str] = DedupMode.EXACT,
+        capacity: int = 10_000_000,
+        error_rate: float = 0.001,
+        batch_size: int = 65_536,
+    ) -> None:
+        """
+        Args:
+            key: Function giving the value compared for an item (default: the item)
+            mode: DedupMode or its value ("exact" or "bloom")
+            capacity: Distinct keys each Bloom filter is sized for
+            error_rate: Target false-positive rate of a Bloom filter
+            batch_size: Items digested per NumPy batch in BLOOM mode (output is
+                delayed by up to one batch)
+        """
+        self.mode = DedupMode(mode)
+        self.key = key
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.batch_size = batch_size
+        self.stats = DedupStats()
+        self._keys: Set[Hashable] = set()
+        # Filters are only allocated in BLOOM mode; EXACT mode never reads them
+        self._active = BloomFilter(capacity if self.mode is DedupMode.BLOOM else 1, error_rate)
+        self._previous: Optional[BloomFilter] = None
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the dedup state (the set's table, not the keys it refers to)."""
+        if self.mode is DedupMode.EXACT:
+            return sys.getsizeof(self._keys)
+        previous = self._previous.size_bytes if self._previous is not None else 0
+        return self._active.size_bytes + previous
+
+    def _rotate(self) -> None:
+        """Start a fresh Bloom filter once the active one is full."""
+        if self._active.count >= self.capacity:
+            self._previous, self._active = self._active, BloomFilter(self.capacity, self.error_rate)
+
+    def is_new(self, item: Any) -> bool:
+        """Record one item; True the first time its key is seen."""
+        key = item if self.key is None else self.key(item)
+        if self.mode is DedupMode.EXACT:
+            seen = key in self._keys
+            self._keys.add(key)
+        else:
+            digest = key_digest(key)
+            seen = (self._previous is not None and digest in self._previous) or self._active.add_digest(digest)
+            if not seen:
+                self._rotate()
+        self.stats.processed += 1
+        if seen:
+            self.stats.duplicates += 1
+        else:
+            self.stats.unique += 1
+        return not seen
+
+    def filter(self, items: Iterable[Any]) -> Iterator[Any]:
+        """Yield the items whose keys were not seen before, in input order."""
+        if self.mode is DedupMode.EXACT:
+            return self._filter_exact(items)
+        if np is None:
+            return filter(self.is_new, items)
+        return self._filter_bloom(items)
+
+    def _filter_exact(self, items: Iterable[Any]) -> Iterator[Any]:
+        seen, key, stats = self._keys, self.key, self.stats
+        add = seen.add
+        if key is None:
+            for item in items:
+                stats.processed += 1
+                if item in seen:
+                    stats.duplicates += 1
+                else:
+                    add(item)
+                    stats.unique += 1
+                    yield item
+        else:
+            for item in items:
+                stats.processed += 1
+                k = key(item)
+                if k in seen:
+                    stats.duplicates += 1
+                else:
+                    add(k)
+                    stats.unique += 1
+                    yield item
+
+    def _filter_bloom(self, items: Iterable[Any]) -> Iterator[Any]:
+        iterator = iter(items)
+        while True:
+            room = self.capacity - self._active.count  # Rotate before overfilling a filter
+            batch = list(islice(iterator, max(1, min(self.batch_size, room))))
+            if not batch:
+                return
+            digests = list(map(key_digest, batch if self.key is None else map(self.key, batch)))
+            # First occurrence of each digest within the batch: with reversed
+            # pairs, the smallest index is the one dict() keeps
+            first = np.fromiter(dict(zip(reversed(digests), range(len(digests) - 1, -1, -1))).values(), np.int64)
+            first.sort()
+            halves = np.frombuffer(b"".join(digests), dtype=np.uint64).reshape(-1, 2)[first]
+            if self._previous is not None:
+                fresh = ~_bloom_test(self._previous, _bloom_positions(self._previous, halves))
+                halves, first = halves[fresh], first[fresh]
+            first = first[~_bloom_add(self._active, halves)]
+            self.stats.processed += len(batch)
+            self.stats.unique += len(first)
+            self.stats.duplicates += len(batch) - len(first)
+            self._rotate()
+            for index in first.tolist():
+                yield batch[index]
+
+
+def unique(
+    items: Iterable[Any],
+    key: Optional[Callable[[Any], Hashable]] = None,
+    mode: Union[DedupMode, str] = DedupMode.EXACT,
+    **options: Any,
+) -> Iterator[Any]:
+    """
+    Lazily yield the first item for each key, in input order.
+
+    Works on any iterable (generators, files, endless streams). ``options``
+    go to StreamDeduplicator (capacity, error_rate, batch_size).
+    """
+    return StreamDeduplicator(key, mode, **options).filter(items)
+
+
+def benchmark_dedup(count: int = 1_000_000, distinct: int = 500_000) -> None:
+    """Compare dict.fromkeys and the chapter's loop with unique() on integer IDs, including memory."""
+    rng = random.Random(5)
+    ids = [rng.randrange(distinct * 2) for _ in range(count)]
+    expected = list(dict.fromkeys(ids))
+
+    def run(label: str, function: Callable[[], List[int]], state: Callable[[], int]) -> List[int]:
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:34} {elapsed:6.2f}s, {count / elapsed / 1e6:5.2f}M items/s, state {state() / 1e6:7.1f} MB")
+        return result
+
+    print(f"Deduplicating {count:,} IDs ({len(expected):,} distinct):")
+    run("dict.fromkeys (needs a list)", lambda: list(dict.fromkeys(ids)), lambda: sys.getsizeof(dict.fromkeys(ids)))
+    chapter: List[int] = []
+
+    def chapter_loop() -> List[int]:
+        seen: set = set()
+        for item in ids:  # remove_duplicates_preserve_order
+            if item not in seen:
+                seen.add(item)
+                chapter.append(item)
+        return chapter
+    run("remove_duplicates_preserve_order", chapter_loop, lambda: sys.getsizeof(set(chapter)))
+
+    exact = StreamDeduplicator()
+    result = run("unique exact (generator)", lambda: list(exact.filter(iter(ids))), lambda: exact.memory_bytes)
+    assert result == expected
+
+    for error_rate in (0.01, 0.001):
+        bloom = StreamDeduplicator(mode="bloom", capacity=len(expected), error_rate=error_rate)
+        result = run(f"unique bloom, error_rate={error_rate}", lambda: list(bloom.filter(iter(ids))), lambda: bloom.memory_bytes)
+        lost = len(expected) - len(result)
+        print(f"    {lost:,} new IDs dropped as false positives ({lost / len(expected):.3%})")
+
+    # Bounded memory on a stream that never repeats: state stays at two filters
+    capacity = count // 10
+    bloom = StreamDeduplicator(mode="bloom", capacity=capacity, error_rate=0.001)
+    tracemalloc.start()
+    kept = sum(1 for _ in bloom.filter(range(count)))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  bloom on {count:,} unique IDs, capacity {capacity:,}: kept {kept:,}, state {bloom.memory_bytes / 1e6:.1f} MB, "
+          f"peak traced {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    print("\n=== Streaming Dedup Demo ===\n")
+    # Same list as remove_duplicates_preserve_order in chapter2_tuples_sets.py
+    original = [1, 2, 3, 2, 4, 3, 5, 1]
+    print(f"Deduplicated: {list(unique(original))}")
+    print(f"From a generator: {list(unique(n % 4 for n in range(10)))}")
+
+    emails = ["Ada@Example.com", "lin@example.com", "ada@example.com", "LIN@example.com "]
+    print(f"By normalized email: {list(unique(emails, key=lambda email: email.strip().lower()))}")
+
+    # Keys survive across batches: dedup a stream piece by piece
+    dedup = StreamDeduplicator(mode="bloom", capacity=1_000, error_rate=0.001)
+    first = list(dedup.filter(["a", "b", "a"]))
+    second = list(dedup.filter(["b", "c"]))
+    print(f"Bloom mode, two batches: {first} then {second}, stats {dedup.stats}")
+
+    print()
+    benchmark_dedup()
@@ -182,7 +182,7 @@ print(f"Alice: {lookup_phone('Alice')}")
 print(f"David: {lookup_phone('David')}")
 
 
-# Reverse lookup (value to key)
+# Reverse lookup (value to key) - scans every entry; chapter2_phone_book.py keeps a reverse dict instead
 def reverse_lookup_phone(number: str) -> str:
     """Find name by phone number."""
     for name, phone in phone_book.items():
@@ -0,0 +1,360 @@
+# Chapter 2.2 Extension: Group-By Engine
+# items_by_category for inputs larger than memory: pluggable aggregations, spill to disk
+
+"""
+C# Equivalent Idea:
+var groups = records.GroupBy(r => r.Category)
+                    .Select(g => (g.Key, g.Sum(r => r.Price)));   // LINQ GroupBy + aggregate
+// ...but when the table outgrows its budget, hash-partition it to temp files and merge later
+"""
+
+import csv
+import json
+import operator
+import os
+import pickle
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+_MISSING = object()
+
+
+def _append(state: List[Any], value: Any) -> List[Any]:
+    state.append(value)
+    return state
+
+
+def _extend(state: List[Any], other: List[Any]) -> List[Any]:
+    state.extend(other)
+    return state
+
+
+@dataclass(frozen=True)
+class Aggregation:
+    """
+    How to fold the values of one group.
+
+    ``create`` makes a state from a group's first value, ``add`` folds in
+    another value, ``merge`` combines two states of the same group (after a
+    spill) and ``finish`` turns the state into the result. States must be
+    picklable. ``grows`` marks aggregations whose state grows with every
+    value, so each value counts against the memory budget.
+    """
+
+    name: str
+    create: Callable[[Any], Any]
+    add: Callable[[Any, Any], Any]
+    merge: Callable[[Any, Any], Any]
+    finish: Callable[[Any], Any] = lambda state: state
+    grows: bool = False
+
+
+AGGREGATIONS: Dict[str, Aggregation] = {
+    aggregation.name: aggregation
+    for aggregation in [
+        Aggregation("list", lambda value: [value], _append, _extend, grows=True),
+        Aggregation("count", lambda value: 1, lambda state, value: state + 1, operator.add),
+        Aggregation("sum", lambda value: value, operator.add, operator.add),
+        Aggregation("min", lambda value: value, min, min),
+        Aggregation("max", lambda value: value, max, max),
+        Aggregation(
+            "mean",
+            lambda value: (value, 1),
+            lambda state, value: (state[0] + value, state[1] + 1),
+            lambda a, b: (a[0] + b[0], a[1] + b[1]),
+            lambda state: state[0] / state[1],
+        ),
+    ]
+}
+
+Field = Union[Callable[[Any], Any], int, str]
+
+
+def _getter(field: Optional[Field]) -> Optional[Callable[[Any], Any]]:
+    """A callable as is; an index or dict key becomes an itemgetter."""
+    if field is None or callable(field):
+        return field
+    return operator.itemgetter(field)
+
+
+class GroupBy:
+    """
+    Hash group-by with a memory budget.
+
+    Records are folded into an in-memory table of key -> state. When the
+    table holds more than ``memory_limit`` units (one per group, plus one
+    per value for growing aggregations like "list"), it is hash-partitioned
+    into temporary files and cleared. ``results`` then merges each
+    partition on its own, so only about 1/``partitions`` of the data is in
+    memory at once.
+
+    A partition is merged in memory without a budget check, so one
+    partition's groups (and, for "list", their values) must fit: raise
+    ``partitions`` when the data is much larger than ``memory_limit`` times
+    ``partitions``. Spill files are deleted when ``results`` is exhausted or
+    on ``close``; a half-read ``results`` generator keeps them until it is
+    garbage-collected, so prefer ``with GroupBy(...) as engine:``.
+    """
+
+    def __init__(
+        self,
+        key: Field,
+        value: Optional[Field] = None,
+        aggregation: Union[str, Aggregation] = "list",
+        memory_limit: int = 1_000_000,
+        partitions: int = 16,
+        temp_dir: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            key: Callable, index or field name giving a record's group key
+            value: Callable, index or field name giving the aggregated value
+                (default: the whole record)
+            aggregation: "list", "count", "sum", "min", "max", "mean" or an Aggregation
+            memory_limit: Budget in groups/values before spilling to disk
+            partitions: Number of spill files
+            temp_dir: Where spill files go (default: the system temp directory)
+        """
+        if memory_limit <= 0 or partitions <= 1:
+            raise ValueError("memory_limit must be positive and partitions at least 2")
+        self.key = _getter(key)
+        self.value = _getter(value)
+        self.aggregation = AGGREGATIONS[aggregation] if isinstance(aggregation, str) else aggregation
+        self.memory_limit = memory_limit
+        self.partitions = partitions
+        self.temp_dir = temp_dir
+        self.spills = 0
+        self._table: Dict[Any, Any] = {}
+        self._held = 0
+        self._folder: Optional[tempfile.TemporaryDirectory] = None
+        self._files: List[BinaryIO] = []
+
+    def add(self, record: Any) -> None:
+        self.extend((record,))
+
+    def extend(self, records: Iterable[Any]) -> None:
+        """Fold records into the table, spilling whenever the budget is exceeded."""
+        key, value = self.key, self.value
+        create, add, grows = self.aggregation.create, self.aggregation.add, self.aggregation.grows
+        table, held, limit = self._table, self._held, self.memory_limit
+        for record in records:
+            k = key(record)
+            v = record if value is None else value(record)
+            state = table.get(k, _MISSING)
+            if state is _MISSING:
+                table[k] = create(v)
+                held += 1
+            else:
+                table[k] = add(state, v)
+                held += grows
+            if held > limit:
+                self._spill()
+                held = 0
+        self._held = held
+
+    def _spill(self) -> None:
+        """Append the table to the partition files as pickled (key, state) batches."""
+        if self._folder is None:
+            self._folder = tempfile.TemporaryDirectory(prefix="group_by_", dir=self.temp_dir)
+            self._files = [
+                open(os.path.join(self._folder.name, f"partition_{i}.pkl"), "w+b")
+                for i in range(self.partitions)
+            ]
+        batches: List[List[Tuple[Any, Any]]] = [[] for _ in range(self.partitions)]
+        for item in self._table.items():
+            batches[hash(item[0]) % self.partitions].append(item)
+        for file, batch in zip(self._files, batches):
+            if batch:
+                pickle.dump(batch, file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._table.clear()
+        self._held = 0
+        self.spills += 1
+
+    def _merge_partition(self, file: BinaryIO) -> Dict[Any, Any]:
+        merge = self.aggregation.merge
+        table: Dict[Any, Any] = {}
+        file.seek(0)
+        while True:
+            try:
+                batch = pickle.load(file)
+            except EOFError:
+                return table
+            for k, state in batch:
+                current = table.get(k, _MISSING)
+                table[k] = state if current is _MISSING else merge(current, state)
+
+    def results(self) -> Iterator[Tuple[Any, Any]]:
+        """
+        Yield (key, result) for every group, then reset the engine.
+
+        Without spills groups come out in first-seen order; after a spill
+        they come out partition by partition.
+        """
+        finish = self.aggregation.finish
+        try:
+            if self._folder is None:
+                for k, state in self._table.items():
+                    yield k, finish(state)
+                return
+            if self._table:
+                self._spill()
+            for file in self._files:
+                for k, state in self._merge_partition(file).items():
+                    yield k, finish(state)
+                file.truncate(0)  # Free disk space as we go
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Drop the table and delete spill files."""
+        self._table = {}
+        self._held = 0
+        for file in self._files:
+            file.close()
+        self._files = []
+        if self._folder is not None:
+            self._folder.cleanup()
+            self._folder = None
+
+    def __enter__(self) -> "GroupBy":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+_NUMERIC_AGGREGATIONS = {"sum", "min", "max", "mean"}
+
+
+def _convert(row: Dict[str, Any], types: Dict[str, Callable[[str], Any]]) -> Dict[str, Any]:
+    for name, convert in types.items():
+        row[name] = convert(row[name])
+    return row
+
+
+def read_records(path: str, types: Optional[Dict[str, Callable[[str], Any]]] = None) -> Iterator[Any]:
+    """
+    Stream records from a .csv (dicts per row) or .jsonl/.ndjson file.
+
+    CSV values are all strings; ``types`` maps column names to converters,
+    e.g. {"amount": float}. JSON lines keep their own types.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8", newline="") as file:
+        if extension == ".csv":
+            rows = csv.DictReader(file)
+            yield from (_convert(row, types) for row in rows) if types else rows
+        elif extension in (".jsonl", ".ndjson"):
+            yield from (json.loads(line) for line in file if line.strip())
+        else:
+            raise ValueError(f"Unsupported file type: {extension}")
+
+
+def group_by(
+    records: Union[str, Iterable[Any]],
+    key: Field,
+    value: Optional[Field] = None,
+    aggregation: Union[str, Aggregation] = "list",
+    types: Optional[Dict[str, Callable[[str], Any]]] = None,
+    **options: Any,
+) -> Iterator[Tuple[Any, Any]]:
+    """
+    Group an iterable (or a .csv/.jsonl file path) and stream (key, result) pairs.
+
+    For a .csv path, ``types`` converts columns as in read_records. Summing
+    or comparing a CSV column by name without a converter is refused, since
+    its values would be strings ("9" > "10"). ``options`` go to GroupBy
+    (memory_limit, partitions, temp_dir).
+    """
+    engine = GroupBy(key, value, aggregation, **options)
+    if isinstance(records, str):
+        if (
+            records.lower().endswith(".csv")
+            and isinstance(value, str)
+            and engine.aggregation.name in _NUMERIC_AGGREGATIONS
+            and value not in (types or {})
+        ):
+            raise ValueError(
+                f"CSV values are strings: pass types={{{value!r}: float}} "
+                f"to {engine.aggregation.name} column {value!r}"
+            )
+        records = read_records(records, types)
+    engine.extend(records)
+    return engine.results()
+
+
+def benchmark_group_by(count: int = 1_000_000, categories: int = 100_000) -> None:
+    """Compare defaultdict(list) with GroupBy in memory and with spilling, including peak memory."""
+    rng = random.Random(3)
+    pairs = [(f"item {i}", f"category {rng.randrange(categories)}") for i in range(count)]
+    expected = len({category for _, category in pairs})
+
+    def with_defaultdict() -> int:
+        items_by_category: defaultdict = defaultdict(list)
+        for item, category in pairs:
+            items_by_category[category].append(item)
+        return sum(1 for _ in items_by_category.items())
+
+    def with_engine(aggregation: str, memory_limit: int) -> Callable[[], int]:
+        def run() -> int:
+            groups = group_by(pairs, key=1, value=0, aggregation=aggregation, memory_limit=memory_limit)
+            return sum(1 for _ in groups)
+        return run
+
+    print(f"Grouping {count:,} (item, category) pairs into {categories:,} categories:")
+    for label, function in [
+        ("defaultdict(list)", with_defaultdict),
+        ("GroupBy list, in memory", with_engine("list", count * 2)),
+        ("GroupBy list, spilling", with_engine("list", count // 10)),
+        ("GroupBy count, in memory", with_engine("count", count)),
+        ("GroupBy count, spilling", with_engine("count", categories // 10)),
+    ]:
+        start = time.perf_counter()
+        assert function() == expected
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()  # Separate run: tracing slows everything down
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {label:26} {elapsed:6.2f}s, peak {peak / 1e6:6.1f} MB")
+
+
+if __name__ == "__main__":
+    print("\n=== Group-By Engine Demo ===\n")
+    # Same pairs as items_by_category in chapter2_dictionaries.py
+    items = [
+        ("apple", "fruit"),
+        ("carrot", "vegetable"),
+        ("banana", "fruit"),
+        ("spinach", "vegetable"),
+        ("orange", "fruit"),
+    ]
+    print(f"Items by category: {dict(group_by(items, key=1, value=0))}")
+    print(f"Count by category: {dict(group_by(items, key=1, aggregation='count'))}")
+
+    sales = [{"region": r, "amount": a} for r, a in [("north", 10), ("south", 4), ("north", 6), ("east", 8)]]
+    with GroupBy(key="region", value="amount", aggregation="mean", memory_limit=2, partitions=2) as engine:
+        engine.extend(sales)
+        print(f"Mean sale by region (spilled {engine.spills} times): {sorted(engine.results())}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sales.jsonl")
+        with open(path, "w", encoding="utf-8") as file:
+            file.writelines(json.dumps(sale) + "\n" for sale in sales)
+        print(f"Largest sale by region from {os.path.basename(path)}: {dict(group_by(path, 'region', 'amount', 'max'))}")
+
+        path = os.path.join(folder, "sales.csv")
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=["region", "amount"])
+            writer.writeheader()
+            writer.writerows(sales)
+        totals = dict(group_by(path, "region", "amount", "sum", types={"amount": float}))
+        print(f"Total sales by region from {os.path.basename(path)}: {totals}")
+
+    print()
+    benchmark_group_by()
@@ -0,0 +1,288 @@
+# Chapter 2.2 Extension: Hash Join
+# Merging keyed record sets like personal_info into employees: inner, left and outer joins
+
+"""
+C# Equivalent Idea:
+var lookup = smaller.ToLookup(r => r.Id);                  // build a hash table on the smaller side
+foreach (var row in larger)                                // stream the larger side
+    foreach (var match in lookup[row.Id]) yield return Merge(row, match);
+"""
+
+import random
+import time
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+Record = Dict[str, Any]
+Records = Union[Mapping, Iterable[Tuple[Hashable, Record]], Iterable[Record]]
+Conflict = Union[str, Callable[[str, Any, Any], Any]]
+
+JOIN_TYPES = ("inner", "left", "right", "outer")
+CONFLICT_RULES = ("right", "left", "error", "deep")
+
+
+class _Matches(list):
+    """Several build-side records with the same key (plain records are stored unwrapped)."""
+
+
+def _pairs(records: Records, on: Optional[str]) -> Iterable[Tuple[Hashable, Record]]:
+    """(key, record) pairs from a dict of records, pairs, or records with an ``on`` field."""
+    if isinstance(records, Mapping):
+        return records.items()
+    if on is not None:
+        return ((record[on], record) for record in records)
+    return records
+
+
+def _deep_merge(left: Record, right: Record) -> Record:
+    merged = dict(left)
+    for field, value in right.items():
+        current = merged.get(field)
+        if isinstance(current, dict) and isinstance(value, dict):
+            merged[field] = _deep_merge(current, value)
+        else:
+            merged[field] = value
+    return merged
+
+
+def make_merger(conflict: Conflict = "right") -> Callable[[Hashable, Record, Record], Record]:
+    """
+    Merge function for two matching records; left fields come first.
+
+    Args:
+        conflict: What to do when both records have a field:
+            "right" (right value wins, like dict.update), "left" (left wins),
+            "error" (raise if the values differ), "deep" (merge nested dicts,
+            right wins at the leaves), or a callable (field, left_value,
+            right_value) -> value
+    """
+    if callable(conflict):
+        def resolve(key: Hashable, left: Record, right: Record) -> Record:
+            merged = left | right
+            for field in left.keys() & right.keys():
+                merged[field] = conflict(field, left[field], right[field])
+            return merged
+        return resolve
+    if conflict == "right":
+        return lambda key, left, right: left | right
+    if conflict == "left":
+        def left_wins(key: Hashable, left: Record, right: Record) -> Record:
+            merged = left | right
+            merged.update(left)
+            return merged
+        return left_wins
+    if conflict == "error":
+        def strict(key: Hashable, left: Record, right: Record) -> Record:
+            for field in left.keys() & right.keys():
+                if left[field] != right[field]:
+                    raise ValueError(f"Conflicting values for {field!r} on key {key!r}")
+            return left | right
+        return strict
+    if conflict == "deep":
+        return lambda key, left, right: _deep_merge(left, right)
+    raise ValueError(f"Conflict rule must be a callable or one of {CONFLICT_RULES}")
+
+
+def _build(records: Records, pairs: Iterable[Tuple[Hashable, Record]]) -> Mapping:
+    if isinstance(records, Mapping):
+        return records  # Keys are already unique and hashed: use it as the table
+    table: Dict[Hashable, Any] = {}
+    for key, record in pairs:
+        current = table.get(key)
+        if current is None:
+            table[key] = record
+        elif isinstance(current, _Matches):
+            current.append(record)
+        else:
+            table[key] = _Matches([current, record])
+    return table
+
+
+def _probe(
+    table: Mapping,
+    probe: Iterable[Tuple[Hashable, Record]],
+    build_is_left: bool,
+    keep_probe: bool,
+    keep_build: bool,
+    merge: Callable[[Hashable, Record, Record], Record],
+) -> Iterator[Tuple[Hashable, Record]]:
+    """Stream the probe side through the build table."""
+    matched = set() if keep_build else None
+    for key, record in probe:
+        found = table.get(key)
+        if found is None:
+            if keep_probe:
+                yield key, record
+            continue
+        if matched is not None:
+            matched.add(key)
+        for other in found if isinstance(found, _Matches) else (found,):
+            yield key, merge(key, other, record) if build_is_left else merge(key, record, other)
+    if matched is not None:
+        for key, found in table.items():
+            if key not in matched:
+                for other in found if isinstance(found, _Matches) else (found,):
+                    yield key, other
+
+
+def _join_partition(
+    left: List[Tuple[Hashable, Record]],
+    right: List[Tuple[Hashable, Record]],
+    how: str,
+    conflict: Conflict,
+) -> List[Tuple[Hashable, Record]]:
+    """Worker task: join one hash partition (both sides are small lists here)."""
+    return list(hash_join(left, right, how, conflict=conflict))
+
+
+def _partitioned(
+    left: Iterable[Tuple[Hashable, Record]],
+    right: Iterable[Tuple[Hashable, Record]],
+    how: str,
+    conflict: Conflict,
+    workers: int,
+    partitions: int,
+) -> Iterator[Tuple[Hashable, Record]]:
+    """
+    Hash-partition both sides by key and join the partitions in a process pool.
+
+    Pickling dominates: this only wins when the merge itself is expensive.
+    """
+    sides: List[List[List[Tuple[Hashable, Record]]]] = []
+    for pairs in (left, right):
+        parts: List[List[Tuple[Hashable, Record]]] = [[] for _ in range(partitions)]
+        for pair in pairs:
+            parts[hash(pair[0]) % partitions].append(pair)
+        sides.append(parts)
+
+    # Keep a bounded number of partitions in flight, like the other process pools
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        for left_part, right_part in zip(*sides):
+            pending.append(pool.submit(_join_partition, left_part, right_part, how, conflict))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def hash_join(
+    left: Records,
+    right: Records,
+    how: str = "inner",
+    on: Optional[str] = None,
+    conflict: Conflict = "right",
+    build: str = "auto",
+    workers: int = 0,
+    partitions: Optional[int] = None,
+) -> Iterator[Tuple[Hashable, Record]]:
+    """
+    Join two keyed record collections, yielding (key, record) lazily.
+
+    Matching records are merged into a new dict (left fields first);
+    unmatched records kept by a left/right/outer join are yielded as is.
+    Keys may repeat on either side (every matching pair is produced).
+    Building new records leaves both inputs untouched, but costs more than
+    the chapter's loop that updates ``employees`` in place.
+
+    Args:
+        left, right: Dicts of key -> record (like ``employees``), iterables of
+            (key, record) pairs, or iterables of records when ``on`` is given
+        how: "inner", "left", "right" or "outer"
+        on: Field holding the key when records are given without keys
+        conflict: Rule for fields present on both sides (see make_merger)
+        build: Side held in memory: "left", "right", or "auto" (the smaller
+            side when both have a length, otherwise right); the other side
+            is streamed
+        workers: Process pool size for a partitioned join (0 joins in this
+            process). Both sides are partitioned serially in this process
+            and every record is pickled to a worker and back, which costs
+            far more than a plain dict merge (over 10x slower on the
+            benchmark). Only use workers when merging is expensive, e.g. a
+            slow conflict callable; it must be picklable.
+        partitions: Number of hash partitions (default: 4 per worker)
+    """
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Join type must be one of {JOIN_TYPES}")
+    merge = make_merger(conflict)
+    left_pairs, right_pairs = _pairs(left, on), _pairs(right, on)
+
+    if workers > 0:
+        return _partitioned(left_pairs, right_pairs, how, conflict, workers, partitions or workers * 4)
+
+    if build == "auto":
+        sizes = [len(side) if hasattr(side, "__len__") else None for side in (left, right)]
+        build = "left" if None not in sizes and sizes[0] < sizes[1] else "right"
+    keep_left, keep_right = how in ("left", "outer"), how in ("right", "outer")
+    if build == "left":
+        return _probe(_build(left, left_pairs), right_pairs, True, keep_right, keep_left, merge)
+    if build == "right":
+        return _probe(_build(right, right_pairs), left_pairs, False, keep_left, keep_right, merge)
+    raise ValueError('build must be "auto", "left" or "right"')
+
+
+def benchmark_hash_join(size: int = 1_000_000, workers: int = 0) -> None:
+    """Compare the chapter's update loop with hash_join on large record sets."""
+    rng = random.Random(8)
+    departments = ["Engineering", "Marketing", "Sales", "Support"]
+
+    def make_employees() -> Dict[str, Record]:
+        return {
+            f"emp{i:07d}": {"name": f"Person {i}", "department": rng.choice(departments), "salary": 50_000 + i % 50_000}
+            for i in range(size)
+        }
+
+    # Half the employees have personal info, plus some ids not in employees
+    personal_info = {
+        f"emp{i:07d}": {"age": 20 + i % 45, "city": rng.choice(["Seattle", "Austin", "Boston"])}
+        for i in range(0, size + size // 10, 2)
+    }
+
+    employees = make_employees()
+    start = time.perf_counter()
+    for emp_id in personal_info:  # The chapter's loop: in place, right side wins
+        if emp_id in employees:
+            employees[emp_id].update(personal_info[emp_id])
+    loop = time.perf_counter() - start
+
+    employees = make_employees()
+    print(f"Joining {size:,} employees with {len(personal_info):,} personal records:")
+    print(f"  update loop (in place):   {loop:6.2f}s")
+    for how in JOIN_TYPES:
+        start = time.perf_counter()
+        rows = sum(1 for _ in hash_join(employees, personal_info, how))
+        print(f"  hash_join {how:6}:         {time.perf_counter() - start:6.2f}s, {rows:,} rows")
+    if workers:
+        start = time.perf_counter()
+        rows = sum(1 for _ in hash_join(employees, personal_info, "outer", workers=workers))
+        print(f"  hash_join outer, {workers} workers: {time.perf_counter() - start:6.2f}s, {rows:,} rows")
+
+
+if __name__ == "__main__":
+    print("\n=== Hash Join Demo ===\n")
+    employees = {
+        "emp001": {"name": "Alice Johnson", "department": "Engineering", "address": {"street": "1 Main St", "city": "Portland"}},
+        "emp002": {"name": "Bob Smith", "department": "Marketing"},
+    }
+    personal_info = {
+        "emp001": {"age": 28, "address": {"city": "Seattle", "zip": "98101"}},
+        "emp009": {"age": 41},
+    }
+    for how in JOIN_TYPES:
+        print(f"{how:5}: {dict(hash_join(employees, personal_info, how))}")
+    print(f"deep:  {dict(hash_join(employees, personal_info, conflict='deep'))}")
+
+    try:
+        list(hash_join(employees, personal_info, conflict="error"))
+    except ValueError as error:
+        print(f"Error: {error}")
+
+    # Records without keys, several orders per customer
+    orders = [{"customer": "c1", "total": 30}, {"customer": "c2", "total": 12}, {"customer": "c1", "total": 5}]
+    customers = [{"customer": "c1", "name": "Ada"}, {"customer": "c3", "name": "Lin"}]
+    print(f"orders with customers: {[record for _, record in hash_join(orders, customers, 'left', on='customer')]}")
+
+    print()
+    benchmark_hash_join()
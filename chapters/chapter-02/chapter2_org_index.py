@@ -0,0 +1,251 @@
+# Chapter 2.4 Extension: Org Chart Index
+# Subtree headcount, salary totals and "is X under Y" without walking the tree
+
+"""
+C# Equivalent Idea:
+int[] enter, exit;            // Euler tour: a subtree is the range [enter[m], exit[m])
+FenwickTree salaries;         // range sums over that layout in O(log n)
+bool IsUnder(x, y) => enter[y] <= enter[x] && enter[x] < exit[y];
+"""
+
+import os
+import random
+import time
+from array import array
+from contextlib import redirect_stdout
+from typing import Dict, Iterable, List, Union
+
+from chapter2_classes import Employee, Manager
+
+
+class FenwickTree:
+    """Prefix sums over a float array with O(log n) point updates."""
+
+    def __init__(self, values: Iterable[float]) -> None:
+        tree = array("d", [0.0])
+        tree.extend(values)
+        size = len(tree) - 1
+        for i in range(1, size + 1):  # O(n) build: push each node into its parent
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self.size = size
+
+    def add(self, index: int, delta: float) -> None:
+        """Add ``delta`` to the value at ``index`` (0-based)."""
+        tree, size = self._tree, self.size
+        i = index + 1
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, end: int) -> float:
+        """Sum of values at indexes [0, end)."""
+        tree = self._tree
+        total = 0.0
+        i = end
+        while i > 0:
+            total += tree[i]
+            i &= i - 1
+        return total
+
+    def range_sum(self, start: int, end: int) -> float:
+        """Sum of values at indexes [start, end)."""
+        return self.prefix_sum(end) - self.prefix_sum(start)
+
+
+class OrgIndex:
+    """
+    Euler-tour index over one or more Manager/Employee trees.
+
+    Every person gets a position in depth-first order, and everyone under a
+    manager sits in the contiguous range ``[enter, exit)`` that follows the
+    manager's own position. Headcount and "is X under Y" are then O(1), and
+    salary totals are O(log n) range sums.
+
+    Salaries are copied into the index when it is built. Raises made with
+    ``OrgIndex.give_raise`` are applied to it as they happen, but calling
+    ``Employee.give_raise`` or setting ``salary`` directly leaves
+    ``total_salary`` stale until ``refresh_salary(person)`` (or
+    ``reload_salaries`` after a bulk change). Changes to ``reports`` need
+    ``rebuild``.
+    """
+
+    def __init__(self, roots: Union[Employee, Iterable[Employee]]) -> None:
+        self.roots: List[Employee] = [roots] if isinstance(roots, Employee) else list(roots)
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Lay out the trees again after reports were added or removed."""
+        people: List[Employee] = []
+        position: Dict[Employee, int] = {}
+        exits = array("q")
+
+        for root in self.roots:
+            # Explicit stack: (person, index into their reports); deep chains are fine
+            stack = [(root, 0)]
+            position[root] = len(people)
+            people.append(root)
+            exits.append(0)
+            while stack:
+                person, next_report = stack[-1]
+                reports = getattr(person, "reports", ())
+                if next_report == len(reports):
+                    stack.pop()
+                    exits[position[person]] = len(people)
+                    continue
+                stack[-1] = (person, next_report + 1)
+                report = reports[next_report]
+                if report in position:
+                    raise ValueError(f"{report.name} appears twice in the org chart")
+                position[report] = len(people)
+                people.append(report)
+                exits.append(0)
+                stack.append((report, 0))
+
+        self.people = people
+        self._position = position
+        self._exit = exits
+        self.reload_salaries()
+
+    def span(self, manager: Employee) -> range:
+        """Positions in ``people`` of the manager and everyone under them."""
+        start = self._position[manager]
+        return range(start, self._exit[start])
+
+    def headcount(self, manager: Employee) -> int:
+        """Number of people in the subtree, including the manager."""
+        return len(self.span(manager))
+
+    def total_salary(self, manager: Employee) -> float:
+        """Sum of salaries in the subtree, including the manager."""
+        span = self.span(manager)
+        return self._salary_tree.range_sum(span.start, span.stop)
+
+    def is_under(self, person: Employee, manager: Employee) -> bool:
+        """True if ``person`` reports to ``manager`` directly or indirectly."""
+        span = self.span(manager)
+        return person is not manager and self._position[person] in span
+
+    def subtree(self, manager: Employee) -> List[Employee]:
+        """Everyone in the subtree, manager first, in depth-first order."""
+        span = self.span(manager)
+        return self.people[span.start:span.stop]
+
+    def give_raise(self, person: Employee, amount: float) -> None:
+        """``person.give_raise(amount)``, applied to the totals in O(log n)."""
+        person.give_raise(amount)
+        self.refresh_salary(person)
+
+    def refresh_salary(self, person: Employee) -> None:
+        """Apply a changed ``person.salary`` to the totals in O(log n)."""
+        index = self._position.get(person)
+        if index is None:
+            return  # Not part of this org chart
+        delta = person.salary - self._salaries[index]
+        if delta:
+            self._salaries[index] = person.salary
+            self._salary_tree.add(index, delta)
+
+    def reload_salaries(self) -> None:
+        """Re-read every salary in O(n), e.g. after a bulk payroll change."""
+        self._salaries = array("d", (person.salary for person in self.people))
+        self._salary_tree = FenwickTree(self._salaries)
+
+
+def build_org_chart(size: int, span: int = 8, seed: int = 5) -> Manager:
+    """Build a random org chart of ``size`` people where managers have up to ``span`` reports."""
+    rng = random.Random(seed)
+    ceo = Manager("CEO", 58, "M0", 400_000.0, 0)
+    managers = [ceo]
+    for number in range(1, size):
+        boss = managers[rng.randrange(len(managers))]
+        if number % span:
+            person = Employee(f"Employee {number}", 30, f"E{number}", rng.uniform(40_000, 120_000))
+        else:
+            person = Manager(f"Manager {number}", 45, f"M{number}", rng.uniform(90_000, 200_000), 0)
+            managers.append(person)
+        boss.reports.append(person)
+        boss.team_size += 1
+    return ceo
+
+
+def _walk_total(manager: Employee) -> float:
+    """Baseline: walk the subtree and add up salaries."""
+    total, stack = 0.0, [manager]
+    while stack:
+        person = stack.pop()
+        total += person.salary
+        stack.extend(getattr(person, "reports", ()))
+    return total
+
+
+def benchmark_org_index(size: int = 500_000, queries: int = 1_000) -> None:
+    """Compare subtree walks with the index on a large org chart."""
+    ceo = build_org_chart(size)
+
+    start = time.perf_counter()
+    index = OrgIndex(ceo)
+    build = time.perf_counter() - start
+
+    rng = random.Random(9)
+    managers = [person for person in index.people if isinstance(person, Manager)]
+    sample = [rng.choice(managers) for _ in range(queries)]
+    walk_sample = sample[: max(1, queries // 100)]
+
+    start = time.perf_counter()
+    expected = [_walk_total(manager) for manager in walk_sample]
+    walk = (time.perf_counter() - start) / len(walk_sample)
+
+    start = time.perf_counter()
+    totals = [index.total_salary(manager) for manager in sample]
+    query = (time.perf_counter() - start) / len(sample)
+    assert all(abs(a - b) < 1e-3 * max(1.0, b) for a, b in zip(totals, expected))
+
+    start = time.perf_counter()
+    company = _walk_total(ceo)
+    company_walk = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed_company = index.total_salary(ceo)
+    company_query = time.perf_counter() - start
+    assert abs(indexed_company - company) < 1e-6 * company
+
+    people = [rng.choice(index.people) for _ in range(queries)]
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):  # give_raise prints
+        start = time.perf_counter()
+        for person in people:
+            index.give_raise(person, 100.0)
+        update = (time.perf_counter() - start) / queries
+    assert abs(index.total_salary(ceo) - _walk_total(ceo)) < 1e-6 * company
+
+    print(f"Org chart of {size:,} people ({len(managers):,} managers):")
+    print(f"  build index:             {build:.2f}s")
+    print(f"  subtree salary (walk):   {walk * 1e6:10,.1f} µs")
+    print(f"  subtree salary (index):  {query * 1e6:10,.1f} µs")
+    print(f"  whole company (walk):    {company_walk * 1e6:10,.1f} µs")
+    print(f"  whole company (index):   {company_query * 1e6:10,.1f} µs")
+    print(f"  give_raise (index):      {update * 1e6:10,.1f} µs")
+
+
+if __name__ == "__main__":
+    print("\n=== Org Chart Index Demo ===\n")
+    ceo = Manager("Grace", 55, "M1", 250_000.0, 2)
+    cto = Manager("Alan", 48, "M2", 180_000.0, 2)
+    dev1 = Employee("Ada", 36, "E1", 120_000.0)
+    dev2 = Employee("Linus", 29, "E2", 105_000.0)
+    sales = Employee("Dale", 41, "E3", 90_000.0)
+    ceo.reports.extend([cto, sales])
+    cto.reports.extend([dev1, dev2])
+
+    index = OrgIndex(ceo)
+    print(f"Headcount under {cto.name}: {index.headcount(cto)}")
+    print(f"Salary under {cto.name}: ${index.total_salary(cto):,.2f}")
+    print(f"Is {dev1.name} under {ceo.name}? {index.is_under(dev1, ceo)}")
+    print(f"Is {sales.name} under {cto.name}? {index.is_under(sales, cto)}")
+
+    index.give_raise(dev2, 10_000)
+    print(f"Salary under {cto.name} after raise: ${index.total_salary(cto):,.2f}")
+
+    print()
+    benchmark_org_index()
@@ -0,0 +1,259 @@
+# Chapter 2.4 Extension: Batch Payroll
+# Company-wide raises over a salary column instead of one give_raise call at a time
+
+"""
+C# Equivalent Idea:
+Span<double> salaries = payroll.Salaries;
+foreach (int i in selection) salaries[i] *= 1 + percent / 100;   // no per-object calls, no Console.WriteLine
+return new PayrollAudit(count, totalBefore, totalAfter);
+"""
+
+import random
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from chapter2_classes import Employee
+from chapter2_org_index import OrgIndex, build_org_chart
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python fallbacks are used instead
+    np = None
+
+
+@dataclass(frozen=True)
+class PayrollAudit:
+    """What one batch operation changed."""
+
+    applied_at: datetime
+    description: str
+    affected: int
+    total_before: float
+    total_after: float
+
+    @property
+    def total_increase(self) -> float:
+        return self.total_after - self.total_before
+
+
+class Payroll:
+    """
+    Salaries of many employees held in one ``array('d')`` column.
+
+    Raises work on the column only; ``write_back`` copies the new salaries
+    to the Employee objects when they are needed again.
+    """
+
+    def __init__(
+        self,
+        employees: Iterable[Employee],
+        departments: Optional[Sequence[str]] = None,
+        org: Optional[OrgIndex] = None,
+    ) -> None:
+        """
+        Args:
+            employees: People on the payroll, in column order
+            departments: Department per employee (default: their ``department``
+                attribute, or "Unassigned")
+            org: Org index whose ``people`` order matches ``employees``; enables
+                the ``under=`` filter
+        """
+        self.employees: List[Employee] = list(employees)
+        if departments is None:
+            departments = [getattr(e, "department", "Unassigned") for e in self.employees]
+        if len(departments) != len(self.employees):
+            raise ValueError("One department is needed per employee")
+        if org is not None and org.people != self.employees:
+            raise ValueError("Employees must be in the org index's order")
+
+        self.org = org
+        self.department_names: List[str] = []
+        code_by_name: Dict[str, int] = {}
+        self.department_codes = array("I")
+        for name in departments:
+            code = code_by_name.setdefault(name, len(code_by_name))
+            if code == len(self.department_names):
+                self.department_names.append(name)
+            self.department_codes.append(code)
+
+        self.salaries = array("d", (e.salary for e in self.employees))
+        self.audit_log: List[PayrollAudit] = []
+
+    @classmethod
+    def from_org(cls, org: OrgIndex, departments: Optional[Sequence[str]] = None) -> "Payroll":
+        """Payroll over everyone in an org index, with subtree filters available."""
+        return cls(org.people, departments, org)
+
+    def __len__(self) -> int:
+        return len(self.salaries)
+
+    def _select(
+        self,
+        department: Optional[str],
+        under: Optional[Employee],
+        min_salary: Optional[float],
+        max_salary: Optional[float],
+    ) -> Sequence[int]:
+        """Column positions matching every given filter."""
+        span = range(len(self))
+        if under is not None:
+            if self.org is None:
+                raise ValueError("Filtering by manager needs a Payroll built from an OrgIndex")
+            span = self.org.span(under)
+        code = None
+        if department is not None:
+            if department not in self.department_names:
+                return range(0)
+            code = self.department_names.index(department)
+        if code is None and min_salary is None and max_salary is None:
+            return span
+
+        low = -float("inf") if min_salary is None else min_salary
+        high = float("inf") if max_salary is None else max_salary
+        if np is not None:
+            salaries = np.frombuffer(self.salaries, dtype=np.float64)[span.start:span.stop]
+            mask = (salaries >= low) & (salaries < high)
+            if code is not None:
+                codes = np.frombuffer(self.department_codes, dtype=np.uint32)[span.start:span.stop]
+                mask &= codes == code
+            return np.flatnonzero(mask) + span.start
+
+        salaries, codes = self.salaries, self.department_codes
+        return [
+            i for i in span
+            if low <= salaries[i] < high and (code is None or codes[i] == code)
+        ]
+
+    def apply_raise(
+        self,
+        percent: float = 0.0,
+        amount: float = 0.0,
+        department: Optional[str] = None,
+        under: Optional[Employee] = None,
+        min_salary: Optional[float] = None,
+        max_salary: Optional[float] = None,
+    ) -> PayrollAudit:
+        """
+        Raise salaries by ``percent`` and/or a flat ``amount``.
+
+        Filters combine: ``department`` name, everyone ``under`` a manager
+        (manager included), and the salary band ``min_salary <= salary <
+        max_salary`` measured before the raise.
+        """
+        if percent == 0 and amount == 0:
+            raise ValueError("Give a percent or an amount")
+        factor = 1 + percent / 100
+        selection = self._select(department, under, min_salary, max_salary)
+
+        if np is not None:
+            salaries = np.frombuffer(self.salaries, dtype=np.float64)
+            if isinstance(selection, range):
+                chosen = salaries[selection.start:selection.stop]
+                before = float(chosen.sum())
+                chosen *= factor
+                chosen += amount
+                after = float(chosen.sum())
+            else:
+                chosen = salaries[selection]
+                before = float(chosen.sum())
+                chosen = chosen * factor + amount
+                salaries[selection] = chosen
+                after = float(chosen.sum())
+        else:
+            salaries = self.salaries
+            before = after = 0.0
+            for i in selection:
+                before += salaries[i]
+                salaries[i] = salaries[i] * factor + amount
+                after += salaries[i]
+
+        filters = {
+            "department": department,
+            "under": under.name if under is not None else None,
+            "min_salary": min_salary,
+            "max_salary": max_salary,
+        }
+        parts = [f"{percent:+g}%" if percent else "", f"{amount:+,.2f}" if amount else ""]
+        parts += [f"{key}={value}" for key, value in filters.items() if value is not None]
+        description = " ".join(part for part in parts if part)
+        audit = PayrollAudit(datetime.now(), description, len(selection), before, after)
+        self.audit_log.append(audit)
+        return audit
+
+    def total(self) -> float:
+        """Total of all salaries in the column."""
+        return sum(self.salaries) if np is None else float(np.frombuffer(self.salaries).sum())
+
+    def write_back(self) -> int:
+        """
+        Copy column salaries to the Employee objects (no give_raise messages).
+
+        An attached org index re-reads its salary totals once afterwards.
+
+        Returns:
+            Number of employees whose salary changed
+        """
+        changed = 0
+        for employee, salary in zip(self.employees, self.salaries):
+            if employee.salary != salary:
+                employee.salary = salary
+                changed += 1
+        if self.org is not None and changed:
+            self.org.reload_salaries()
+        return changed
+
+
+def benchmark_payroll(size: int = 1_000_000) -> None:
+    """Time a company-wide raise on the column against give_raise per employee."""
+    rng = random.Random(11)
+    org = OrgIndex(build_org_chart(size))
+    departments = [rng.choice(["Engineering", "Sales", "Support", "Finance"]) for _ in range(size)]
+    backend = "NumPy" if np is not None else "pure Python"
+
+    sample = org.people[:10_000]
+    start = time.perf_counter()
+    for employee in sample:
+        employee.salary *= 1.03  # What give_raise does, minus its print
+        org.refresh_salary(employee)
+    per_object = (time.perf_counter() - start) / len(sample) * size
+
+    payroll = Payroll.from_org(org, departments)
+    print(f"Raise for {size:,} employees ({backend}):")
+    print(f"  per-object updates (extrapolated): {per_object:.2f}s")
+    for label, changes in [
+        ("everyone +3%", {"percent": 3.0}),
+        ("Engineering +5%", {"percent": 5.0, "department": "Engineering"}),
+        ("band < 60k +1,000", {"amount": 1_000.0, "max_salary": 60_000}),
+    ]:
+        start = time.perf_counter()
+        audit = payroll.apply_raise(**changes)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:20} {elapsed * 1e3:8.1f} ms, {audit.affected:,} affected")
+
+    start = time.perf_counter()
+    payroll.write_back()
+    print(f"  write_back to objects + org reload: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    print("\n=== Batch Payroll Demo ===\n")
+    org = OrgIndex(build_org_chart(20, span=4))
+    departments = ["Engineering" if i % 3 else "Sales" for i in range(len(org.people))]
+    payroll = Payroll.from_org(org, departments)
+    lead = next(person for person in org.people[1:] if getattr(person, "reports", None))
+
+    for audit in [
+        payroll.apply_raise(percent=3),
+        payroll.apply_raise(amount=2_500, department="Sales"),
+        payroll.apply_raise(percent=5, under=lead, max_salary=100_000),
+    ]:
+        print(f"{audit.description:45} {audit.affected:3} people, +${audit.total_increase:,.2f}")
+
+    payroll.write_back()
+    print(f"\nTeam cost under {lead.name}: ${org.total_salary(lead):,.2f}")
+
+    print()
+    benchmark_payroll()
@@ -0,0 +1,399 @@
+# Chapter 2.2 Extension: Persistent Dictionary
+# Snapshots without copy.deepcopy: a hash array mapped trie (HAMT) that shares structure between versions
+
+"""
+C# Equivalent Idea:
+var v1 = ImmutableDictionary<string, Employee>.Empty.Add("emp001", alice);
+var v2 = v1.SetItem("emp001", alice with { Salary = 78000 });   // v1 is unchanged
+var snapshot = v2;                                                // taking a snapshot is a reference copy
+"""
+
+import copy
+import random
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Sequence, Tuple, Union
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+_MISSING = object()
+
+
+class _Node:
+    """Bitmap-indexed trie node: up to 32 slots, only occupied ones stored."""
+
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap: int, entries: tuple) -> None:
+        self.bitmap = bitmap
+        # Each entry is a (hash, key, value) leaf, a _Node or a _Collision
+        self.entries = entries
+
+
+class _Collision:
+    """Keys whose 64-bit hashes are identical, kept as a tuple of leaves."""
+
+    __slots__ = ("hash", "entries")
+
+    def __init__(self, hash_: int, entries: tuple) -> None:
+        self.hash = hash_
+        self.entries = entries
+
+
+def _hash(key: Hashable) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _pair(shift: int, leaf_a: tuple, leaf_b: tuple) -> Union[_Node, _Collision]:
+    """Smallest subtree holding two leaves with different keys."""
+    if shift >= _HASH_BITS:
+        return _Collision(leaf_a[0], (leaf_a, leaf_b))
+    index_a = (leaf_a[0] >> shift) & _MASK
+    index_b = (leaf_b[0] >> shift) & _MASK
+    if index_a == index_b:
+        return _Node(1 << index_a, (_pair(shift + _BITS, leaf_a, leaf_b),))
+    entries = (leaf_a, leaf_b) if index_a < index_b else (leaf_b, leaf_a)
+    return _Node((1 << index_a) | (1 << index_b), entries)
+
+
+def _get(node: Union[_Node, _Collision], hash_: int, key: Hashable, default: Any) -> Any:
+    shift = 0
+    while True:
+        if type(node) is _Collision:
+            for leaf in node.entries:
+                if leaf[1] is key or leaf[1] == key:
+                    return leaf[2]
+            return default
+        bit = 1 << ((hash_ >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return default
+        entry = node.entries[(node.bitmap & (bit - 1)).bit_count()]
+        if type(entry) is tuple:
+            return entry[2] if entry[0] == hash_ and (entry[1] is key or entry[1] == key) else default
+        node = entry
+        shift += _BITS
+
+
+def _set(node: Union[_Node, _Collision], shift: int, leaf: tuple) -> Tuple[Union[_Node, _Collision], bool]:
+    """Copy of the path to ``leaf``'s slot with the leaf stored; returns (node, key was added)."""
+    hash_, key = leaf[0], leaf[1]
+    if type(node) is _Collision:
+        for i, old in enumerate(node.entries):
+            if old[1] is key or old[1] == key:
+                return _Collision(hash_, node.entries[:i] + (leaf,) + node.entries[i + 1:]), False
+        return _Collision(hash_, node.entries + (leaf,)), True
+
+    bit = 1 << ((hash_ >> shift) & _MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    entries = node.entries
+    if not node.bitmap & bit:
+        return _Node(node.bitmap | bit, entries[:index] + (leaf,) + entries[index:]), True
+
+    entry = entries[index]
+    if type(entry) is tuple:
+        if entry[0] == hash_ and (entry[1] is key or entry[1] == key):
+            if entry[2] is leaf[2]:
+                return node, False
+            child, added = leaf, False
+        else:
+            child, added = _pair(shift + _BITS, entry, leaf), True
+    else:
+        child, added = _set(entry, shift + _BITS, leaf)
+        if child is entry:
+            return node, False
+    return _Node(node.bitmap, entries[:index] + (child,) + entries[index + 1:]), added
+
+
+def _delete(node: Union[_Node, _Collision], shift: int, hash_: int, key: Hashable) -> Any:
+    """Copy of the path without ``key``: a node, a lone leaf to pull up, None if empty, or _MISSING."""
+    if type(node) is _Collision:
+        rest = tuple(leaf for leaf in node.entries if not (leaf[1] is key or leaf[1] == key))
+        if len(rest) == len(node.entries):
+            return _MISSING
+        return rest[0] if len(rest) == 1 else _Collision(node.hash, rest)
+
+    bit = 1 << ((hash_ >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return _MISSING
+    index = (node.bitmap & (bit - 1)).bit_count()
+    entries = node.entries
+    entry = entries[index]
+    if type(entry) is tuple:
+        if not (entry[0] == hash_ and (entry[1] is key or entry[1] == key)):
+            return _MISSING
+        child = None
+    else:
+        child = _delete(entry, shift + _BITS, hash_, key)
+        if child is _MISSING:
+            return _MISSING
+
+    if child is None:
+        if len(entries) == 1:
+            return None
+        remaining = entries[:index] + entries[index + 1:]
+        if len(remaining) == 1 and type(remaining[0]) is tuple and shift:
+            return remaining[0]  # Let the parent store the last leaf directly
+        return _Node(node.bitmap & ~bit, remaining)
+    if type(child) is tuple and len(entries) == 1 and shift:
+        return child
+    return _Node(node.bitmap, entries[:index] + (child,) + entries[index + 1:])
+
+
+def _build(leaves: List[tuple], shift: int) -> Union[_Node, _Collision]:
+    """Bulk-build a subtree bottom-up from leaves with distinct keys."""
+    if shift >= _HASH_BITS:
+        return _Collision(leaves[0][0], tuple(leaves))
+    if len(leaves) <= 8:
+        indexes = [(leaf[0] >> shift) & _MASK for leaf in leaves]
+        if len(set(indexes)) == len(leaves):  # Common for small maps: every leaf gets its own slot
+            order = sorted(range(len(leaves)), key=indexes.__getitem__)
+            return _Node(sum(1 << index for index in indexes), tuple(leaves[i] for i in order))
+    buckets: Dict[int, List[tuple]] = {}
+    for leaf in leaves:
+        buckets.setdefault((leaf[0] >> shift) & _MASK, []).append(leaf)
+    bitmap = 0
+    entries = []
+    for index in sorted(buckets):
+        bucket = buckets[index]
+        bitmap |= 1 << index
+        entries.append(bucket[0] if len(bucket) == 1 else _build(bucket, shift + _BITS))
+    return _Node(bitmap, tuple(entries))
+
+
+_EMPTY = _Node(0, ())
+
+
+class PersistentDict(Mapping):
+    """
+    Immutable mapping with structural sharing (a HAMT).
+
+    Reads work like a dict (``d[key]``, ``get``, ``in``, ``keys``, ``items``,
+    ``len``). "Changes" return a new PersistentDict in O(log32 n): only the
+    nodes on the path to the key are copied and everything else is shared
+    with the old version, which stays valid. A snapshot is just a reference,
+    so it costs nothing regardless of size. Iteration follows key hashes,
+    not insertion order.
+
+    Reads are dict-compatible in interface, not in speed: each lookup walks
+    the trie in Python, so a nested read is about 4x slower than on plain
+    dicts (see benchmark_persistent). Freezing a large nested store is
+    likewise a one-time cost of seconds to tens of seconds per million
+    records; it pays off when many versions or snapshots are kept.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, items: Union[Mapping, Iterable[Tuple[Hashable, Any]], None] = None) -> None:
+        self._root: _Node = _EMPTY
+        self._size = 0
+        if items:
+            pairs = items.items() if isinstance(items, Mapping) else items
+            leaves = list({key: (hash(key) & _HASH_MASK, key, value) for key, value in pairs}.values())
+            if leaves:
+                self._root = _build(leaves, 0)
+                self._size = len(leaves)
+
+    @classmethod
+    def _from_root(cls, root: _Node, size: int) -> "PersistentDict":
+        result = cls.__new__(cls)
+        result._root = root
+        result._size = size
+        return result
+
+    # --- dict-compatible reads ---
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = _get(self._root, _hash(key), key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return _get(self._root, _hash(key), key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return _get(self._root, _hash(key), key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _leaves(self) -> Iterator[tuple]:
+        stack = [self._root]
+        while stack:
+            for entry in reversed(stack.pop().entries):
+                if type(entry) is tuple:
+                    yield entry
+                else:
+                    stack.append(entry)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return (leaf[1] for leaf in self._leaves())
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:  # type: ignore[override]
+        return ((leaf[1], leaf[2]) for leaf in self._leaves())
+
+    def values(self) -> Iterator[Any]:  # type: ignore[override]
+        return (leaf[2] for leaf in self._leaves())
+
+    def __repr__(self) -> str:
+        shown = ", ".join(f"{key!r}: {value!r}" for key, value in _take(self.items(), 5))
+        more = ", ..." if self._size > 5 else ""
+        return f"PersistentDict({{{shown}{more}}})"
+
+    # --- versions ---
+
+    def set(self, key: Hashable, value: Any) -> "PersistentDict":
+        """New version with ``key`` set to ``value``."""
+        root, added = _set(self._root, 0, (_hash(key), key, value))
+        if root is self._root:
+            return self
+        return PersistentDict._from_root(root, self._size + added)
+
+    def delete(self, key: Hashable) -> "PersistentDict":
+        """New version without ``key`` (KeyError if missing)."""
+        root = _delete(self._root, 0, _hash(key), key)
+        if root is _MISSING:
+            raise KeyError(key)
+        return PersistentDict._from_root(root or _EMPTY, self._size - 1)
+
+    def update(self, items: Union[Mapping, Iterable[Tuple[Hashable, Any]]] = (), **changes: Any) -> "PersistentDict":
+        """New version with several keys set (like dict.update, without mutating)."""
+        pairs = items.items() if isinstance(items, Mapping) else items
+        root, size = self._root, self._size
+        for key, value in list(pairs) + list(changes.items()):
+            root, added = _set(root, 0, (_hash(key), key, value))
+            size += added
+        return PersistentDict._from_root(root, size)
+
+    def snapshot(self) -> "PersistentDict":
+        """This version; it can never change, so no copy is needed."""
+        return self
+
+    # --- nested values ---
+
+    def get_in(self, path: Sequence[Hashable], default: Any = None) -> Any:
+        """Follow keys through nested mappings: d.get_in(("emp001", "salary"))."""
+        value: Any = self
+        for key in path:
+            if not isinstance(value, Mapping):
+                return default
+            value = value.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+        return value
+
+    def set_in(self, path: Sequence[Hashable], value: Any) -> "PersistentDict":
+        """New version with a nested value replaced; missing levels become PersistentDicts."""
+        key, rest = path[0], path[1:]
+        if not rest:
+            return self.set(key, value)
+        child = self.get(key)
+        if not isinstance(child, PersistentDict):
+            child = freeze(child) if isinstance(child, Mapping) else PersistentDict()
+        return self.set(key, child.set_in(rest, value))
+
+    def thaw(self) -> Dict[Hashable, Any]:
+        """Plain nested dicts/lists (the reverse of freeze)."""
+        return {key: thaw(value) for key, value in self.items()}
+
+
+def _take(items: Iterator[Any], count: int) -> List[Any]:
+    return [item for _, item in zip(range(count), items)]
+
+
+_SCALARS = frozenset([str, int, float, bool, bytes, type(None)])
+
+
+def freeze(value: Any) -> Any:
+    """Nested dicts -> PersistentDicts and lists -> tuples, so every level is immutable."""
+    kind = type(value)
+    if kind in _SCALARS:
+        return value
+    if kind is dict:
+        return PersistentDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, PersistentDict):
+        return value
+    if isinstance(value, Mapping):
+        return PersistentDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    if isinstance(value, PersistentDict):
+        return value.thaw()
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def benchmark_persistent(size: int = 1_000_000, deepcopy_sample: int = 100_000) -> None:
+    """Compare deepcopy snapshots of a nested record store with PersistentDict versions."""
+    rng = random.Random(4)
+    records = {
+        f"emp{i:07d}": {"name": f"Person {i}", "salary": 50_000 + i % 40_000, "skills": ["python", "c#"]}
+        for i in range(size)
+    }
+
+    sample = dict(_take(iter(records.items()), deepcopy_sample))
+    start = time.perf_counter()
+    copy.deepcopy(sample)
+    deepcopy_time = (time.perf_counter() - start) * size / deepcopy_sample
+
+    start = time.perf_counter()
+    store = freeze(records)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    snapshots = [store.snapshot() for _ in range(1_000)]
+    snapshot_time = (time.perf_counter() - start) / len(snapshots)
+
+    ids = [f"emp{rng.randrange(size):07d}" for _ in range(10_000)]
+    start = time.perf_counter()
+    version = store
+    for emp_id in ids:
+        version = version.set_in((emp_id, "salary"), 99_000)
+    update = (time.perf_counter() - start) / len(ids)
+    assert store.get_in((ids[0], "salary")) == records[ids[0]]["salary"]  # Old version unchanged
+    assert version.get_in((ids[0], "salary")) == 99_000 and len(version) == size
+
+    start = time.perf_counter()
+    for emp_id in ids:
+        records[emp_id]["salary"]
+    dict_read = (time.perf_counter() - start) / len(ids)
+    start = time.perf_counter()
+    for emp_id in ids:
+        version[emp_id]["salary"]
+    hamt_read = (time.perf_counter() - start) / len(ids)
+
+    print(f"Record store with {size:,} nested employee records:")
+    print(f"  deepcopy snapshot (extrapolated):  {deepcopy_time:10.2f} s")
+    print(f"  freeze into PersistentDict (once): {build:10.2f} s")
+    print(f"  PersistentDict snapshot:           {snapshot_time * 1e9:10.0f} ns")
+    print(f"  set_in -> new version:             {update * 1e6:10.1f} µs")
+    print(f"  nested read, dict:                 {dict_read * 1e9:10.0f} ns")
+    print(f"  nested read, PersistentDict:       {hamt_read * 1e9:10.0f} ns")
+
+
+if __name__ == "__main__":
+    print("\n=== Persistent Dictionary Demo ===\n")
+    # The employees example from chapter2_dictionaries.py, without deepcopy
+    employees = freeze({
+        "emp001": {"name": "Alice Johnson", "department": "Engineering", "salary": 75000, "active": True},
+        "emp002": {"name": "Bob Smith", "department": "Marketing", "salary": 65000, "active": True},
+    })
+    snapshot = employees.snapshot()
+    employees = employees.set_in(("emp001", "salary"), 78000).set_in(("emp001", "last_review"), "2024-08-01")
+    print(f"Current Alice salary:  {employees['emp001']['salary']}")
+    print(f"Snapshot Alice salary: {snapshot.get_in(('emp001', 'salary'))}")
+    print(f"Bob's record is shared, not copied: {employees['emp002'] is snapshot['emp002']}")
+
+    employees = employees.delete("emp002")
+    print(f"Current ids: {list(employees)}, snapshot ids: {sorted(snapshot)}")
+    print(f"As plain dicts: {employees.thaw()}")
+
+    print()
+    benchmark_persistent()
@@ -0,0 +1,213 @@
+# Chapter 2.2 Extension: Bidirectional Phone Book
+# Name -> numbers and number -> name in two dictionaries that never disagree
+
+"""
+C# Equivalent Idea:
+var numbersByName = new Dictionary<string, List<string>>();
+var nameByNumber = new Dictionary<string, string>();     // reverse index, O(1) caller ID
+void Add(string name, string number) { numbersByName[name].Add(n); nameByNumber[n] = name; }
+"""
+
+import random
+import time
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+# Characters people type between digits: "(555) 012-3", "555.0123", "555 0123"
+_SEPARATORS = str.maketrans("", "", " -().\t/")
+
+
+def normalize_number(number: str) -> str:
+    """
+    Canonical form of a phone number: digits only, with a leading "+" kept.
+
+    "(555) 012-3", "555.0123" and "555 0123" all become "5550123";
+    "+1 555-0123" becomes "+15550123".
+    """
+    digits = number.translate(_SEPARATORS)
+    if digits.startswith("+"):
+        if digits[1:].isdigit() and digits[1:].isascii():
+            return digits
+    elif digits.isdigit() and digits.isascii():
+        return digits
+    raise ValueError(f"Invalid phone number: {number!r}")
+
+
+class PhoneBook:
+    """
+    Phone book with O(1) lookups in both directions.
+
+    ``_numbers`` maps each name to its normalized numbers (first one is the
+    primary number) and ``_owners`` maps each number back to its name. Every
+    change updates both, so a reverse lookup never has to scan the book.
+    A number belongs to at most one person.
+    """
+
+    def __init__(self, entries: Union[Mapping[str, Union[str, Iterable[str]]], None] = None) -> None:
+        """
+        Args:
+            entries: Name -> number, or name -> several numbers (like ``phone_book``
+                in chapter2_dictionaries.py)
+        """
+        self._numbers: Dict[str, List[str]] = {}
+        self._owners: Dict[str, str] = {}
+        for name, numbers in (entries or {}).items():
+            for number in [numbers] if isinstance(numbers, str) else numbers:
+                self.add(name, number)
+
+    def __len__(self) -> int:
+        """Number of people."""
+        return len(self._numbers)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._numbers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._numbers)
+
+    def __repr__(self) -> str:
+        return f"PhoneBook({len(self):,} people, {self.number_count():,} numbers)"
+
+    def number_count(self) -> int:
+        return len(self._owners)
+
+    def items(self) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        """(name, numbers) pairs in insertion order."""
+        return ((name, tuple(numbers)) for name, numbers in self._numbers.items())
+
+    def add(self, name: str, number: str) -> str:
+        """
+        Give ``name`` another number; returns the normalized number.
+
+        Raises:
+            ValueError: If the number is invalid or belongs to someone else
+        """
+        number = normalize_number(number)
+        owner = self._owners.get(number)
+        if owner is not None and owner != name:
+            raise ValueError(f"{number} already belongs to {owner}")
+        if owner is None:
+            self._owners[number] = name
+            self._numbers.setdefault(name, []).append(number)
+        return number
+
+    def set_numbers(self, name: str, numbers: Iterable[str]) -> None:
+        """Replace all of ``name``'s numbers (an empty list removes the person)."""
+        normalized = list(dict.fromkeys(map(normalize_number, numbers)))
+        for number in normalized:
+            owner = self._owners.get(number)
+            if owner is not None and owner != name:
+                raise ValueError(f"{number} already belongs to {owner}")
+        # Validated first, so a bad number leaves the book unchanged
+        self.remove(name)
+        for number in normalized:
+            self._owners[number] = name
+        if normalized:
+            self._numbers[name] = normalized
+
+    def rename(self, name: str, new_name: str) -> None:
+        """Move every number of ``name`` to ``new_name``."""
+        if new_name in self._numbers:
+            raise ValueError(f"{new_name} is already in the phone book")
+        numbers = self._numbers.pop(name)
+        self._numbers[new_name] = numbers
+        for number in numbers:
+            self._owners[number] = new_name
+
+    def remove(self, name: str) -> Tuple[str, ...]:
+        """Delete a person; returns the numbers they had (empty if unknown)."""
+        numbers = self._numbers.pop(name, [])
+        for number in numbers:
+            del self._owners[number]
+        return tuple(numbers)
+
+    def remove_number(self, number: str) -> str:
+        """Delete one number; returns its owner. A person left without numbers is removed."""
+        number = normalize_number(number)
+        name = self._owners.pop(number)
+        numbers = self._numbers[name]
+        numbers.remove(number)
+        if not numbers:
+            del self._numbers[name]
+        return name
+
+    def numbers(self, name: str) -> Tuple[str, ...]:
+        """All numbers of ``name``, primary first (empty if unknown)."""
+        return tuple(self._numbers.get(name, ()))
+
+    def lookup(self, name: str) -> Optional[str]:
+        """Primary number of ``name``."""
+        numbers = self._numbers.get(name)
+        return numbers[0] if numbers else None
+
+    def reverse_lookup(self, number: str) -> Optional[str]:
+        """Owner of ``number`` in any formatting, or None."""
+        name = self._owners.get(number)  # Already-normalized numbers skip normalization
+        if name is None:
+            try:
+                name = self._owners.get(normalize_number(number))
+            except ValueError:
+                return None
+        return name
+
+
+def benchmark_phone_book(size: int = 1_000_000, lookups: int = 1_000_000) -> None:
+    """Compare the chapter's reverse_lookup_phone scan with PhoneBook.reverse_lookup."""
+    rng = random.Random(17)
+    phone_book = {f"Person {i}": f"555-{i:07d}" for i in range(size)}
+
+    start = time.perf_counter()
+    book = PhoneBook(phone_book)
+    build = time.perf_counter() - start
+
+    def reverse_lookup_phone(number: str) -> str:  # Same loop as chapter2_dictionaries.py
+        for name, phone in phone_book.items():
+            if phone == number:
+                return name
+        return "Name not found"
+
+    calls = [f"555-{rng.randrange(size):07d}" for _ in range(lookups)]
+    canonical = [normalize_number(number) for number in calls]
+
+    scan_sample = calls[:20]
+    start = time.perf_counter()
+    scanned = [reverse_lookup_phone(number) for number in scan_sample]
+    scan = (time.perf_counter() - start) / len(scan_sample)
+
+    start = time.perf_counter()
+    found = [book.reverse_lookup(number) for number in calls]
+    formatted = (time.perf_counter() - start) / lookups
+    start = time.perf_counter()
+    found_canonical = [book.reverse_lookup(number) for number in canonical]
+    normalized = (time.perf_counter() - start) / lookups
+    assert found[: len(scanned)] == scanned and found == found_canonical
+
+    print(f"Reverse lookups in a book of {size:,} numbers:")
+    print(f"  build PhoneBook:                 {build:.2f}s")
+    print(f"  scan (reverse_lookup_phone):     {scan * 1e3:10,.1f} ms/lookup")
+    print(f"  PhoneBook, formatted numbers:    {formatted * 1e9:10,.0f} ns/lookup")
+    print(f"  PhoneBook, normalized numbers:   {normalized * 1e9:10,.0f} ns/lookup")
+    print(f"  about {3600 / formatted / 1e6:,.0f}M formatted lookups/hour on one core")
+
+
+if __name__ == "__main__":
+    print("\n=== Bidirectional Phone Book Demo ===\n")
+    # Same entries as chapter2_dictionaries.py, plus a second number for Alice
+    book = PhoneBook({"Alice": ["555-0123", "(555) 0199"], "Bob": "555-0124", "Charlie": "555-0125"})
+    print(book)
+    print(f"Alice: {book.numbers('Alice')}, primary {book.lookup('Alice')}")
+    print(f"Reverse lookup '555 0124': {book.reverse_lookup('555 0124')}")
+    print(f"Reverse lookup '(555) 0199': {book.reverse_lookup('(555) 0199')}")
+
+    book.set_numbers("Bob", ["555.0200"])
+    print(f"After Bob changes number: old -> {book.reverse_lookup('555-0124')}, new -> {book.reverse_lookup('5550200')}")
+    book.rename("Charlie", "Charles")
+    print(f"After rename: 555-0125 -> {book.reverse_lookup('555-0125')}")
+    print(f"Removed 555-0123 from {book.remove_number('555-0123')}; Alice now has {book.numbers('Alice')}")
+
+    try:
+        book.add("Dana", "555-0200")
+    except ValueError as error:
+        print(f"Error: {error}")
+
+    print()
+    benchmark_phone_book()
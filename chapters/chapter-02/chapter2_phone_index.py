@@ -0,0 +1,335 @@
+# Chapter 2.2 Extension: Phone Book Index File
+# Prefix search over names and numbers from a sorted index that is memory-mapped, not rebuilt
+
+"""
+C# Equivalent Idea:
+using var file = MemoryMappedFile.CreateFromFile("phones.idx");   // shared by every process
+var offsets = accessor.ReadArray<uint>(...);                       // sorted string table
+int first = LowerBound(names, prefix);                              // binary search, then walk
+"""
+
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+from chapter2_phone_book import PhoneBook, normalize_number
+
+# magic, version, little-endian flag, entry count, offset typecodes (names, numbers),
+# then (start, length) of each section
+_HEADER = struct.Struct("<8sHHQ2s6x12Q")
+_MAGIC = b"PHONEIDX"
+_VERSION = 1
+_SECTIONS = ("name_offsets", "names", "number_offsets", "numbers", "name_to_number", "number_to_name")
+
+
+class _StringColumn(Sequence):
+    """Read-only list of strings stored as one UTF-8 blob plus end offsets."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview) -> None:
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        offsets = self._offsets
+        return str(self._blob[offsets[index]:offsets[index + 1]], "utf-8")
+
+
+def _successor(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with ``prefix``."""
+    if not prefix or prefix[-1] == chr(sys.maxunicode):
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _string_table(values: Sequence[str]) -> Tuple[array, bytes]:
+    encoded = [value.encode() for value in values]
+    blob = b"".join(encoded)
+    offsets = array("I" if len(blob) < 2**32 else "Q", accumulate(map(len, encoded), initial=0))
+    return offsets, blob
+
+
+def write_phone_index(path: Union[str, os.PathLike], entries: Union[PhoneBook, Iterable[Tuple[str, str]]]) -> int:
+    """
+    Write an index file for a PhoneBook or (name, number) pairs.
+
+    Entries are sorted twice: by case-folded name, and by normalized number.
+    Each order is stored as a string table; two permutation arrays link the
+    tables, so either search can report the other field.
+
+    Returns:
+        Number of entries written
+    """
+    if isinstance(entries, PhoneBook):
+        pairs = [(name, number) for name, numbers in entries.items() for number in numbers]
+    else:
+        pairs = [(name, normalize_number(number)) for name, number in entries]
+    pairs.sort(key=lambda pair: (pair[0].casefold(), pair))
+    count = len(pairs)
+    names = [name for name, _ in pairs]
+    numbers = [number for _, number in pairs]
+    del pairs
+
+    number_to_name = array("I", sorted(range(count), key=numbers.__getitem__))
+    name_to_number = array("I", bytes(4 * count))
+    for position, entry in enumerate(number_to_name):
+        name_to_number[entry] = position
+    numbers = [numbers[entry] for entry in number_to_name]
+    for previous, number in zip(numbers, numbers[1:]):
+        if previous == number:
+            raise ValueError(f"{number} appears more than once")
+
+    name_offsets, name_blob = _string_table(names)
+    number_offsets, number_blob = _string_table(numbers)
+    sections = [name_offsets, name_blob, number_offsets, number_blob, name_to_number, number_to_name]
+
+    layout: List[int] = []
+    position = _HEADER.size
+    for section in sections:
+        position += -position % 8  # Keep every section 8-byte aligned
+        size = len(section) * (section.itemsize if isinstance(section, array) else 1)
+        layout += [position, size]
+        position += size
+
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        sys.byteorder == "little",
+        count,
+        (name_offsets.typecode + number_offsets.typecode).encode(),
+        *layout,
+    )
+    with open(path, "wb") as file:
+        file.write(header)
+        for section, start in zip(sections, layout[::2]):
+            file.write(bytes(start - file.tell()))
+            file.write(section)  # array and bytes both write their raw buffer
+    return count
+
+
+class PhoneIndex:
+    """
+    Read-only phone book index over a memory-mapped file (or any buffer).
+
+    Opening maps the file and wraps its sections without parsing them, so
+    start-up cost does not grow with the number of entries, and every
+    process that opens the same file shares one copy through the OS page
+    cache. Names are searched case-insensitively; numbers by their
+    normalized digits, so "555" finds a whole area code.
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        """
+        Args:
+            buffer: The bytes of an index file (``bytes``, ``mmap``, ...)
+        """
+        self._buffer = buffer
+        view = memoryview(buffer)
+        magic, version, little_endian, count, typecodes, *layout = _HEADER.unpack_from(view)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a phone index file")
+        if bool(little_endian) != (sys.byteorder == "little"):
+            raise ValueError("Phone index was written on a machine with a different byte order")
+
+        name_code, number_code = typecodes.decode()
+        formats = [name_code, "B", number_code, "B", "I", "I"]
+        section = {
+            name: view[start:start + length].cast(fmt)
+            for name, fmt, start, length in zip(_SECTIONS, formats, layout[::2], layout[1::2])
+        }
+        self._views = list(section.values())
+        self.count = count
+        self.names = _StringColumn(section["name_offsets"], section["names"])
+        self.numbers = _StringColumn(section["number_offsets"], section["numbers"])
+        self._name_to_number = section["name_to_number"]
+        self._number_to_name = section["number_to_name"]
+
+    @classmethod
+    def open(cls, path: Union[str, os.PathLike]) -> "PhoneIndex":
+        """Memory-map an index file written by ``write_phone_index``."""
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def build(cls, entries: Union[PhoneBook, Iterable[Tuple[str, str]]]) -> "PhoneIndex":
+        """Build an index in memory (handy for small books and tests)."""
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "phones.idx")
+            write_phone_index(path, entries)
+            with open(path, "rb") as file:
+                return cls(file.read())
+
+    def close(self) -> None:
+        for view in self._views:
+            view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self) -> "PhoneIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _name_range(self, prefix: str) -> range:
+        key = prefix.casefold()
+        start = bisect_left(self.names, key, key=str.casefold)
+        upper = _successor(key)
+        end = len(self.names) if upper is None else bisect_left(self.names, upper, start, key=str.casefold)
+        return range(start, end)
+
+    def _number_range(self, prefix: str) -> range:
+        try:
+            # Complete the prefix with a digit so a partly typed "(" or "+" is valid
+            key = normalize_number(prefix + "0")[:-1]
+        except ValueError:
+            return range(0)  # Letters can never start a number
+        start = bisect_left(self.numbers, key)
+        upper = _successor(key)
+        end = len(self.numbers) if upper is None else bisect_left(self.numbers, upper, start)
+        return range(start, end)
+
+    def search_names(self, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """(name, number) for names starting with ``prefix``, alphabetical."""
+        numbers, links = self.numbers, self._name_to_number
+        span = self._name_range(prefix)
+        return [(self.names[i], numbers[links[i]]) for i in span[:limit]]
+
+    def search_numbers(self, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """(number, name) for numbers starting with ``prefix`` (formatting ignored)."""
+        names, links = self.names, self._number_to_name
+        span = self._number_range(prefix)
+        return [(self.numbers[i], names[links[i]]) for i in span[:limit]]
+
+    def count_numbers(self, prefix: str) -> int:
+        """How many numbers start with ``prefix`` (two binary searches, no walk)."""
+        return len(self._number_range(prefix))
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Autocomplete: up to ``limit`` distinct names starting with ``prefix``."""
+        suggestions: List[str] = []
+        for i in self._name_range(prefix):
+            name = self.names[i]
+            if not suggestions or suggestions[-1] != name:
+                suggestions.append(name)
+                if len(suggestions) == limit:
+                    break
+        return suggestions
+
+    def lookup(self, name: str) -> List[str]:
+        """All numbers of exactly ``name`` (case-insensitive)."""
+        key = name.casefold()
+        numbers, links = self.numbers, self._name_to_number
+        return [numbers[links[i]] for i in self._name_range(name) if self.names[i].casefold() == key]
+
+    def reverse_lookup(self, number: str) -> Optional[str]:
+        """Owner of ``number`` in any formatting, or None (also for malformed input)."""
+        try:
+            key = normalize_number(number)
+        except ValueError:
+            return None
+        position = bisect_left(self.numbers, key)
+        if position < len(self.numbers) and self.numbers[position] == key:
+            return self.names[self._number_to_name[position]]
+        return None
+
+
+def generate_phone_entries(count: int, seed: int = 23) -> List[Tuple[str, str]]:
+    """Random (name, number) pairs with a few hundred area codes."""
+    rng = random.Random(seed)
+    first = ["Alice", "Bob", "Carol", "Dan", "Erin", "Frank", "Grace", "Heidi", "Ivan", "Judy"]
+    last = ["Smith", "Jones", "Brown", "Lee", "Garcia", "Khan", "Novak", "Ito", "Silva", "Okafor"]
+    numbers = rng.sample(range(200_0000000, 1000_0000000), count)
+    return [
+        (f"{rng.choice(first)} {rng.choice(last)} {i}", f"({n // 10**7}) {n // 10**4 % 1000}-{n % 10**4:04d}")
+        for i, n in enumerate(numbers)
+    ]
+
+
+def benchmark_phone_index(count: int = 1_000_000, queries: int = 2_000) -> None:
+    """Compare dict scans with the memory-mapped index for prefix queries."""
+    entries = generate_phone_entries(count)
+    phone_book = dict(entries)
+    rng = random.Random(5)
+    name_prefixes = [name[: rng.randint(3, 8)] for name, _ in rng.sample(entries, queries)]
+    area_codes = [str(rng.randrange(200, 1000)) for _ in range(queries)]
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "phones.idx")
+        start = time.perf_counter()
+        write_phone_index(path, entries)
+        build = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        index = PhoneIndex.open(path)
+        cold_start = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scanned = [
+            sorted((name for name in phone_book if name.casefold().startswith(prefix.casefold())), key=str.casefold)[:10]
+            for prefix in name_prefixes[:5]
+        ]
+        scan = (time.perf_counter() - start) / 5
+
+        start = time.perf_counter()
+        found = [index.search_names(prefix) for prefix in name_prefixes]
+        name_search = (time.perf_counter() - start) / queries
+        assert [[name for name, _ in hits] for hits in found[:5]] == scanned
+
+        start = time.perf_counter()
+        counts = [index.count_numbers(code) for code in area_codes]
+        area_count = (time.perf_counter() - start) / queries
+        expected = sum(normalize_number(n).startswith(area_codes[0]) for n in phone_book.values())
+        assert counts[0] == expected
+
+        start = time.perf_counter()
+        for name, number in rng.sample(entries, queries):
+            assert index.reverse_lookup(number) == name
+        reverse = (time.perf_counter() - start) / queries
+        index.close()
+
+    print(f"Phone index with {count:,} entries:")
+    print(f"  write index file:          {build:8.2f} s ({size / 1e6:,.1f} MB, ~{size / count:.0f} bytes/entry)")
+    print(f"  open (mmap, cold start):   {cold_start * 1e3:8.3f} ms")
+    print(f"  name prefix, dict scan:    {scan * 1e3:8.1f} ms")
+    print(f"  name prefix, index:        {name_search * 1e6:8.1f} µs (10 results)")
+    print(f"  area-code count, index:    {area_count * 1e6:8.1f} µs")
+    print(f"  reverse lookup, index:     {reverse * 1e6:8.1f} µs")
+    print(f"  30M entries would need ~{size / count * 30e6 / 1e9:.1f} GB on disk, shared by every process")
+
+
+if __name__ == "__main__":
+    print("\n=== Phone Book Index Demo ===\n")
+    book = PhoneBook({
+        "Alice": ["555-0123", "(212) 555-0199"],
+        "Alicia": "212-555-0100",
+        "Bob": "555-0124",
+        "Charlie": "555-0125",
+    })
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "phones.idx")
+        write_phone_index(path, book)
+        with PhoneIndex.open(path) as index:
+            print(f"Autocomplete 'ali': {index.complete('ali')}")
+            print(f"Names starting with 'Al': {index.search_names('Al')}")
+            print(f"Area code (212): {index.search_numbers('(212)')}")
+            print(f"Numbers starting 555: {index.count_numbers('555')}")
+            print(f"Alice's numbers: {index.lookup('alice')}")
+            print(f"Who calls from 555 0125? {index.reverse_lookup('555 0125')}")
+
+    print()
+    benchmark_phone_index()
@@ -0,0 +1,239 @@
+# Chapter 2.4 Extension: Point Arrays
+# Millions of points in two float64 buffers instead of millions of Point objects
+
+"""
+C# Equivalent Idea:
+double[] xs, ys;                                  // struct-of-arrays instead of Point[]
+Vector.Add(xs, otherXs, resultXs);                // System.Numerics.Tensors style bulk math
+ref struct PointRef { public double X => xs[i]; } // view into the arrays, no copy
+"""
+
+import math
+import time
+from array import array
+from typing import Any, Iterable, Sequence, Tuple, Union
+
+from chapter2_classes import Point
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python fallbacks are used instead
+    np = None
+
+# NumPy arrays when NumPy is installed, array('d') / bytearray otherwise
+FloatColumn = Any
+Mask = Any
+
+
+class PointView(Point):
+    """A Point that reads and writes one slot of a PointArray instead of owning x/y."""
+
+    def __init__(self, points: "PointArray", index: int) -> None:
+        # Deliberately not calling Point.__init__: x and y live in the arrays
+        self._points = points
+        self._index = index
+
+    @property
+    def x(self) -> float:
+        return self._points.x[self._index]
+
+    @x.setter
+    def x(self, value: float) -> None:
+        self._points.x[self._index] = value
+
+    @property
+    def y(self) -> float:
+        return self._points.y[self._index]
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self._points.y[self._index] = value
+
+
+class PointArray:
+    """
+    Struct-of-arrays companion to Point.
+
+    ``x`` and ``y`` are contiguous float64 buffers: ``array('d')`` when built
+    from Python values, or the caller's NumPy arrays when built with
+    ``from_numpy`` (no copy either way). Bulk operations run in NumPy when it
+    is installed and fall back to plain loops otherwise.
+    """
+
+    def __init__(self, x: Iterable[float] = (), y: Iterable[float] = ()) -> None:
+        self.x = x if _is_float64_buffer(x) else array("d", x)
+        self.y = y if _is_float64_buffer(y) else array("d", y)
+        if len(self.x) != len(self.y):
+            raise ValueError("x and y must have the same length")
+
+    @classmethod
+    def from_points(cls, points: Iterable[Point]) -> "PointArray":
+        """Copy coordinates out of Point objects."""
+        result = cls()
+        for point in points:
+            result.x.append(point.x)
+            result.y.append(point.y)
+        return result
+
+    @classmethod
+    def from_numpy(cls, x: Any, y: Any) -> "PointArray":
+        """Wrap NumPy arrays; contiguous float64 input is used without copying."""
+        return cls(np.ascontiguousarray(x, dtype=np.float64), np.ascontiguousarray(y, dtype=np.float64))
+
+    def to_numpy(self) -> Tuple[Any, Any]:
+        """(x, y) as NumPy arrays sharing this object's memory."""
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return np.frombuffer(self.x, dtype=np.float64), np.frombuffer(self.y, dtype=np.float64)
+
+    def to_points(self) -> list:
+        """Materialize independent Point objects."""
+        return [Point(x, y) for x, y in zip(self.x, self.y)]
+
+    def __len__(self) -> int:
+        """Number of points (unlike Point.__len__, which is a distance)."""
+        return len(self.x)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[PointView, "PointArray"]:
+        if isinstance(index, slice):
+            return PointArray(self.x[index], self.y[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PointArray index out of range")
+        return PointView(self, index)
+
+    def __iter__(self):
+        return (PointView(self, index) for index in range(len(self)))
+
+    def __repr__(self) -> str:
+        return f"PointArray({len(self):,} points)"
+
+    def _columns(self, other: Union[Point, "PointArray"]) -> Tuple[Any, Any]:
+        """Other operand as (x, y): scalars for a Point, columns for a PointArray."""
+        if isinstance(other, PointArray):
+            if len(other) != len(self):
+                raise ValueError("PointArrays must have the same length")
+            return other.to_numpy() if np is not None else (other.x, other.y)
+        return other.x, other.y
+
+    def __add__(self, other: Union[Point, "PointArray"]) -> "PointArray":
+        """Elementwise addition (a Point is added to every point)."""
+        ox, oy = self._columns(other)
+        if np is not None:
+            x, y = self.to_numpy()
+            return PointArray(x + ox, y + oy)
+        if isinstance(other, PointArray):
+            return PointArray(map(float.__add__, self.x, ox), map(float.__add__, self.y, oy))
+        return PointArray((v + ox for v in self.x), (v + oy for v in self.y))
+
+    def __iadd__(self, other: Union[Point, "PointArray"]) -> "PointArray":
+        """In-place addition: no new buffers."""
+        ox, oy = self._columns(other)
+        if np is not None:
+            x, y = self.to_numpy()
+            x += ox
+            y += oy
+            return self
+        many = isinstance(other, PointArray)
+        for column, offsets in ((self.x, ox), (self.y, oy)):
+            for i in range(len(column)):
+                column[i] += offsets[i] if many else offsets
+        return self
+
+    def equal(self, other: Union[Point, "PointArray"]) -> Mask:
+        """Elementwise Point.__eq__ as a boolean mask."""
+        ox, oy = self._columns(other)
+        if np is not None:
+            x, y = self.to_numpy()
+            return (x == ox) & (y == oy)
+        if isinstance(other, PointArray):
+            return bytearray(a == c and b == d for a, b, c, d in zip(self.x, self.y, ox, oy))
+        return bytearray(a == ox and b == oy for a, b in zip(self.x, self.y))
+
+    def norms(self) -> FloatColumn:
+        """Distance of every point from the origin."""
+        if np is not None:
+            return np.hypot(*self.to_numpy())
+        return array("d", map(math.hypot, self.x, self.y))
+
+    def lengths(self) -> Sequence[int]:
+        """Same values as len(point) for every point (truncated norms)."""
+        if np is not None:
+            return self.norms().astype(np.int64)
+        return array("q", map(int, self.norms()))
+
+    def distances(self, other: Union[Point, "PointArray"]) -> FloatColumn:
+        """Distance to one Point, or pairwise to the matching points of another array."""
+        ox, oy = self._columns(other)
+        if np is not None:
+            x, y = self.to_numpy()
+            return np.hypot(x - ox, y - oy)
+        if isinstance(other, PointArray):
+            return array("d", (math.hypot(a - c, b - d) for a, b, c, d in zip(self.x, self.y, ox, oy)))
+        return array("d", (math.hypot(a - ox, b - oy) for a, b in zip(self.x, self.y)))
+
+
+def _is_float64_buffer(values: Any) -> bool:
+    if isinstance(values, array):
+        return values.typecode == "d"
+    return (
+        np is not None
+        and isinstance(values, np.ndarray)
+        and values.dtype == np.float64
+        and values.ndim == 1
+        and values.flags.c_contiguous
+    )
+
+
+def benchmark_points(object_count: int = 1_000_000, array_count: int = 1_000_000) -> None:
+    """Compare Point objects with PointArray for addition and norms."""
+    points = [Point(i % 1000, i % 777) for i in range(object_count)]
+    offset = Point(0.5, -0.25)
+    start = time.perf_counter()
+    moved = [point + offset for point in points]
+    lengths = [len(point) for point in moved]
+    per_object = (time.perf_counter() - start) / object_count
+    del points, moved
+
+    if np is not None:
+        index = np.arange(array_count, dtype=np.float64)
+        many = PointArray.from_numpy(index % 1000, index % 777)
+        del index
+    else:
+        many = PointArray((i % 1000 for i in range(array_count)), (i % 777 for i in range(array_count)))
+    start = time.perf_counter()
+    many += offset
+    bulk_lengths = many.lengths()
+    bulk = (time.perf_counter() - start) / array_count
+    assert list(bulk_lengths[:10]) == lengths[:10]
+
+    backend = "NumPy" if np is not None else "pure Python"
+    print(f"Move every point and compute len() ({backend}):")
+    print(f"  Point objects: {per_object * 1e9:8.1f} ns/point ({object_count:,} points)")
+    print(f"  PointArray:    {bulk * 1e9:8.1f} ns/point ({array_count:,} points)")
+    print(f"  PointArray memory: {2 * 8 * array_count / 1e6:,.0f} MB")
+
+
+if __name__ == "__main__":
+    print("\n=== PointArray Demo ===\n")
+    points = PointArray.from_points([Point(3, 4), Point(1, 2), Point(3, 4), Point(-6, 8)])
+    print(f"{points}: first = {points[0]}, last = {points[-1]}")
+    print(f"norms:   {list(map(float, points.norms()))}")
+    print(f"lengths: {list(map(int, points.lengths()))} (len(Point(3, 4)) = {len(Point(3, 4))})")
+    print(f"equal to Point(3, 4): {list(map(bool, points.equal(Point(3, 4))))}")
+
+    shifted = points + Point(1, 1)
+    print(f"shifted[1]: {shifted[1]}, distances to originals: {list(map(float, shifted.distances(points)))}")
+
+    view = points[1]
+    view.x = 10  # Writes through to the array
+    print(f"after view.x = 10: points[1] = {points[1]}, view + Point(1, 1) = {view + Point(1, 1)}")
+
+    if np is not None:
+        x, y = points.to_numpy()
+        x *= 2  # Same memory as the PointArray
+        print(f"after doubling x through NumPy: {points[0]}")
+
+    print()
+    benchmark_points()
@@ -0,0 +1,175 @@
+# Chapter 2.4 Extension: Population View
+# Ages, birth years and adult flags for many Person objects at once, one clock read per batch
+
+"""
+C# Equivalent Idea:
+public PopulationView(IEnumerable<Person> people, TimeProvider clock)
+{
+    ages = people.Select(p => p.Age).ToArray();
+    this.clock = clock;                      // injectable, like .NET 8 TimeProvider
+}
+int year = clock.GetLocalNow().Year;         // read once, then used for every row
+"""
+
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from chapter2_classes import Person
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python fallbacks are used instead
+    np = None
+
+# Anything returning the current datetime; datetime.now is what Person uses
+Clock = Callable[[], datetime]
+
+ADULT_AGE = 18  # Same threshold as Person.is_adult
+
+
+@dataclass(frozen=True)
+class Census:
+    """Summary of a population at one moment."""
+
+    taken_at: datetime
+    count: int
+    adults: int
+    minors: int
+    average_age: float
+    oldest_birth_year: Optional[int]
+    youngest_birth_year: Optional[int]
+
+
+class PopulationView:
+    """
+    Column of ages for many Person/Employee objects.
+
+    Birth years and adult flags are computed for the whole column in one
+    operation, and the clock is read once per call instead of once per
+    person. Call ``refresh`` after ages change on the objects.
+    """
+
+    def __init__(self, people: Iterable[Person] = (), clock: Clock = datetime.now) -> None:
+        self.people = list(people)
+        self.clock = clock
+        self.ages = array("i")
+        self.refresh()
+
+    @classmethod
+    def from_ages(cls, ages: Iterable[int], clock: Clock = datetime.now) -> "PopulationView":
+        """A view over ages alone, without Person objects."""
+        view = cls(clock=clock)
+        view.ages = array("i", ages)
+        return view
+
+    @classmethod
+    def from_birth_years(
+        cls, birth_years: Iterable[int], clock: Clock = datetime.now
+    ) -> "PopulationView":
+        """Bulk version of Person.from_birth_year: ages from birth years, one clock read."""
+        year = clock().year
+        return cls.from_ages((year - born for born in birth_years), clock)
+
+    def refresh(self) -> None:
+        """Re-read ages from the Person objects."""
+        if self.people:
+            self.ages = array("i", (person.age for person in self.people))
+
+    def __len__(self) -> int:
+        return len(self.ages)
+
+    def _ages(self) -> Any:
+        return np.frombuffer(self.ages, dtype=np.int32) if np is not None else self.ages
+
+    def birth_years(self, year: Optional[int] = None) -> Sequence[int]:
+        """Approximate birth year of everyone (same rule as Person.birth_year)."""
+        year = self.clock().year if year is None else year
+        if np is not None:
+            return year - self._ages()
+        return array("i", (year - age for age in self.ages))
+
+    def adult_flags(self) -> Sequence[bool]:
+        """Person.is_adult for everyone, as a mask."""
+        if np is not None:
+            return self._ages() >= ADULT_AGE
+        return bytearray(age >= ADULT_AGE for age in self.ages)
+
+    def adult_count(self) -> int:
+        """Number of adults."""
+        if np is not None:
+            return int(np.count_nonzero(self._ages() >= ADULT_AGE))
+        return sum(age >= ADULT_AGE for age in self.ages)
+
+    def census(self) -> Census:
+        """Counts, average age and birth-year range, reading the clock once."""
+        taken_at = self.clock()
+        count = len(self.ages)
+        adults = self.adult_count()
+        if not count:
+            return Census(taken_at, 0, 0, 0, 0.0, None, None)
+        if np is not None:
+            ages = self._ages()
+            total, oldest, youngest = int(ages.sum(dtype=np.int64)), int(ages.max()), int(ages.min())
+        else:
+            total, oldest, youngest = sum(self.ages), max(self.ages), min(self.ages)
+        return Census(
+            taken_at=taken_at,
+            count=count,
+            adults=adults,
+            minors=count - adults,
+            average_age=total / count,
+            oldest_birth_year=taken_at.year - oldest,
+            youngest_birth_year=taken_at.year - youngest,
+        )
+
+
+def benchmark_population(count: int = 2_000_000) -> None:
+    """Compare per-object properties with the bulk view."""
+    people = [Person(f"Person {i}", i % 90) for i in range(count)]
+
+    start = time.perf_counter()
+    birth_years = [person.birth_year for person in people]
+    adults = sum(person.is_adult for person in people)
+    per_object = time.perf_counter() - start
+
+    start = time.perf_counter()
+    view = PopulationView(people)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    bulk_years = view.birth_years()
+    bulk_adults = view.adult_count()
+    bulk = time.perf_counter() - start
+    assert list(bulk_years[:100]) == birth_years[:100] and bulk_adults == adults
+
+    backend = "NumPy" if np is not None else "pure Python"
+    print(f"Birth years and adult count for {count:,} people:")
+    print(f"  Person properties:     {per_object:.3f}s")
+    print(f"  PopulationView build:  {build:.3f}s (reads every age once)")
+    print(f"  PopulationView query:  {bulk:.3f}s ({backend})")
+
+
+if __name__ == "__main__":
+    print("\n=== Population View Demo ===\n")
+    people = [Person("Alice", 25), Person("Bob", 17), Person("Carol", 70), Person("Dan", 4)]
+
+    # A fixed clock makes results repeatable (handy in tests)
+    reads = []
+
+    def fixed_clock() -> datetime:
+        reads.append(1)
+        return datetime(2030, 6, 1)
+
+    view = PopulationView(people, clock=fixed_clock)
+    print(f"Birth years in 2030: {list(map(int, view.birth_years()))}")
+    print(f"Adults: {[p.name for p, adult in zip(people, view.adult_flags()) if adult]}")
+    print(f"Census: {view.census()}")
+    print(f"Clock reads for {len(view)} people: {len(reads)}")
+
+    born = PopulationView.from_birth_years([1990, 2015], clock=fixed_clock)
+    print(f"Ages for people born 1990 and 2015: {list(born.ages)}")
+
+    print()
+    benchmark_population()
@@ -0,0 +1,296 @@
+# Chapter 2.6: Generated Serializers
+# Python vs C# Source-Generated JSON Encoders
+
+"""
+C# Source Generation:
+[JsonSerializable(typeof(Student))]
+internal partial class AppJsonContext : JsonSerializerContext { }
+string json = JsonSerializer.Serialize(student, AppJsonContext.Default.Student);
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, TextIO, Tuple, Union
+
+# A field is (JSON key, Python expression over ``obj``, value kind). Kinds:
+#   str, optional_str, int, number, bool, str_list, objects (registered), any
+FieldSpec = Tuple[str, str, str]
+Encoder = Callable[[Any], str]
+BulkEncoder = Callable[[List[Any]], List[str]]
+# A class, or "module.QualName" for a class that is not imported yet
+ClassKey = Union[type, str]
+
+# Field lists mirror User.to_dict, Student.to_dict, dataclasses.asdict(Product)
+# and Serializable.to_dict for Employee/Manager (attributes set in __init__).
+# Keyed by module and qualified name so same-named classes elsewhere never match.
+DEFAULT_SPECS: Dict[ClassKey, List[FieldSpec]] = {
+    "exercise1_1.User": [
+        ("first_name", "obj.first_name", "str"),
+        ("last_name", "obj.last_name", "str"),
+        ("age", "obj.age", "int"),
+        ("email", "obj.email", "optional_str"),
+        # full_name, display_name and age_category inlined from User's properties
+        ("full_name", 'obj.first_name + " " + obj.last_name', "str"),
+        ("display_name", 'obj.last_name + ", " + obj.first_name', "str"),
+        ("age_category", '"Minor" if obj.age < 18 else "Adult" if obj.age <= 64 else "Senior"', "str"),
+        ("is_email_valid", "obj.is_email_valid", "bool"),
+    ],
+    "exercise2_1.Student": [
+        ("student_id", "obj.student_id", "str"),
+        ("name", "obj.full_name", "str"),
+        ("email", "obj.email", "str"),
+        ("subjects", "obj.subjects", "str_list"),
+        ("overall_gpa", "round(obj.get_overall_gpa(), 2)", "number"),
+        ("total_assignments", "len(obj.assignments)", "int"),
+        ("pending_assignments", "len(obj.get_pending_assignments())", "int"),
+    ],
+    "chapter2_classes.Product": [
+        ("name", "obj.name", "str"),
+        ("price", "obj.price", "number"),
+        ("category", "obj.category", "str"),
+        ("tags", "obj.tags", "str_list"),
+    ],
+    "chapter2_classes.Employee": [
+        ("name", "obj.name", "str"),
+        ("age", "obj.age", "int"),
+        ("employee_id", "obj.employee_id", "str"),
+        ("salary", "obj.salary", "number"),
+        ("is_active", "obj.is_active", "bool"),
+    ],
+    "chapter2_classes.Manager": [
+        ("name", "obj.name", "str"),
+        ("age", "obj.age", "int"),
+        ("employee_id", "obj.employee_id", "str"),
+        ("salary", "obj.salary", "number"),
+        ("is_active", "obj.is_active", "bool"),
+        ("team_size", "obj.team_size", "int"),
+        ("reports", "obj.reports", "objects"),
+    ],
+}
+
+
+def _class_key(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _number(value: Any) -> str:
+    """Encode a non-finite number the way json.dumps does."""
+    return json.dumps(value)
+
+
+def _value_code(expression: str, kind: str, var: str) -> str:
+    """Python expression that renders ``expression`` as JSON text.
+
+    Kinds that look at the value twice bind it to ``var`` with := first.
+    """
+    if kind == "str":
+        return f"_s({expression})"
+    if kind == "optional_str":
+        return f'"null" if ({var} := {expression}) is None else _s({var})'
+    if kind == "int":
+        return f"_int({expression})"
+    if kind == "number":
+        # v - v == 0 only for finite numbers; NaN/Infinity take the slow path
+        return f"_repr({var}) if ({var} := {expression}) - {var} == 0 else _number({var})"
+    if kind == "bool":
+        return f'"true" if {expression} else "false"'
+    if kind == "str_list":
+        return f'"[" + ", ".join(map(_s, {expression})) + "]"'
+    if kind == "objects":
+        return f"_encode_children(obj, {expression})"
+    if kind == "any":
+        return f"_dumps({expression})"
+    raise ValueError(f"Unknown field kind: {kind}")
+
+
+def _template(fields: List[FieldSpec]) -> str:
+    """Build one f-string literal that renders a whole object."""
+    pieces = []
+    for i, (key, expression, kind) in enumerate(fields):
+        literal = ("{" if i == 0 else ", ") + json.dumps(key) + ": "
+        literal = literal.replace("\\", "\\\\").replace("'", "\\'")
+        pieces.append(literal.replace("{", "{{").replace("}", "}}"))
+        pieces.append("{" + _value_code(expression, kind, f"v{i}") + "}")
+    pieces.append("}}" if fields else "{{}}")
+    return "f'" + "".join(pieces) + "'"
+
+
+class SerializerRegistry:
+    """
+    Generates, caches and applies one specialized JSON encoder per class.
+
+    Output matches ``json.dumps(obj.to_dict())`` (default separators) for
+    object trees, but each encoder is a single generated f-string: no
+    intermediate dict, no per-field type dispatch. A second generated
+    function encodes a whole list in one comprehension.
+
+    Nested objects ("objects" fields) are written out every time they
+    appear, like ``Serializable.to_dict(references=False)``; a cycle raises
+    ValueError. ``Serializable.iter_json`` writes shared objects and cycles
+    as {"$ref": ...} instead.
+    """
+
+    def __init__(self, specs: Optional[Dict[ClassKey, List[FieldSpec]]] = None) -> None:
+        self._specs: Dict[ClassKey, List[FieldSpec]] = dict(DEFAULT_SPECS if specs is None else specs)
+        self._encoders: Dict[type, Encoder] = {}
+        self._bulk_encoders: Dict[type, BulkEncoder] = {}
+        self._sources: Dict[type, str] = {}
+        self._local = threading.local()  # Per-thread ids of objects being encoded
+
+    def register(self, cls: ClassKey, fields: List[FieldSpec]) -> None:
+        """Add or replace the field list for a class (or its "module.QualName")."""
+        self._specs[cls] = fields
+        # Subclasses may have used the old spec: regenerate everything on next use
+        self._encoders.clear()
+        self._bulk_encoders.clear()
+        self._sources.clear()
+
+    def _spec_for(self, cls: type) -> List[FieldSpec]:
+        for base in cls.__mro__:
+            for key in (base, _class_key(base)):
+                if key in self._specs:
+                    return self._specs[key]
+        raise TypeError(f"No serializer registered for {_class_key(cls)}")
+
+    def _encode_children(self, parent: Any, children: Iterable[Any]) -> str:
+        """Encode an "objects" field, refusing to re-enter a parent (a cycle)."""
+        active: Optional[Set[int]] = getattr(self._local, "active", None)
+        if active is None:
+            active = self._local.active = set()
+        if id(parent) in active:
+            raise ValueError(
+                f"Circular reference through {type(parent).__name__}; "
+                "use Serializable.iter_json to write cycles as references"
+            )
+        active.add(id(parent))
+        try:
+            return "[" + ", ".join(map(self.encode, children)) + "]"
+        finally:
+            active.discard(id(parent))
+
+    def _generate(self, cls: type) -> Tuple[Encoder, BulkEncoder]:
+        name = cls.__name__
+        template = _template(self._spec_for(cls))
+        source = (
+            f"def encode_{name}(obj):\n"
+            f"    return {template}\n"
+            f"\n"
+            f"def encode_many_{name}(objs):\n"
+            f"    return [{template} for obj in objs]\n"
+        )
+
+        namespace: Dict[str, Any] = {
+            "_s": encode_basestring_ascii,
+            "_int": int.__repr__,
+            "_repr": repr,
+            "_number": _number,
+            "_dumps": json.dumps,
+            "_encode_children": self._encode_children,
+        }
+        exec(source, namespace)
+        self._sources[cls] = source
+        return namespace[f"encode_{name}"], namespace[f"encode_many_{name}"]
+
+    def encoder_for(self, cls: type) -> Encoder:
+        """Get (generating on first use) the encoder for a class."""
+        encoder = self._encoders.get(cls)
+        if encoder is None:
+            encoder, self._bulk_encoders[cls] = self._generate(cls)
+            self._encoders[cls] = encoder
+        return encoder
+
+    def source_for(self, cls: type) -> str:
+        """Show the generated encoder source (handy for learning and debugging)."""
+        self.encoder_for(cls)
+        return self._sources[cls]
+
+    def encode(self, obj: Any) -> str:
+        """Encode one object to JSON text."""
+        encoder = self._encoders.get(type(obj)) or self.encoder_for(type(obj))
+        return encoder(obj)
+
+    def _encode_chunk(self, objects: List[Any]) -> Iterable[str]:
+        types = set(map(type, objects))
+        if len(types) == 1:
+            # Same class throughout: one generated loop, no per-object dispatch
+            cls = types.pop()
+            self.encoder_for(cls)
+            return self._bulk_encoders[cls](objects)
+        return map(self.encode, objects)
+
+    def encode_many(self, objects: Iterable[Any]) -> str:
+        """Encode a list of objects as a JSON array in one call."""
+        objects = objects if isinstance(objects, list) else list(objects)
+        return "[" + ", ".join(self._encode_chunk(objects)) + "]"
+
+    def write_many(
+        self, objects: Iterable[Any], buffer: TextIO, chunk_size: int = 10_000
+    ) -> None:
+        """Stream a JSON array into a text buffer, one chunk of objects at a time."""
+        buffer.write("[")
+        iterator = iter(objects)
+        first = True
+        while True:
+            chunk = [obj for _, obj in zip(range(chunk_size), iterator)]
+            if not chunk:
+                break
+            if not first:
+                buffer.write(", ")
+            buffer.write(", ".join(self._encode_chunk(chunk)))
+            first = False
+        buffer.write("]")
+
+
+# Shared default registry
+serializers = SerializerRegistry()
+
+
+def benchmark_serializers(count: int = 1_000_000) -> None:
+    """Compare json.dumps over to_dict() with the generated encoders."""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "chapter-01"))
+    from exercise1_1 import User
+
+    users = [User("John", "Doe", 20 + i % 60, f"john{i}@example.com") for i in range(count)]
+
+    start = time.perf_counter()
+    expected = json.dumps([user.to_dict() for user in users])
+    baseline = time.perf_counter() - start
+
+    registry = SerializerRegistry()
+    start = time.perf_counter()
+    generated = registry.encode_many(users)
+    elapsed = time.perf_counter() - start
+    assert generated == expected
+
+    print(f"Encoding {count:,} User objects:")
+    print(f"  json.dumps(to_dict()): {count / baseline:12,.0f} objects/s")
+    print(f"  generated encoder:     {count / elapsed:12,.0f} objects/s")
+    print(f"  speedup: {baseline / elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    import io
+
+    from exercise2_1 import StudentManagementSystem, create_sample_data
+
+    sms = StudentManagementSystem()
+    create_sample_data(sms)
+    students = list(sms.students.values())
+
+    print("=== Generated Serializers Demo ===\n")
+    print("Generated encoder for Student:")
+    print(serializers.source_for(type(students[0])))
+
+    print(f"\n{serializers.encode(students[0])}")
+    assert serializers.encode_many(students) == json.dumps([s.to_dict() for s in students])
+
+    buffer = io.StringIO()
+    serializers.write_many(students, buffer, chunk_size=2)
+    assert buffer.getvalue() == serializers.encode_many(students)
+    print("Matches json.dumps([s.to_dict() ...]) for every student\n")
+
+    benchmark_serializers()
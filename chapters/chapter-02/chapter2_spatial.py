@@ -0,0 +1,279 @@
+# Chapter 2.4 Extension: Spatial Grid Index
+# Radius, bounding-box and nearest-neighbor queries without scanning every Point
+
+"""
+C# Equivalent Idea:
+var cells = new Dictionary<(int, int), List<int>>();    // uniform grid hash
+int cx = (int)Math.Floor(x / cellSize), cy = (int)Math.Floor(y / cellSize);
+foreach (var id in cells[(cx, cy)]) { ... }             // only nearby points are checked
+"""
+
+import heapq
+import math
+import random
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from chapter2_classes import Point
+from chapter2_points import PointArray
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python fallbacks are used instead
+    np = None
+
+Cell = Tuple[int, int]
+
+
+class GridIndex:
+    """
+    Uniform grid hash over points.
+
+    Space is cut into square cells of ``cell_size``; each cell keeps the ids
+    (positions in ``points``) of the points inside it. A query only looks at
+    the cells its area touches. Point ids are stable: ``insert`` appends.
+    """
+
+    def __init__(
+        self, points: Union[PointArray, Iterable[Point]] = (), cell_size: Optional[float] = None
+    ) -> None:
+        """
+        Args:
+            points: A PointArray or any iterable of Points (coordinates are copied)
+            cell_size: Cell edge length; by default chosen for ~2 points per cell
+        """
+        if not isinstance(points, PointArray):
+            points = PointArray.from_points(points)
+        # Own array('d') copies, so insert can append even for NumPy-backed input
+        self.points = PointArray(list(points.x), list(points.y))
+        self.cell_size = cell_size or self._default_cell_size()
+        if self.cell_size <= 0:
+            raise ValueError("Cell size must be positive")
+        self.cells: Dict[Cell, List[int]] = {}
+        # (min cell x, min cell y, max cell x, max cell y) of occupied cells
+        self._extent: Optional[Tuple[int, int, int, int]] = None
+        self._bulk_load()
+
+    @classmethod
+    def from_coordinates(
+        cls, x: Iterable[float], y: Iterable[float], cell_size: Optional[float] = None
+    ) -> "GridIndex":
+        """Build from parallel x/y coordinate sequences (lists, arrays, NumPy)."""
+        return cls(PointArray(x, y), cell_size)
+
+    def _default_cell_size(self, points_per_cell: float = 2.0) -> float:
+        count = len(self.points)
+        if count < 2:
+            return 1.0
+        x, y = self.points.x, self.points.y
+        area = (max(x) - min(x)) * (max(y) - min(y))
+        return math.sqrt(area * points_per_cell / count) or 1.0
+
+    def _cell_of(self, x: float, y: float) -> Cell:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _bulk_load(self) -> None:
+        count = len(self.points)
+        if not count:
+            return
+        if np is not None:
+            # Sort ids by cell once, then hand each cell its slice of the sorted ids
+            x, y = self.points.to_numpy()
+            cx = np.floor(x / self.cell_size).astype(np.int64)
+            cy = np.floor(y / self.cell_size).astype(np.int64)
+            order = np.lexsort((cy, cx))
+            sorted_cx, sorted_cy = cx[order], cy[order]
+            starts = np.flatnonzero(
+                np.concatenate(([True], (np.diff(sorted_cx) != 0) | (np.diff(sorted_cy) != 0)))
+            )
+            ids = order.tolist()
+            bounds = starts.tolist() + [count]
+            for i, (cell_x, cell_y) in enumerate(zip(sorted_cx[starts].tolist(), sorted_cy[starts].tolist())):
+                self.cells[cell_x, cell_y] = ids[bounds[i]:bounds[i + 1]]
+        else:
+            cell_of, cells = self._cell_of, self.cells
+            for i, (x, y) in enumerate(zip(self.points.x, self.points.y)):
+                cells.setdefault(cell_of(x, y), []).append(i)
+        self._update_extent(self.cells)
+
+    def _update_extent(self, cells: Iterable[Cell]) -> None:
+        xs = [cell[0] for cell in cells]
+        ys = [cell[1] for cell in cells]
+        if self._extent is not None:
+            xs += self._extent[0::2]
+            ys += self._extent[1::2]
+        self._extent = (min(xs), min(ys), max(xs), max(ys))
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def insert(self, point: Point) -> int:
+        """Add a point after the build; returns its id."""
+        point_id = len(self.points)
+        self.points.x.append(point.x)
+        self.points.y.append(point.y)
+        cell = self._cell_of(point.x, point.y)
+        self.cells.setdefault(cell, []).append(point_id)
+        self._update_extent([cell])
+        return point_id
+
+    def _ids_in_cells(self, low: Cell, high: Cell) -> Iterator[int]:
+        cells = self.cells
+        if (high[0] - low[0] + 1) * (high[1] - low[1] + 1) > len(cells):
+            # Query area spans more cells than exist: walk the occupied ones
+            for (cx, cy), ids in cells.items():
+                if low[0] <= cx <= high[0] and low[1] <= cy <= high[1]:
+                    yield from ids
+            return
+        for cx in range(low[0], high[0] + 1):
+            for cy in range(low[1], high[1] + 1):
+                ids = cells.get((cx, cy))
+                if ids:
+                    yield from ids
+
+    def in_box(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[int]:
+        """Ids of points with min_x <= x <= max_x and min_y <= y <= max_y."""
+        xs, ys = self.points.x, self.points.y
+        return [
+            i for i in self._ids_in_cells(self._cell_of(min_x, min_y), self._cell_of(max_x, max_y))
+            if min_x <= xs[i] <= max_x and min_y <= ys[i] <= max_y
+        ]
+
+    def within_radius(self, center: Point, radius: float) -> List[int]:
+        """Ids of points at distance <= radius from center."""
+        cx, cy, limit = center.x, center.y, radius * radius
+        low = self._cell_of(cx - radius, cy - radius)
+        high = self._cell_of(cx + radius, cy + radius)
+        xs, ys = self.points.x, self.points.y
+        return [
+            i for i in self._ids_in_cells(low, high)
+            if (xs[i] - cx) ** 2 + (ys[i] - cy) ** 2 <= limit
+        ]
+
+    def _ring(self, center: Cell, distance: int) -> Iterator[Cell]:
+        """Occupied-extent cells whose Chebyshev distance from center is ``distance``."""
+        cx, cy = center
+        min_cx, min_cy, max_cx, max_cy = self._extent
+        if distance == 0:
+            yield center
+            return
+        columns = range(max(cx - distance, min_cx), min(cx + distance, max_cx) + 1)
+        for y in (cy - distance, cy + distance):
+            if min_cy <= y <= max_cy:
+                for x in columns:
+                    yield x, y
+        rows = range(max(cy - distance + 1, min_cy), min(cy + distance - 1, max_cy) + 1)
+        for x in (cx - distance, cx + distance):
+            if min_cx <= x <= max_cx:
+                for y in rows:
+                    yield x, y
+
+    def nearest(self, center: Point, k: int = 1) -> List[Tuple[int, float]]:
+        """
+        The k nearest points as (id, distance), closest first.
+
+        Searches rings of cells around the center's cell and stops once the
+        k-th best distance is inside the area already searched.
+        """
+        if k <= 0 or not self.cells:
+            return []
+        x, y, size = center.x, center.y, self.cell_size
+        home = self._cell_of(x, y)
+        xs, ys, cells = self.points.x, self.points.y, self.cells
+        min_cx, min_cy, max_cx, max_cy = self._extent
+        best: List[Tuple[float, int]] = []  # Max-heap of (-squared distance, id)
+
+        # Rings closer than the occupied extent are empty: start at its edge
+        distance = max(0, min_cx - home[0], home[0] - max_cx, min_cy - home[1], home[1] - max_cy)
+        while True:
+            for cell in self._ring(home, distance):
+                for i in cells.get(cell, ()):
+                    squared = (xs[i] - x) ** 2 + (ys[i] - y) ** 2
+                    if len(best) < k:
+                        heapq.heappush(best, (-squared, i))
+                    elif squared < -best[0][0]:
+                        heapq.heapreplace(best, (-squared, i))
+
+            # Anything not yet seen lies outside the searched square of cells
+            searched = min(
+                x - (home[0] - distance) * size,
+                (home[0] + distance + 1) * size - x,
+                y - (home[1] - distance) * size,
+                (home[1] + distance + 1) * size - y,
+            )
+            covered = (
+                home[0] - distance <= min_cx and home[0] + distance >= max_cx
+                and home[1] - distance <= min_cy and home[1] + distance >= max_cy
+            )
+            if covered or (len(best) == k and -best[0][0] <= searched * searched):
+                break
+            distance += 1
+
+        return [(i, math.sqrt(-negative)) for negative, i in sorted(best, reverse=True)]
+
+
+def benchmark_spatial(count: int = 1_000_000, queries: int = 200) -> None:
+    """Compare grid queries with brute-force scans over Point objects and NumPy arrays."""
+    rng = random.Random(21)
+    points = [Point(rng.uniform(0, 10_000), rng.uniform(0, 10_000)) for _ in range(count)]
+    centers = [Point(rng.uniform(0, 10_000), rng.uniform(0, 10_000)) for _ in range(queries)]
+    radius, k = 50.0, 10
+
+    start = time.perf_counter()
+    index = GridIndex(points)
+    build = time.perf_counter() - start
+
+    def timed(function) -> Tuple[float, list]:
+        start = time.perf_counter()
+        results = [function(center) for center in centers]
+        return (time.perf_counter() - start) / len(centers), results
+
+    scan_sample = centers[:5]
+    start = time.perf_counter()
+    scanned = [
+        sorted(i for i, p in enumerate(points) if (p.x - c.x) ** 2 + (p.y - c.y) ** 2 <= radius**2)
+        for c in scan_sample
+    ]
+    object_scan = (time.perf_counter() - start) / len(scan_sample)
+
+    radius_time, found = timed(lambda c: index.within_radius(c, radius))
+    knn_time, neighbors = timed(lambda c: index.nearest(c, k))
+    box_time, _ = timed(lambda c: index.in_box(c.x - radius, c.y - radius, c.x + radius, c.y + radius))
+    assert [sorted(ids) for ids in found[: len(scan_sample)]] == scanned
+
+    print(f"{count:,} points, radius {radius:g}, k={k}:")
+    print(f"  build grid:                 {build:8.2f} s")
+    print(f"  radius, scan Point objects: {object_scan * 1e3:8.2f} ms")
+    if np is not None:
+        x, y = index.points.to_numpy()
+        numpy_time, numpy_found = timed(
+            lambda c: np.flatnonzero((x - c.x) ** 2 + (y - c.y) ** 2 <= radius**2).tolist()
+        )
+        numpy_knn, numpy_neighbors = timed(
+            lambda c: np.argpartition((x - c.x) ** 2 + (y - c.y) ** 2, k)[:k].tolist()
+        )
+        assert [sorted(ids) for ids in numpy_found] == [sorted(ids) for ids in found]
+        assert [sorted(ids) for ids in numpy_neighbors] == [sorted(i for i, _ in n) for n in neighbors]
+        print(f"  radius, NumPy scan:         {numpy_time * 1e3:8.2f} ms")
+        print(f"  k-NN, NumPy argpartition:   {numpy_knn * 1e3:8.2f} ms")
+    print(f"  radius, grid:               {radius_time * 1e3:8.3f} ms")
+    print(f"  bounding box, grid:         {box_time * 1e3:8.3f} ms")
+    print(f"  k-NN, grid:                 {knn_time * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    print("\n=== Spatial Grid Index Demo ===\n")
+    # Same places as chapter2_tuples_sets.py, which can only look up exact (x, y) keys
+    locations = {(0, 0): "Origin", (10, 20): "Point A", (-5, 15): "Point B"}
+    names = list(locations.values())
+    index = GridIndex((Point(x, y) for x, y in locations), cell_size=10)
+    names.append("Point C")
+    index.insert(Point(3, 4))
+
+    here = Point(1, 1)
+    print(f"Within 10 of {here}: {[names[i] for i in index.within_radius(here, 10)]}")
+    print(f"In box (-10, 0)-(5, 20): {[names[i] for i in index.in_box(-10, 0, 5, 20)]}")
+    print(f"2 nearest to {here}: {[(names[i], round(d, 2)) for i, d in index.nearest(here, 2)]}")
+
+    print()
+    benchmark_spatial()
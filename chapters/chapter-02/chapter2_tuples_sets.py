@@ -180,6 +180,7 @@ print("List membership check: O(n) average case")
 # Practical example: Remove duplicates while preserving order
 def remove_duplicates_preserve_order(items: list) -> list:
     """Remove duplicates from list while preserving order."""
+    # For streams, key functions and bounded memory see unique() in chapter2_dedup.py
     seen = set()
     result = []
     for item in items:
@@ -40,6 +40,32 @@ class Grade(Enum):
         }
         return grade_points[self]
 
+    @classmethod
+    def from_percentage(cls, percentage: float) -> "Grade":
+        """Convert a percentage score to a letter grade."""
+        if percentage >= 97:
+            return cls.A_PLUS
+        elif percentage >= 93:
+            return cls.A
+        elif percentage >= 90:
+            return cls.A_MINUS
+        elif percentage >= 87:
+            return cls.B_PLUS
+        elif percentage >= 83:
+            return cls.B
+        elif percentage >= 80:
+            return cls.B_MINUS
+        elif percentage >= 77:
+            return cls.C_PLUS
+        elif percentage >= 73:
+            return cls.C
+        elif percentage >= 70:
+            return cls.C_MINUS
+        elif percentage >= 60:
+            return cls.D
+        else:
+            return cls.F
+
 
 @dataclass
 class Assignment:
@@ -62,29 +88,7 @@ class Assignment:
     @property
     def letter_grade(self) -> Grade:
         """Calculate letter grade based on percentage."""
-        percentage = self.percentage
-        if percentage >= 97:
-            return Grade.A_PLUS
-        elif percentage >= 93:
-            return Grade.A
-        elif percentage >= 90:
-            return Grade.A_MINUS
-        elif percentage >= 87:
-            return Grade.B_PLUS
-        elif percentage >= 83:
-            return Grade.B
-        elif percentage >= 80:
-            return Grade.B_MINUS
-        elif percentage >= 77:
-            return Grade.C_PLUS
-        elif percentage >= 73:
-            return Grade.C
-        elif percentage >= 70:
-            return Grade.C_MINUS
-        elif percentage >= 60:
-            return Grade.D
-        else:
-            return Grade.F
+        return Grade.from_percentage(self.percentage)
 
     def submit(self, points_earned: float) -> None:
         """Submit assignment with earned points."""
@@ -152,28 +156,7 @@ class Student:
         for subject in self.subjects:
             avg_percentage = self.get_subject_average(subject)
             # Convert percentage to letter grade, then to GPA
-            if avg_percentage >= 97:
-                grade = Grade.A_PLUS
-            elif avg_percentage >= 93:
-                grade = Grade.A
-            elif avg_percentage >= 90:
-                grade = Grade.A_MINUS
-            elif avg_percentage >= 87:
-                grade = Grade.B_PLUS
-            elif avg_percentage >= 83:
-                grade = Grade.B
-            elif avg_percentage >= 80:
-                grade = Grade.B_MINUS
-            elif avg_percentage >= 77:
-                grade = Grade.C_PLUS
-            elif avg_percentage >= 73:
-                grade = Grade.C
-            elif avg_percentage >= 70:
-                grade = Grade.C_MINUS
-            elif avg_percentage >= 60:
-                grade = Grade.D
-            else:
-                grade = Grade.F
+            grade = Grade.from_percentage(avg_percentage)
 
             total_gpa += grade.gpa_value
 
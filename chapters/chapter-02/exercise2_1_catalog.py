@@ -0,0 +1,331 @@
+# Exercise 2.1 Extension: Assignment Catalog
+# Store each assignment definition once and keep per-student scores as compact arrays
+
+"""
+C# Flyweight Pattern:
+public record AssignmentDefinition(int Id, string Name, string Subject, double PointsPossible);
+var catalog = new Dictionary<(string, string), AssignmentDefinition>();
+var scores = new Dictionary<int, double[]>();   // one score column per assignment
+"""
+
+import math
+import tracemalloc
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from exercise2_1 import Assignment, StudentManagementSystem
+
+# Sentinels stored inside the float score columns
+PENDING = math.nan  # Assigned but not yet submitted
+NOT_ASSIGNED = -math.inf  # Student never received this assignment
+
+
+@dataclass(frozen=True)
+class AssignmentDefinition:
+    """Shared, immutable description of an assignment (the flyweight)."""
+
+    catalog_id: int
+    name: str
+    subject: str
+    points_possible: float = 100.0
+    due_date: Optional[date] = None
+
+
+class AssignmentCatalog:
+    """Registry that stores every assignment definition exactly once."""
+
+    def __init__(self) -> None:
+        self.definitions: List[AssignmentDefinition] = []
+        self._ids_by_key: Dict[Tuple[str, str], int] = {}
+
+    def define(
+        self,
+        name: str,
+        subject: str,
+        points_possible: float = 100.0,
+        due_date: Optional[date] = None,
+    ) -> int:
+        """Register an assignment (or return the existing id) keyed by name and subject."""
+        key = (name, subject)
+        existing_id = self._ids_by_key.get(key)
+        if existing_id is not None:
+            existing = self.definitions[existing_id]
+            if (existing.points_possible, existing.due_date) != (points_possible, due_date):
+                raise ValueError(
+                    f"Assignment '{name}' ({subject}) already defined with different details"
+                )
+            return existing_id
+
+        catalog_id = len(self.definitions)
+        self.definitions.append(
+            AssignmentDefinition(catalog_id, name, subject, points_possible, due_date)
+        )
+        self._ids_by_key[key] = catalog_id
+        return catalog_id
+
+    def get(self, catalog_id: int) -> AssignmentDefinition:
+        """Get a definition by catalog id."""
+        return self.definitions[catalog_id]
+
+    def find(self, name: str, subject: str) -> Optional[int]:
+        """Find the catalog id for an assignment name within a subject."""
+        return self._ids_by_key.get((name, subject))
+
+    def get_by_subject(self, subject: str) -> List[AssignmentDefinition]:
+        """Get all definitions for a specific subject."""
+        return [d for d in self.definitions if d.subject == subject]
+
+    def __len__(self) -> int:
+        return len(self.definitions)
+
+    def __iter__(self) -> Iterator[AssignmentDefinition]:
+        return iter(self.definitions)
+
+
+class ScoreBook:
+    """
+    Per-student results stored column-wise, one ``array('d')`` per catalog entry.
+
+    Row ``i`` of every column belongs to ``student_ids[i]``. Each cell holds the
+    points earned, ``PENDING`` (NaN) for unsubmitted work, or ``NOT_ASSIGNED``.
+    """
+
+    def __init__(self, catalog: AssignmentCatalog) -> None:
+        self.catalog = catalog
+        self.student_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._columns: Dict[int, array] = {}
+
+    def add_student(self, student_id: str) -> int:
+        """Add a student row and return its index."""
+        if student_id in self._rows:
+            raise ValueError(f"Student with ID {student_id} already exists")
+
+        row = len(self.student_ids)
+        self.student_ids.append(student_id)
+        self._rows[student_id] = row
+        for column in self._columns.values():
+            column.append(NOT_ASSIGNED)
+        return row
+
+    def _row(self, student_id: str) -> int:
+        row = self._rows.get(student_id)
+        if row is None:
+            raise ValueError(f"Student with ID {student_id} not found")
+        return row
+
+    def _column(self, catalog_id: int) -> array:
+        column = self._columns.get(catalog_id)
+        if column is None:
+            self.catalog.get(catalog_id)  # Raises IndexError for unknown ids
+            column = array("d", [NOT_ASSIGNED]) * len(self.student_ids)
+            self._columns[catalog_id] = column
+        return column
+
+    def assign(self, student_id: str, catalog_id: int) -> None:
+        """Give a student an assignment (pending until submitted)."""
+        row = self._row(student_id)  # Before _column, so a bad id leaves no empty column
+        column = self._column(catalog_id)
+        if column[row] == NOT_ASSIGNED:
+            column[row] = PENDING
+
+    def submit(self, student_id: str, catalog_id: int, points_earned: float) -> None:
+        """Record earned points, assigning the work first if needed."""
+        if points_earned < 0:
+            raise ValueError("Points earned cannot be negative")
+        row = self._row(student_id)
+        self._column(catalog_id)[row] = points_earned
+
+    def get_score(self, student_id: str, catalog_id: int) -> Optional[float]:
+        """Get points earned, or None when pending or not assigned."""
+        column = self._columns.get(catalog_id)
+        if column is None:
+            return None
+        value = column[self._row(student_id)]
+        return value if value >= 0 else None
+
+    def _submitted(self, catalog_id: int) -> List[float]:
+        column = self._columns.get(catalog_id, ())
+        # NaN and -inf both fail the comparison, leaving only submitted scores
+        return [value for value in column if value >= 0]
+
+    def average_score(self, catalog_id: int) -> float:
+        """Average points earned on one assignment across the class."""
+        submitted = self._submitted(catalog_id)
+        if not submitted:
+            return 0.0
+        return math.fsum(submitted) / len(submitted)
+
+    def average_percentage(self, catalog_id: int) -> float:
+        """Average percentage on one assignment across the class."""
+        points_possible = self.catalog.get(catalog_id).points_possible
+        if points_possible == 0:
+            return 0.0
+        return self.average_score(catalog_id) / points_possible * 100
+
+    def get_subject_average(self, student_id: str, subject: str) -> float:
+        """Calculate a student's subject average (same rules as Student)."""
+        row = self._row(student_id)
+        total_points = 0.0
+        total_possible = 0.0
+        for definition in self.catalog.get_by_subject(subject):
+            column = self._columns.get(definition.catalog_id)
+            if column is not None and column[row] >= 0:
+                total_points += column[row]
+                total_possible += definition.points_possible
+
+        if total_possible == 0:
+            return 0.0
+        return (total_points / total_possible) * 100
+
+    def get_pending_assignments(self, student_id: str) -> List[AssignmentDefinition]:
+        """Get definitions the student has been given but not submitted."""
+        row = self._row(student_id)
+        return [
+            self.catalog.get(catalog_id)
+            for catalog_id, column in self._columns.items()
+            if math.isnan(column[row])
+        ]
+
+    def to_assignment(self, student_id: str, catalog_id: int) -> Optional[Assignment]:
+        """Materialize a classic Assignment object for code that still needs one."""
+        column = self._columns.get(catalog_id)
+        if column is None or column[self._row(student_id)] == NOT_ASSIGNED:
+            return None
+
+        definition = self.catalog.get(catalog_id)
+        assignment = Assignment(
+            name=definition.name,
+            subject=definition.subject,
+            points_possible=definition.points_possible,
+            due_date=definition.due_date,
+        )
+        score = self.get_score(student_id, catalog_id)
+        if score is not None:
+            assignment.submit(score)
+        return assignment
+
+    @classmethod
+    def from_system(cls, system: StudentManagementSystem) -> "ScoreBook":
+        """
+        Convert per-student Assignment copies into a shared catalog.
+
+        Raises:
+            ValueError: If a student has two assignments with the same name
+                and subject (a score book holds one result per student each)
+        """
+        book = cls(AssignmentCatalog())
+        for student_id, student in system.students.items():
+            row = book.add_student(student_id)
+            for assignment in student.assignments:
+                catalog_id = book.catalog.define(
+                    assignment.name,
+                    assignment.subject,
+                    assignment.points_possible,
+                    assignment.due_date,
+                )
+                column = book._columns.get(catalog_id)
+                if column is not None and column[row] != NOT_ASSIGNED:
+                    raise ValueError(
+                        f"Student {student_id} has assignment '{assignment.name}' "
+                        f"({assignment.subject}) more than once"
+                    )
+                if assignment.submitted:
+                    book.submit(student_id, catalog_id, assignment.points_earned)
+                else:
+                    book.assign(student_id, catalog_id)
+        return book
+
+
+def create_sample_scorebook(student_count: int = 5) -> ScoreBook:
+    """Build the same data as create_sample_data, stored through the catalog."""
+    book = ScoreBook(AssignmentCatalog())
+    student_ids = [f"S{i + 1:03d}" for i in range(student_count)]
+    for student_id in student_ids:
+        book.add_student(student_id)
+
+    for subject in ["Mathematics", "English", "Science"]:
+        quiz = book.catalog.define(f"{subject} Quiz 1", subject, 100.0, date(2024, 8, 15))
+        homework = book.catalog.define(
+            f"{subject} Homework 1", subject, 50.0, date(2024, 8, 20)
+        )
+        project = book.catalog.define(f"{subject} Project", subject, 200.0, date(2024, 9, 1))
+
+        for i, student_id in enumerate(student_ids):
+            book.submit(student_id, quiz, 85 + (i % 5) * 3)
+            book.submit(student_id, homework, 40 + (i % 5) * 2)
+            book.assign(student_id, project)
+
+    return book
+
+
+def compare_memory(student_count: int = 1000) -> Tuple[int, int]:
+    """Measure bytes allocated by per-student Assignment copies vs the catalog."""
+    tracemalloc.start()
+    system = StudentManagementSystem()
+    student_ids = [f"S{i + 1:03d}" for i in range(student_count)]
+    for student_id in student_ids:
+        system.add_student(student_id, "First", "Last", "student@school.edu")
+    students_only = tracemalloc.get_traced_memory()[0]
+
+    for i, student_id in enumerate(student_ids):
+        for subject in ["Mathematics", "English", "Science"]:
+            quiz = Assignment(f"{subject} Quiz 1", subject, due_date=date(2024, 8, 15))
+            quiz.submit(85 + (i % 5) * 3)
+            system.add_assignment_to_student(student_id, quiz)
+            homework = Assignment(
+                f"{subject} Homework 1", subject, points_possible=50.0, due_date=date(2024, 8, 20)
+            )
+            homework.submit(40 + (i % 5) * 2)
+            system.add_assignment_to_student(student_id, homework)
+            project = Assignment(
+                f"{subject} Project", subject, points_possible=200.0, due_date=date(2024, 9, 1)
+            )
+            system.add_assignment_to_student(student_id, project)
+    objects_bytes = tracemalloc.get_traced_memory()[0] - students_only
+    del system
+
+    start = tracemalloc.get_traced_memory()[0]
+    book = create_sample_scorebook(student_count)
+    catalog_bytes = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del book
+
+    return objects_bytes, catalog_bytes
+
+
+if __name__ == "__main__":
+    book = create_sample_scorebook()
+    quiz_id = book.catalog.find("Mathematics Quiz 1", "Mathematics")
+
+    print("=== Assignment Catalog Demo ===\n")
+    print(f"Catalog entries: {len(book.catalog)}")
+    print(f"Average score on Mathematics Quiz 1: {book.average_score(quiz_id):.1f}")
+    print(f"Average percentage: {book.average_percentage(quiz_id):.1f}%")
+    print(f"S001 Mathematics average: {book.get_subject_average('S001', 'Mathematics'):.1f}%")
+
+    pending = book.get_pending_assignments("S001")
+    print(f"S001 pending: {[d.name for d in pending]}")
+    print(f"Materialized: {book.to_assignment('S001', quiz_id)}")
+
+    # Results must agree with the classic object-per-student model
+    from exercise2_1 import create_sample_data
+
+    sms = StudentManagementSystem()
+    create_sample_data(sms)
+    converted = ScoreBook.from_system(sms)
+    for student_id, student in sms.students.items():
+        for subject in student.subjects:
+            assert math.isclose(
+                converted.get_subject_average(student_id, subject),
+                student.get_subject_average(subject),
+            )
+    print("Converted system matches Student.get_subject_average")
+
+    print("\nMemory for a class of 1,000 students x 9 assignments:")
+    objects_bytes, catalog_bytes = compare_memory(1000)
+    print(f"  Assignment objects: {objects_bytes:,} bytes")
+    print(f"  Catalog + scores:   {catalog_bytes:,} bytes")
+    print(f"  Reduction: {objects_bytes / catalog_bytes:.1f}x")
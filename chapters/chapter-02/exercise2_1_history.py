@@ -0,0 +1,297 @@
+# Exercise 2.1 Extension: Point-in-Time Grade History
+# Answer "what was the GPA on date X" from timestamped prefix sums
+
+"""
+C# Equivalent Idea:
+SortedList<DateTime, (double Earned, double Possible)> timeline;
+int index = BinarySearch(timeline.Keys, asOf);   // then read the running totals
+"""
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from exercise2_1 import Assignment, Grade, StudentManagementSystem
+
+DateLike = Union[date, datetime]
+
+
+def _as_datetime(when: DateLike) -> datetime:
+    """Treat a plain date as the end of that day."""
+    if isinstance(when, datetime):
+        return when
+    return datetime.combine(when, time.max)
+
+
+@dataclass
+class SubjectTimeline:
+    """
+    Running totals for one student in one subject.
+
+    ``earned[i]`` and ``possible[i]`` hold the cumulative points after the
+    ``i``-th change, so an as-of lookup is a single binary search. Each change
+    costs two floats and a timestamp.
+
+    Changes are expected to arrive mostly in time order: appending is O(1),
+    but a backdated change shifts every later total, so it costs O(n).
+    Bulk-loading old history out of order should sort the events first.
+    """
+
+    enrolled_at: datetime
+    times: List[datetime] = field(default_factory=list)
+    earned: array = field(default_factory=lambda: array("d"))
+    possible: array = field(default_factory=lambda: array("d"))
+
+    def record(self, at: datetime, earned_delta: float, possible_delta: float) -> None:
+        """Append a change, keeping the running totals consistent (O(n) if backdated)."""
+        if not self.times or at >= self.times[-1]:
+            self.times.append(at)
+            self.earned.append((self.earned[-1] if self.earned else 0.0) + earned_delta)
+            self.possible.append(
+                (self.possible[-1] if self.possible else 0.0) + possible_delta
+            )
+            return
+
+        # Late-arriving change: insert it and shift the totals that follow
+        index = bisect_right(self.times, at)
+        self.times.insert(index, at)
+        previous_earned = self.earned[index - 1] if index else 0.0
+        previous_possible = self.possible[index - 1] if index else 0.0
+        self.earned.insert(index, previous_earned)
+        self.possible.insert(index, previous_possible)
+        for i in range(index, len(self.times)):
+            self.earned[i] += earned_delta
+            self.possible[i] += possible_delta
+
+    def totals_as_of(self, when: datetime) -> Tuple[float, float]:
+        """Get (points earned, points possible) as of a moment."""
+        index = bisect_right(self.times, when)
+        if index == 0:
+            return 0.0, 0.0
+        return self.earned[index - 1], self.possible[index - 1]
+
+    def average_as_of(self, when: datetime) -> float:
+        """Subject average percentage as of a moment (same rules as Student)."""
+        earned, possible = self.totals_as_of(when)
+        if possible == 0:
+            return 0.0
+        return (earned / possible) * 100
+
+
+class SubmissionHistory:
+    """Timestamped submissions for every (student, subject) pair."""
+
+    def __init__(self) -> None:
+        self.timelines: Dict[Tuple[str, str], SubjectTimeline] = {}
+        self.subjects_by_student: Dict[str, Set[str]] = {}
+        self.students_by_subject: Dict[str, Set[str]] = {}
+
+    def _timeline(self, student_id: str, subject: str, at: datetime) -> SubjectTimeline:
+        key = (student_id, subject)
+        timeline = self.timelines.get(key)
+        if timeline is None:
+            timeline = SubjectTimeline(enrolled_at=at)
+            self.timelines[key] = timeline
+            self.subjects_by_student.setdefault(student_id, set()).add(subject)
+            self.students_by_subject.setdefault(subject, set()).add(student_id)
+        elif at < timeline.enrolled_at:
+            timeline.enrolled_at = at
+        return timeline
+
+    def record_enrollment(self, student_id: str, subject: str, at: DateLike) -> None:
+        """Note that a student had work in a subject from this moment on."""
+        self._timeline(student_id, subject, _as_datetime(at))
+
+    def record_submission(
+        self,
+        student_id: str,
+        subject: str,
+        earned_delta: float,
+        possible_delta: float,
+        at: DateLike,
+    ) -> None:
+        """Record a change in earned and possible points."""
+        moment = _as_datetime(at)
+        self._timeline(student_id, subject, moment).record(
+            moment, earned_delta, possible_delta
+        )
+
+    def subjects_as_of(self, student_id: str, when: DateLike) -> List[str]:
+        """Subjects a student was enrolled in at a moment."""
+        moment = _as_datetime(when)
+        return [
+            subject
+            for subject in self.subjects_by_student.get(student_id, ())
+            if self.timelines[(student_id, subject)].enrolled_at <= moment
+        ]
+
+    def get_subject_average_as_of(
+        self, student_id: str, subject: str, when: DateLike
+    ) -> float:
+        """Student's subject average as of a moment."""
+        timeline = self.timelines.get((student_id, subject))
+        if timeline is None:
+            return 0.0
+        return timeline.average_as_of(_as_datetime(when))
+
+    def get_gpa_as_of(self, student_id: str, when: DateLike) -> float:
+        """Student's overall GPA as of a moment."""
+        moment = _as_datetime(when)
+        subjects = self.subjects_as_of(student_id, moment)
+        if not subjects:
+            return 0.0
+
+        total_gpa = 0.0
+        for subject in subjects:
+            avg_percentage = self.timelines[(student_id, subject)].average_as_of(moment)
+            total_gpa += Grade.from_percentage(avg_percentage).gpa_value
+        return total_gpa / len(subjects)
+
+    def get_class_average_as_of(self, subject: str, when: DateLike) -> float:
+        """Class average for a subject as of a moment."""
+        moment = _as_datetime(when)
+        timelines = [
+            self.timelines[(student_id, subject)]
+            for student_id in self.students_by_subject.get(subject, ())
+        ]
+        enrolled = [t for t in timelines if t.enrolled_at <= moment]
+        if not enrolled:
+            return 0.0
+        return sum(t.average_as_of(moment) for t in enrolled) / len(enrolled)
+
+    def get_class_average_timeline(
+        self, subject: str, dates: List[DateLike]
+    ) -> List[Tuple[DateLike, float]]:
+        """Class average for a subject at each of the given dates."""
+        return [(when, self.get_class_average_as_of(subject, when)) for when in dates]
+
+    @property
+    def change_count(self) -> int:
+        """Total number of recorded changes (space is proportional to this)."""
+        return sum(len(t.times) for t in self.timelines.values())
+
+
+class VersionedStudentManagementSystem(StudentManagementSystem):
+    """StudentManagementSystem that also keeps a timestamped grade history."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.history = SubmissionHistory()
+
+    def add_assignment_to_student(
+        self, student_id: str, assignment: Assignment, at: Optional[DateLike] = None
+    ) -> None:
+        """Add assignment to a student and record when it happened."""
+        super().add_assignment_to_student(student_id, assignment)
+
+        moment = at if at is not None else datetime.now()
+        self.history.record_enrollment(student_id, assignment.subject, moment)
+        if assignment.submitted:
+            self.history.record_submission(
+                student_id,
+                assignment.subject,
+                assignment.points_earned,
+                assignment.points_possible,
+                moment,
+            )
+
+    def submit_assignment(
+        self,
+        student_id: str,
+        assignment: Assignment,
+        points_earned: float,
+        at: Optional[DateLike] = None,
+    ) -> None:
+        """Submit (or regrade) a student's assignment and record the change."""
+        if student_id not in self.students:
+            raise ValueError(f"Student with ID {student_id} not found")
+        # Identity, not ==: another student may hold an equal copy of the assignment
+        if not any(a is assignment for a in self.students[student_id].assignments):
+            raise ValueError(f"Assignment {assignment.name} not found for {student_id}")
+
+        if assignment.submitted:
+            earned_delta = points_earned - assignment.points_earned
+            possible_delta = 0.0
+        else:
+            earned_delta = points_earned
+            possible_delta = assignment.points_possible
+
+        assignment.submit(points_earned)
+        self.history.record_submission(
+            student_id,
+            assignment.subject,
+            earned_delta,
+            possible_delta,
+            at if at is not None else datetime.now(),
+        )
+
+    def get_gpa_as_of(self, student_id: str, when: DateLike) -> float:
+        """Student's overall GPA on a given date."""
+        if student_id not in self.students:
+            raise ValueError(f"Student with ID {student_id} not found")
+        return self.history.get_gpa_as_of(student_id, when)
+
+    def get_class_average_as_of(self, subject: str, when: DateLike) -> float:
+        """Class average for a subject on a given date."""
+        return self.history.get_class_average_as_of(subject, when)
+
+
+def create_sample_term(system: VersionedStudentManagementSystem) -> None:
+    """Populate a term where each assignment is handed in on its due date."""
+    students = [
+        ("S001", "Alice", "Johnson", "alice.j@school.edu"),
+        ("S002", "Bob", "Smith", "bob.s@school.edu"),
+        ("S003", "Charlie", "Brown", "charlie.b@school.edu"),
+    ]
+    for student in students:
+        system.add_student(*student)
+
+    term_start = date(2024, 8, 1)
+    for subject in ["Mathematics", "Science"]:
+        for i, (student_id, *_) in enumerate(students):
+            quiz = Assignment(f"{subject} Quiz 1", subject, due_date=date(2024, 8, 15))
+            homework = Assignment(
+                f"{subject} Homework 1", subject, points_possible=50.0, due_date=date(2024, 8, 20)
+            )
+            project = Assignment(
+                f"{subject} Project", subject, points_possible=200.0, due_date=date(2024, 9, 1)
+            )
+            for assignment in (quiz, homework, project):
+                system.add_assignment_to_student(student_id, assignment, at=term_start)
+
+            system.submit_assignment(student_id, quiz, 95 - i * 12, at=quiz.due_date)
+            system.submit_assignment(student_id, homework, 48 - i * 6, at=homework.due_date)
+            system.submit_assignment(student_id, project, 150 + i * 20, at=project.due_date)
+
+
+if __name__ == "__main__":
+    sms = VersionedStudentManagementSystem()
+    create_sample_term(sms)
+
+    print("=== Point-in-Time Grade History Demo ===\n")
+
+    checkpoints = [date(2024, 8, 10), date(2024, 8, 16), date(2024, 8, 21), date(2024, 9, 2)]
+    print("GPA over the term:")
+    for student_id, student in sms.students.items():
+        history = ", ".join(
+            f"{when}: {sms.get_gpa_as_of(student_id, when):.2f}" for when in checkpoints
+        )
+        print(f"  {student.display_name}: {history}")
+
+    print("\nMathematics class average over the term:")
+    for when, avg in sms.history.get_class_average_timeline("Mathematics", checkpoints):
+        print(f"  {when}: {avg:.1f}%")
+
+    # After the last change, the history must agree with the live objects
+    for student_id, student in sms.students.items():
+        assert abs(sms.get_gpa_as_of(student_id, date(2030, 1, 1)) - student.get_overall_gpa()) < 1e-9
+    print("\nLatest snapshot matches Student.get_overall_gpa")
+
+    # A regrade is just another change on the timeline
+    charlie_quiz = sms.students["S003"].get_assignments_by_subject("Mathematics")[0]
+    sms.submit_assignment("S003", charlie_quiz, 90, at=date(2024, 9, 5))
+    print(f"Charlie before regrade (2024-09-02): {sms.get_gpa_as_of('S003', date(2024, 9, 2)):.2f}")
+    print(f"Charlie after regrade  (2024-09-06): {sms.get_gpa_as_of('S003', date(2024, 9, 6)):.2f}")
+    print(f"Recorded changes: {sms.history.change_count}")
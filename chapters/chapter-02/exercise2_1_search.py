@@ -0,0 +1,394 @@
+# Exercise 2.1 Extension: Student Search Index
+# Secondary indexes for email lookups and ranked, typo-tolerant name search
+
+"""
+C# Equivalent Idea:
+var byEmail = new Dictionary<string, string>(StringComparer.OrdinalIgnoreCase);
+var names = new SortedList<string, List<string>>();      // prefix search
+var deletes = new Dictionary<string, HashSet<string>>();  // one-typo search
+var trigrams = new Dictionary<string, HashSet<string>>(); // fuzzier search
+"""
+
+import random
+import sys
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from itertools import repeat
+from os.path import commonprefix
+from typing import DefaultDict, Dict, List, Optional, Set, Tuple
+
+from exercise2_1 import Student, StudentManagementSystem
+
+# Exact matches always rank first. Prefix and typo matches both score in
+# (FUZZY_SCORE, PREFIX_SCORE) by how much of the indexed token they cover, so
+# a full word with one typo can outrank a short prefix of a long name.
+EXACT_SCORE = 3.0
+PREFIX_SCORE = 2.0
+FUZZY_SCORE = 1.0
+
+
+def normalize_email(email: str) -> str:
+    """Normalize an email for exact lookups."""
+    return email.strip().lower()
+
+
+def tokenize_name(text: str) -> List[str]:
+    """Split a name or query into lowercase tokens ("Smith, Bob" -> ["smith", "bob"])."""
+    return text.replace(",", " ").lower().split()
+
+
+def trigrams(token: str) -> Set[str]:
+    """Get the padded trigrams of a token ("bob" -> {"$bo", "bob", "ob$"})."""
+    padded = f"${token}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def deletes(token: str) -> Set[str]:
+    """The token and every string one deletion away ("bob" -> {"bob", "ob", "bb", "bo"})."""
+    return {token} | {token[:i] + token[i + 1 :] for i in range(len(token))}
+
+
+def _one_edit_distance(a: str, b: str) -> int:
+    """edit_distance(a, b, 1) in linear time: 0, 1, or 2 for "more than one"."""
+    if a == b:
+        return 0
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > 1:
+        return 2
+    i = len(commonprefix((a, b)))
+    if len(a) < len(b):
+        return 1 if a[i:] == b[i + 1 :] else 2  # One insertion
+    if a[i + 1 :] == b[i + 1 :]:
+        return 1  # One substitution
+    if i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2 :] == b[i + 2 :]:
+        return 1  # One transposition
+    return 2
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Edit distance counting transpositions as one edit, capped at max_distance + 1."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if max_distance == 1:
+        return _one_edit_distance(a, b)
+
+    before_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            cost = 0 if char_a == char_b else 1
+            best = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                best = min(best, before_previous[j - 2] + 1)
+            current.append(best)
+        if min(current) > max_distance:
+            return max_distance + 1
+        before_previous, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+class StudentSearchIndex:
+    """
+    Secondary indexes over students.
+
+    Names are indexed per token (first and last name), so display names and
+    full names are searched by matching every query token. Students sharing a
+    name share one posting dict, keeping the prefix and fuzzy indexes sized by
+    distinct names rather than by student count.
+
+    One-typo matches come from a deletion index: a token and a term within
+    one edit (transpositions included) always share a string with at most
+    one character deleted, so candidates are a handful of dict lookups even
+    for 3-letter terms. Searches allowing more typos use the trigram index.
+    """
+
+    def __init__(self, max_prefix_tokens: int = 256) -> None:
+        self.max_prefix_tokens = max_prefix_tokens
+        self._id_by_email: Dict[str, str] = {}
+        self._email_by_id: Dict[str, str] = {}
+        self._tokens_by_id: Dict[str, Tuple[str, ...]] = {}
+        # Posting dicts keep insertion order like a list but delete in O(1);
+        # they map each student to its tokens for checking the other query terms
+        self._ids_by_token: DefaultDict[str, Dict[str, Tuple[str, ...]]] = defaultdict(dict)
+        self._sorted_tokens: List[str] = []
+        self._tokens_by_delete: DefaultDict[str, Set[str]] = defaultdict(set)
+        self._tokens_by_trigram: DefaultDict[str, Set[str]] = defaultdict(set)
+        self._trigrams_by_token: Dict[str, Set[str]] = {}
+
+    def add(self, student_id: str, first_name: str, last_name: str, email: str) -> None:
+        """Index a student's email and name tokens."""
+        if student_id in self._tokens_by_id:
+            raise ValueError(f"Student with ID {student_id} already indexed")
+        email_key = normalize_email(email)
+        if email_key in self._id_by_email:
+            raise ValueError(f"Email {email} already belongs to another student")
+
+        # Interned tokens are shared by every student with that name
+        tokens = tuple(dict.fromkeys(map(sys.intern, tokenize_name(f"{first_name} {last_name}"))))
+        self._id_by_email[email_key] = student_id
+        self._email_by_id[student_id] = email_key
+        self._tokens_by_id[student_id] = tokens
+        for token in tokens:
+            postings = self._ids_by_token[token]
+            if not postings:
+                insort(self._sorted_tokens, token)
+                for variant in deletes(token):
+                    self._tokens_by_delete[variant].add(token)
+                token_trigrams = self._trigrams_by_token[token] = trigrams(token)
+                for trigram in token_trigrams:
+                    self._tokens_by_trigram[trigram].add(token)
+            postings[student_id] = tokens
+
+    def add_student(self, student: Student) -> None:
+        """Index a Student object."""
+        self.add(student.student_id, student.first_name, student.last_name, student.email)
+
+    def remove(self, student_id: str) -> None:
+        """Remove a student from every index."""
+        tokens = self._tokens_by_id.pop(student_id, None)
+        if tokens is None:
+            return
+
+        del self._id_by_email[self._email_by_id.pop(student_id)]
+        for token in tokens:
+            postings = self._ids_by_token[token]
+            del postings[student_id]
+            if not postings:
+                del self._ids_by_token[token]
+                del self._sorted_tokens[bisect_left(self._sorted_tokens, token)]
+                for variant in deletes(token):
+                    self._discard(self._tokens_by_delete, variant, token)
+                for trigram in self._trigrams_by_token.pop(token):
+                    self._discard(self._tokens_by_trigram, trigram, token)
+
+    @staticmethod
+    def _discard(index: DefaultDict[str, Set[str]], key: str, token: str) -> None:
+        tokens = index[key]
+        tokens.discard(token)
+        if not tokens:
+            del index[key]
+
+    def find_by_email(self, email: str) -> Optional[str]:
+        """Exact, case-insensitive email lookup."""
+        return self._id_by_email.get(normalize_email(email))
+
+    def _fuzzy_candidates(self, term: str, max_edits: int) -> Set[str]:
+        """Tokens that may be within ``max_edits`` of ``term`` (a superset)."""
+        if max_edits == 1:
+            candidates: Set[str] = set()
+            for variant in deletes(term):
+                candidates.update(self._tokens_by_delete.get(variant, ()))
+            return candidates
+
+        term_trigrams = trigrams(term)
+        required = len(term_trigrams) - 4 * max_edits
+        if required < 1:
+            # Every trigram of a short term may be broken: check tokens of a similar length
+            return {t for t in self._ids_by_token if abs(len(t) - len(term)) <= max_edits}
+
+        # An edit (or transposition) breaks at most four trigrams, so any
+        # close token shares at least one of the query's rarest trigrams
+        rarest = sorted(
+            term_trigrams, key=lambda t: len(self._tokens_by_trigram.get(t, ()))
+        )[: 4 * max_edits + 1]
+        candidates = set()
+        for trigram in rarest:
+            candidates.update(self._tokens_by_trigram.get(trigram, ()))
+        return {
+            token
+            for token in candidates
+            if abs(len(token) - len(term)) <= max_edits
+            and len(self._trigrams_by_token[token] & term_trigrams) >= required
+        }
+
+    def _match_term(self, term: str, max_edits: int) -> Dict[str, float]:
+        """Map indexed tokens matching one query term to a match score."""
+        matches: Dict[str, float] = {}
+        if term in self._ids_by_token:
+            matches[term] = EXACT_SCORE
+
+        span = PREFIX_SCORE - FUZZY_SCORE
+        start = bisect_left(self._sorted_tokens, term)
+        for token in self._sorted_tokens[start : start + self.max_prefix_tokens]:
+            if not token.startswith(term):
+                break
+            matches.setdefault(token, FUZZY_SCORE + span * len(term) / len(token))
+
+        if max_edits and len(term) >= 3:
+            for token in self._fuzzy_candidates(term, max_edits):
+                if token == term:
+                    continue
+                distance = edit_distance(term, token, max_edits)
+                if distance <= max_edits:
+                    # Share of the token left untouched by the typos
+                    kept = max(len(token) - 2 * distance, 1) / len(token)
+                    score = FUZZY_SCORE + span * kept
+                    if score > matches.get(token, 0.0):
+                        matches[token] = score
+        return matches
+
+    def _single_term(self, matches: Dict[str, float], limit: int) -> Dict[str, float]:
+        """Best tokens first; every student of one token ties, so stop at ``limit``."""
+        results: Dict[str, float] = {}
+        for token, token_score in sorted(matches.items(), key=lambda item: -item[1]):
+            for student_id in self._ids_by_token[token]:
+                results.setdefault(student_id, token_score)
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def _all_terms(self, term_matches: List[Dict[str, float]]) -> Dict[str, float]:
+        """
+        Students matching every term, scored by their best token per term.
+
+        Candidates come from the most selective term and are checked against
+        their own few tokens, which touches far less memory than intersecting
+        the (often large) postings of every token matching the other terms.
+        """
+
+        def posting_size(matches: Dict[str, float]) -> int:
+            return sum(len(self._ids_by_token[token]) for token in matches)
+
+        driver, *others = sorted(term_matches, key=posting_size)
+        results: Dict[str, float] = {}
+        for token, token_score in driver.items():
+            candidates = self._ids_by_token[token].items()
+            for matches in others:  # Drops most candidates before any scoring
+                disjoint = matches.keys().isdisjoint
+                candidates = [item for item in candidates if not disjoint(item[1])]
+            for student_id, student_tokens in candidates:
+                score = token_score + sum(
+                    max(map(matches.get, student_tokens, repeat(0.0))) for matches in others
+                )
+                if score > results.get(student_id, 0.0):
+                    results[student_id] = score
+        return results
+
+    def search(
+        self, query: str, limit: int = 10, max_edits: int = 1
+    ) -> List[Tuple[str, float]]:
+        """
+        Ranked name search with prefix and typo tolerance.
+
+        Args:
+            query: Name text, e.g. "ali", "johnson, alice" or "alcie jo"
+            limit: Maximum number of results
+            max_edits: Typos tolerated per query token (0 disables fuzzy matching)
+
+        Returns:
+            List of (student_id, score) sorted by score (highest first)
+        """
+        terms = list(dict.fromkeys(tokenize_name(query)))
+        if not terms:
+            return []
+
+        term_matches = [self._match_term(term, max_edits) for term in terms]
+        if not all(term_matches):
+            return []
+
+        if len(terms) == 1:
+            results = self._single_term(term_matches[0], limit)
+        else:
+            results = self._all_terms(term_matches)
+
+        ranked = sorted(results.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def __len__(self) -> int:
+        return len(self._tokens_by_id)
+
+
+class IndexedStudentManagementSystem(StudentManagementSystem):
+    """StudentManagementSystem that keeps email and name indexes up to date."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.search_index = StudentSearchIndex()
+
+    def add_student(
+        self, student_id: str, first_name: str, last_name: str, email: str
+    ) -> Student:
+        """Add a new student and index it."""
+        if self.search_index.find_by_email(email) is not None:
+            raise ValueError(f"Email {email} already belongs to another student")
+
+        student = super().add_student(student_id, first_name, last_name, email)
+        self.search_index.add_student(student)
+        return student
+
+    def get_student_by_email(self, email: str) -> Optional[Student]:
+        """Get student by email (case-insensitive)."""
+        student_id = self.search_index.find_by_email(email)
+        return self.students.get(student_id) if student_id else None
+
+    def search_students(self, query: str, limit: int = 10) -> List[Tuple[Student, float]]:
+        """Search students by partial or misspelled name."""
+        return [
+            (self.students[student_id], score)
+            for student_id, score in self.search_index.search(query, limit)
+        ]
+
+
+def benchmark_search(student_count: int = 1_000_000, queries: int = 2_000) -> None:
+    """Time email and name lookups against an index of generated students."""
+    rng = random.Random(42)
+    syllables = ["an", "bel", "cor", "da", "el", "fin", "gar", "hol", "is", "jor",
+                 "ka", "lin", "mor", "na", "ol", "per", "qui", "ros", "sel", "tan",
+                 "ub", "vin", "wes", "xa", "yor", "zel", "bra", "cla", "dru", "ev"]
+
+    def make_name(parts: int) -> str:
+        return "".join(rng.choice(syllables) for _ in range(parts)).capitalize()
+
+    first_names = [make_name(2) for _ in range(2_000)]
+    last_names = [make_name(3) for _ in range(20_000)]
+
+    index = StudentSearchIndex()
+    people = []
+    start = time.perf_counter()
+    for i in range(student_count):
+        first, last = rng.choice(first_names), rng.choice(last_names)
+        email = f"{first}.{last}.{i}@school.edu".lower()
+        index.add(f"S{i:07d}", first, last, email)
+        if i % (student_count // queries or 1) == 0:
+            people.append((first, last, email))
+    build_seconds = time.perf_counter() - start
+
+    def per_lookup(fn, items) -> float:
+        begin = time.perf_counter()
+        for item in items:
+            fn(item)
+        return (time.perf_counter() - begin) / len(items) * 1e6
+
+    emails = [email.upper() for _, _, email in people]
+    prefixes = [f"{last[:4]}" for _, last, _ in people]
+    full_names = [f"{last}, {first}" for first, last, _ in people]
+    typos = [f"{first} {last[:2]}{last[3]}{last[2]}{last[4:]}" for first, last, _ in people]
+
+    print(f"Indexed {student_count:,} students in {build_seconds:.1f}s")
+    print(f"  Email lookup:      {per_lookup(index.find_by_email, emails):8.1f} us")
+    print(f"  Prefix search:     {per_lookup(index.search, prefixes):8.1f} us")
+    print(f"  Display name:      {per_lookup(index.search, full_names):8.1f} us")
+    print(f"  Typo-tolerant:     {per_lookup(index.search, typos):8.1f} us")
+
+
+if __name__ == "__main__":
+    sms = IndexedStudentManagementSystem()
+    sms.add_student("S001", "Alice", "Johnson", "alice.j@school.edu")
+    sms.add_student("S002", "Bob", "Smith", "bob.s@school.edu")
+    sms.add_student("S003", "Charlie", "Brown", "charlie.b@school.edu")
+    sms.add_student("S004", "Diana", "Wilson", "diana.w@school.edu")
+    sms.add_student("S005", "Alicia", "Johnston", "alicia.j@school.edu")
+
+    print("=== Student Search Index Demo ===\n")
+    print(f"Email lookup: {sms.get_student_by_email('BOB.S@School.edu').full_name}")
+
+    for query in ["ali", "johnson, alice", "Jonson", "alcie johnston", "wil"]:
+        results = sms.search_students(query)
+        formatted = ", ".join(f"{s.display_name} ({score:.2f})" for s, score in results)
+        print(f"Search '{query}': {formatted}")
+
+    print("\nBenchmark:")
+    benchmark_search()